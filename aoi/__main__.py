@@ -17,7 +17,7 @@ def _run(script_rel: str, argv: list[str]) -> int:
     return int(p.returncode)
 
 
-def main() -> int:
+def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(prog="aoi", description="Architects of Intent companion CLI.")
     sub = parser.add_subparsers(dest="cmd", required=True)
 
@@ -43,6 +43,7 @@ def main() -> int:
     p_all.add_argument("--effector", default="tools/sync_public_interfaces.py")
     p_all.add_argument("--seed", type=int, default=None)
     p_all.add_argument("--quarantine-dir", default=".sdac/workflow-quarantine")
+    p_all.add_argument("--worker", action="store_true", help="Host the Effector in a JSON-lines worker")
 
     p_request = sub.add_parser("request", help="(Ch2) build context + render diff-only request")
     p_request.add_argument("--src", default="product/src")
@@ -52,6 +53,33 @@ def main() -> int:
         "--template",
         default="factory/templates/doc_sync_diff_request.txt",
     )
+    p_request.add_argument(
+        "--mode",
+        choices=["full", "delta"],
+        default="full",
+        help="delta: ship only changed signatures + anchor lines (falls back to full on cold start)",
+    )
+    p_request.add_argument(
+        "--delta-template",
+        default="factory/templates/doc_sync_delta_request.txt",
+    )
+    p_request.add_argument(
+        "--layout",
+        choices=["template", "stable-first"],
+        default="template",
+        help="stable-first: static text first, volatile fields last (prefix-cache friendly)",
+    )
+    p_request.add_argument("--volatile", default=None, help="Comma-separated volatile fields for --layout stable-first")
+
+    p_batch = sub.add_parser("request-batch", help="(Ch2) render many requests: JSONL contexts -> JSONL")
+    p_batch.add_argument("--contexts", default="-", help="JSONL contexts ('-' for stdin)")
+    p_batch.add_argument("--template", default="factory/templates/doc_sync_diff_request.txt")
+    p_batch.add_argument("--delta-template", default="factory/templates/doc_sync_delta_request.txt")
+    p_batch.add_argument("--out", default="-", help="JSONL output ('-' for stdout)")
+    p_batch.add_argument("--workers", type=int, default=None, help="Worker processes (0 = inline)")
+    p_batch.add_argument("--chunk-size", type=int, default=256)
+    p_batch.add_argument("--layout", choices=["template", "stable-first"], default="template")
+    p_batch.add_argument("--volatile", default=None, help="Comma-separated volatile fields for --layout stable-first")
 
     p_drift = sub.add_parser("drift", help="(Ch4) measure diff variance")
     p_drift.add_argument("--src", default="product/src")
@@ -60,13 +88,65 @@ def main() -> int:
     p_drift.add_argument("--seed", type=int, default=1234)
     p_drift.add_argument("--mock", action="store_true", help="Use offline mock Effector variants")
     p_drift.add_argument("--validate", action="store_true", help="Validate each applied candidate")
+    p_drift.add_argument("--workers", type=int, default=0, help="Long-lived Effector workers (0 = subprocess per run)")
 
     p_mission = sub.add_parser("mission-dry-run", help="(Ch5) print slice + validators + budgets")
     p_mission.add_argument("--mission", default="missions/update_public_interfaces.json")
 
+    p_missions = sub.add_parser("missions", help="(Ch7) run Mission Objects")
+    missions_sub = p_missions.add_subparsers(dest="missions_cmd", required=True)
+    p_mrun = missions_sub.add_parser("run", help="(Ch7) schedule missions: disjoint write sets in parallel")
+    p_mrun.add_argument("missions", nargs="*", help="Mission files or directories (default: missions/*)")
+    p_mrun.add_argument("--jobs", type=int, default=None)
+    p_mrun.add_argument("--dry-run", action="store_true")
+    p_mrun.add_argument("--json", action="store_true")
+    p_mverify = missions_sub.add_parser("verify", help="(Ch7) run a mission's validators concurrently")
+    p_mverify.add_argument("mission", nargs="?", default="missions/update_public_interfaces.json")
+    p_mverify.add_argument("--timeout", type=float, default=None)
+    p_mverify.add_argument("--fail-fast", action="store_true")
+    p_mverify.add_argument("--jobs", type=int, default=None)
+    p_mverify.add_argument("--json", action="store_true")
+
     p_graph = sub.add_parser("graph", help="(Ch6) build context graph snapshot")
     p_graph.add_argument("--root", default="examples/tax_service")
     p_graph.add_argument("--out", default="build/context_graph.json")
+    p_graph.add_argument(
+        "--format",
+        choices=["json", "ndjson"],
+        default=None,
+        help="Snapshot format (default: from --out suffix; ndjson streams while walking)",
+    )
+    p_graph.add_argument(
+        "--rev",
+        action="append",
+        default=[],
+        help="Build from git objects at this revision (repeatable; --out then needs {rev})",
+    )
+    p_graph.add_argument("--blob-cache", default=None, help="Persist per-blob parse results here")
+    graph_sub = p_graph.add_subparsers(dest="graph_cmd")
+
+    p_gquery = graph_sub.add_parser("query", help="(Ch6) look up nodes and neighbors via prebuilt indexes")
+    p_gquery.add_argument("--graph", default="build/context_graph.json")
+    p_gquery.add_argument("--index", default=None, help="Index path (default: next to the graph)")
+    p_gquery.add_argument("--kind", default=None)
+    p_gquery.add_argument("--path-prefix", default=None)
+    p_gquery.add_argument("--name", default=None)
+    p_gquery.add_argument("--heading", default=None)
+    p_gquery.add_argument("--contains", default=None)
+    p_gquery.add_argument("--fuzzy", default=None)
+    p_gquery.add_argument("--neighbors", default=None, metavar="NODE_ID")
+    p_gquery.add_argument("--direction", choices=["out", "in", "both"], default="both")
+    p_gquery.add_argument("--edge-kind", default=None)
+    p_gquery.add_argument("--depth", type=int, default=1)
+    p_gquery.add_argument("--limit", type=int, default=50)
+    p_gquery.add_argument("--json", action="store_true")
+    p_gquery.add_argument("--interactive", action="store_true", help="Answer one query per stdin line")
+
+    p_gdiff = graph_sub.add_parser("diff", help="(Ch6) diff two snapshots and list affected missions")
+    p_gdiff.add_argument("old")
+    p_gdiff.add_argument("new")
+    p_gdiff.add_argument("--missions-dir", default="missions")
+    p_gdiff.add_argument("--json", action="store_true")
 
     p_slice = sub.add_parser("slice", help="(Ch6) emit a slice packet from an anchor")
     p_slice.add_argument("--graph", default="build/context_graph.json")
@@ -79,9 +159,23 @@ def main() -> int:
     p_bf = sub.add_parser("branching-factor", help="(Ch6) lint fan-out heuristics")
     p_bf.add_argument("--root", default="examples/tax_service")
 
+    p_inventory = sub.add_parser("inventory", help="Walk the tree once and write a reusable file manifest")
+    p_inventory.add_argument("--root", default=".")
+    p_inventory.add_argument("--out", default=".sdac/inventory.json")
+
     p_driver = sub.add_parser("driver-demo", help="(Ch7) resolve a driver from deterministic identity")
     p_driver.add_argument("--action", default="run_tests")
     p_driver.add_argument("--target", default="product/src")
+    p_driver.add_argument("--batch", default=None, help="Targets file ('-' for stdin); prints one JSON line per target")
+
+    p_drivers = sub.add_parser("drivers", help="(Ch7) run resolved drivers across services")
+    drivers_sub = p_drivers.add_subparsers(dest="drivers_cmd", required=True)
+    p_drun = drivers_sub.add_parser("run", help="(Ch7) resolve each service's driver and run them in parallel")
+    p_drun.add_argument("services", nargs="*", help="Service directories (default: examples/polyglot/services/*)")
+    p_drun.add_argument("--action", default="run_tests")
+    p_drun.add_argument("--jobs", type=int, default=None)
+    p_drun.add_argument("--timeout", type=float, default=None)
+    p_drun.add_argument("--json", action="store_true")
 
     p_agents = sub.add_parser("agents-suggest", help="(Ch8) propose updates to AGENTS.md")
     p_agents.add_argument("--path", default="Makefile")
@@ -90,25 +184,66 @@ def main() -> int:
     p_dream.add_argument("--root", default=".")
     p_dream.add_argument("--cc-threshold", type=int, default=30)
     p_dream.add_argument("--file-lines", type=int, default=500)
+    p_dream.add_argument("--clone-threshold", type=float, default=0.8)
+    p_dream.add_argument("--no-cache", action="store_true", help="Re-parse every file (ignore .sdac/dream-cache.pickle)")
+    p_dream.add_argument("--workers", type=int, default=None)
+    p_dream.add_argument("--hotspots", action="store_true", help="Rank churn x complexity from git history")
+    p_dream.add_argument("--rev", default="HEAD")
+    p_dream.add_argument("--since", default=None)
+    p_dream.add_argument("--max-commits", type=int, default=None)
+    p_dream.add_argument("--top", type=int, default=20)
 
     sub.add_parser("validate-missions", help="(Ch7) validate Mission Object templates")
     sub.add_parser("salvage", help="List quarantined near-misses")
 
-    sub.add_parser("test", help="Run unit tests (stdlib unittest)")
+    p_test = sub.add_parser("test", help="Run unit tests (stdlib unittest)")
+    p_test.add_argument("--coverage", action="store_true", help="Measure line coverage (writes line_coverage metric)")
+    p_test.add_argument("--out-dir", default=".metrics/current")
+    p_test.add_argument("--jobs", type=int, default=None, help="Worker processes for sharded runs (default: CPU count)")
 
     p_metrics = sub.add_parser("metrics", help="Collect metrics for ratchets")
     p_metrics.add_argument("--root", default=".")
     p_metrics.add_argument("--out-dir", default=".metrics/current")
+    metrics_sub = p_metrics.add_subparsers(dest="metrics_cmd")
+    p_trend = metrics_sub.add_parser("trend", help="(Ch11) query metric history: slope, first regression")
+    p_trend.add_argument("metric", nargs="?")
+    p_trend.add_argument("--last", type=int, default=None)
+    p_trend.add_argument("--direction", choices=("up", "down"), default=None)
+    p_trend.add_argument("--tolerance", type=float, default=None)
+    p_trend.add_argument("--relative-tolerance", type=float, default=None)
+    p_trend.add_argument("--config", default="governance/ratchets.json")
+    p_trend.add_argument("--rev", default="HEAD")
+    p_trend.add_argument("--recorded-order", action="store_true")
+    p_trend.add_argument("--series", action="store_true")
+    p_trend.add_argument("--json", action="store_true")
+
+    p_bench = sub.add_parser("bench", help="(Ch11) time pipeline stages; write median/p95 metrics")
+    p_bench.add_argument("--stages", default=None)
+    p_bench.add_argument("--runs", type=int, default=5)
+    p_bench.add_argument("--warmup", type=int, default=1)
+    p_bench.add_argument("--out-dir", default=".metrics/current")
+    p_bench.add_argument("--json", action="store_true")
+
+    p_importtime = sub.add_parser("importtime", help="(Ch11) import-time metrics for configured entry modules")
+    p_importtime.add_argument("--config", default="governance/importtime.json")
+    p_importtime.add_argument("--runs", type=int, default=5)
+    p_importtime.add_argument("--out-dir", default=".metrics/current")
 
     p_ratchet = sub.add_parser("ratchet-check", help="(Ch11) compare current metrics to baselines")
     p_ratchet.add_argument("--config", default="governance/ratchets.json")
     p_ratchet.add_argument("--json", action="store_true")
+    p_ratchet.add_argument(
+        "--record-history", action="store_true", help="Also append the collected metrics to .metrics/history.sqlite"
+    )
 
     p_baseline = sub.add_parser("ratchet-baseline", help="(Ch11) update baselines from current metrics")
     p_baseline.add_argument("--config", default="governance/ratchets.json")
     p_baseline.add_argument("--yes", action="store_true")
+    return parser
+
 
-    args = parser.parse_args()
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
 
     if args.cmd == "sync":
         argv = ["--src", args.src, "--doc", args.doc]
@@ -135,21 +270,54 @@ def main() -> int:
         ]
         if args.seed is not None:
             argv += ["--seed", str(args.seed)]
+        if args.worker:
+            argv.append("--worker")
         return _run("tools/run_mvf_all.py", argv)
 
     if args.cmd == "request":
         Path(args.out).parent.mkdir(parents=True, exist_ok=True)
         rc = _run(
             "factory/tools/build_doc_sync_context.py",
-            ["--src", args.src, "--doc", args.doc, "--out", args.out],
+            ["--src", args.src, "--doc", args.doc, "--out", args.out, "--mode", args.mode],
         )
         if rc != 0:
             return rc
         return _run(
             "factory/tools/render_doc_sync_request.py",
-            ["--context", args.out, "--template", args.template],
+            [
+                "--context",
+                args.out,
+                "--template",
+                args.template,
+                "--delta-template",
+                args.delta_template,
+                "--layout",
+                args.layout,
+                *(["--volatile", args.volatile] if args.volatile is not None else []),
+            ],
         )
 
+    if args.cmd == "request-batch":
+        argv = [
+            "--contexts",
+            args.contexts,
+            "--template",
+            args.template,
+            "--delta-template",
+            args.delta_template,
+            "--out",
+            args.out,
+            "--chunk-size",
+            str(args.chunk_size),
+            "--layout",
+            args.layout,
+        ]
+        if args.volatile is not None:
+            argv += ["--volatile", args.volatile]
+        if args.workers is not None:
+            argv += ["--workers", str(args.workers)]
+        return _run("factory/tools/render_doc_sync_batch.py", argv)
+
     if args.cmd == "drift":
         argv = [
             "--src",
@@ -165,17 +333,84 @@ def main() -> int:
             argv.append("--mock")
         if args.validate:
             argv.append("--validate")
+        if args.workers:
+            argv += ["--workers", str(args.workers)]
         return _run("factory/tools/measure_drift.py", argv)
 
+    if args.cmd == "missions" and args.missions_cmd == "run":
+        argv = list(args.missions)
+        if args.jobs is not None:
+            argv += ["--jobs", str(args.jobs)]
+        if args.dry_run:
+            argv.append("--dry-run")
+        if args.json:
+            argv.append("--json")
+        return _run("factory/tools/run_missions.py", argv)
+
+    if args.cmd == "missions" and args.missions_cmd == "verify":
+        argv = [args.mission]
+        if args.timeout is not None:
+            argv += ["--timeout", str(args.timeout)]
+        if args.fail_fast:
+            argv.append("--fail-fast")
+        if args.jobs is not None:
+            argv += ["--jobs", str(args.jobs)]
+        if args.json:
+            argv.append("--json")
+        return _run("factory/tools/verify_mission.py", argv)
+
     if args.cmd == "mission-dry-run":
         rc = _run("factory/tools/validate_missions.py", [])
         if rc != 0:
             return rc
         return _run("factory/tools/mission_dry_run.py", ["--mission", args.mission])
 
+    if args.cmd == "graph" and args.graph_cmd == "query":
+        argv = [
+            "--graph",
+            args.graph,
+            "--direction",
+            args.direction,
+            "--depth",
+            str(args.depth),
+            "--limit",
+            str(args.limit),
+        ]
+        for flag, value in (
+            ("--index", args.index),
+            ("--kind", args.kind),
+            ("--path-prefix", args.path_prefix),
+            ("--name", args.name),
+            ("--heading", args.heading),
+            ("--contains", args.contains),
+            ("--fuzzy", args.fuzzy),
+            ("--neighbors", args.neighbors),
+            ("--edge-kind", args.edge_kind),
+        ):
+            if value is not None:
+                argv += [flag, value]
+        if args.json:
+            argv.append("--json")
+        if args.interactive:
+            argv.append("--interactive")
+        return _run("factory/tools/query_context_graph.py", argv)
+
+    if args.cmd == "graph" and args.graph_cmd == "diff":
+        argv = [args.old, args.new, "--missions-dir", args.missions_dir]
+        if args.json:
+            argv.append("--json")
+        return _run("factory/tools/diff_context_graph.py", argv)
+
     if args.cmd == "graph":
         Path(args.out).parent.mkdir(parents=True, exist_ok=True)
-        return _run("factory/tools/build_context_graph.py", ["--root", args.root, "--out", args.out])
+        argv = ["--root", args.root, "--out", args.out]
+        if args.format is not None:
+            argv += ["--format", args.format]
+        for rev in args.rev:
+            argv += ["--rev", rev]
+        if args.blob_cache is not None:
+            argv += ["--blob-cache", args.blob_cache]
+        return _run("factory/tools/build_context_graph.py", argv)
 
     if args.cmd == "slice":
         return _run(
@@ -186,27 +421,52 @@ def main() -> int:
     if args.cmd == "branching-factor":
         return _run("factory/tools/lint_branching_factor.py", ["--root", args.root])
 
+    if args.cmd == "inventory":
+        return _run("factory/tools/build_inventory.py", ["--root", args.root, "--out", args.out])
+
     if args.cmd == "driver-demo":
+        if args.batch is not None:
+            return _run("factory/tools/resolve_driver.py", ["--action", args.action, "--batch", args.batch])
         return _run(
             "factory/tools/resolve_driver.py",
             ["--action", args.action, "--target", args.target],
         )
 
+    if args.cmd == "drivers" and args.drivers_cmd == "run":
+        argv = list(args.services) + ["--action", args.action]
+        if args.jobs is not None:
+            argv += ["--jobs", str(args.jobs)]
+        if args.timeout is not None:
+            argv += ["--timeout", str(args.timeout)]
+        if args.json:
+            argv.append("--json")
+        return _run("factory/tools/run_drivers.py", argv)
+
     if args.cmd == "agents-suggest":
         return _run("factory/tools/update_agents.py", ["--path", args.path])
 
     if args.cmd == "dream-scan":
-        return _run(
-            "factory/tools/dream_scan.py",
-            [
-                "--root",
-                args.root,
-                "--cc-threshold",
-                str(args.cc_threshold),
-                "--file-lines",
-                str(args.file_lines),
-            ],
-        )
+        argv = [
+            "--root",
+            args.root,
+            "--cc-threshold",
+            str(args.cc_threshold),
+            "--file-lines",
+            str(args.file_lines),
+            "--clone-threshold",
+            str(args.clone_threshold),
+        ]
+        if args.no_cache:
+            argv.append("--no-cache")
+        if args.workers is not None:
+            argv += ["--workers", str(args.workers)]
+        if args.hotspots:
+            argv += ["--hotspots", "--rev", args.rev, "--top", str(args.top)]
+            if args.since:
+                argv += ["--since", args.since]
+            if args.max_commits is not None:
+                argv += ["--max-commits", str(args.max_commits)]
+        return _run("factory/tools/dream_scan.py", argv)
 
     if args.cmd == "validate-missions":
         return _run("factory/tools/validate_missions.py", [])
@@ -215,9 +475,29 @@ def main() -> int:
         return _run("factory/tools/salvage.py", [])
 
     if args.cmd == "test":
-        cmd = [sys.executable, "-m", "unittest", "discover", "-s", "tests", "-v"]
-        p = subprocess.run(cmd)
-        return int(p.returncode)
+        if args.coverage:
+            return _run("factory/tools/run_tests.py", ["--coverage", "--out-dir", args.out_dir])
+        argv = ["--jobs", str(args.jobs)] if args.jobs is not None else []
+        return _run("factory/tools/run_tests.py", argv)
+
+    if args.cmd == "metrics" and args.metrics_cmd == "trend":
+        argv = [args.metric] if args.metric else []
+        if args.last is not None:
+            argv += ["--last", str(args.last)]
+        if args.direction:
+            argv += ["--direction", args.direction]
+        if args.tolerance is not None:
+            argv += ["--tolerance", str(args.tolerance)]
+        if args.relative_tolerance is not None:
+            argv += ["--relative-tolerance", str(args.relative_tolerance)]
+        argv += ["--config", args.config, "--rev", args.rev]
+        if args.recorded_order:
+            argv.append("--recorded-order")
+        if args.series:
+            argv.append("--series")
+        if args.json:
+            argv.append("--json")
+        return _run("factory/tools/metrics_trend.py", argv)
 
     if args.cmd == "metrics":
         Path(args.out_dir).mkdir(parents=True, exist_ok=True)
@@ -226,10 +506,25 @@ def main() -> int:
             ["--root", args.root, "--out-dir", args.out_dir],
         )
 
+    if args.cmd == "bench":
+        argv = ["--runs", str(args.runs), "--warmup", str(args.warmup), "--out-dir", args.out_dir]
+        if args.stages:
+            argv += ["--stages", args.stages]
+        if args.json:
+            argv.append("--json")
+        return _run("factory/tools/bench_pipeline.py", argv)
+
+    if args.cmd == "importtime":
+        return _run(
+            "factory/tools/collect_importtime.py",
+            ["--config", args.config, "--runs", str(args.runs), "--out-dir", args.out_dir],
+        )
+
     if args.cmd == "ratchet-check":
+        # Checks are not measurements of record: history is only written on request.
         m = _run(
             "factory/tools/collect_metrics.py",
-            ["--root", ".", "--out-dir", ".metrics/current"],
+            ["--root", ".", "--out-dir", ".metrics/current"] + ([] if args.record_history else ["--no-history"]),
         )
         if m != 0:
             return m
@@ -241,7 +536,7 @@ def main() -> int:
     if args.cmd == "ratchet-baseline":
         m = _run(
             "factory/tools/collect_metrics.py",
-            ["--root", ".", "--out-dir", ".metrics/current"],
+            ["--root", ".", "--out-dir", ".metrics/current", "--no-history"],
         )
         if m != 0:
             return m
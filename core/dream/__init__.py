@@ -0,0 +1 @@
+"""Dream scan (Depth 0): read-only entropy signals over a source tree."""
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import ast
+import math
+import zlib
+from collections import deque
+
+# Winnowing parameters: every shared run of at least K + W - 1 normalized tokens
+# is guaranteed to share a fingerprint; runs shorter than K never match.
+K = 8
+W = 6
+MIN_TOKENS = 40
+
+_DROP = (ast.Load, ast.Store, ast.Del, ast.alias, ast.TypeIgnore)
+_SCOPES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+
+
+def _tokens(node: ast.AST, out: list[str]) -> None:
+    """Pre-order node types; identifiers, literals and docstrings are abstracted away.
+
+    Nested defs become a single token: they are fingerprinted on their own, and
+    inlining them would make every closure look like a clone of its parent.
+    """
+
+    for child in ast.iter_child_nodes(node):
+        if isinstance(child, _DROP):
+            continue
+        if isinstance(child, _SCOPES):
+            out.append(type(child).__name__)
+            continue
+        if isinstance(child, ast.Constant):
+            out.append(f"Constant:{type(child.value).__name__}")
+            continue
+        out.append(type(child).__name__)
+        _tokens(child, out)
+        out.append(")")
+
+
+def normalize(fn: ast.FunctionDef | ast.AsyncFunctionDef) -> list[str]:
+    body = fn.body
+    if body and isinstance(body[0], ast.Expr) and isinstance(body[0].value, ast.Constant) and isinstance(body[0].value.value, str):
+        body = body[1:]
+    out: list[str] = [type(fn.args).__name__]
+    _tokens(fn.args, out)
+    for stmt in body:
+        out.append(type(stmt).__name__)
+        if not isinstance(stmt, _SCOPES):
+            _tokens(stmt, out)
+            out.append(")")
+    return out
+
+
+def winnow(tokens: list[str], k: int = K, w: int = W) -> list[int]:
+    """Winnowed fingerprints (sorted, unique) of the k-gram hashes of ``tokens``.
+
+    crc32 rather than ``hash()`` so fingerprints are stable across processes and
+    can live in the scan cache.
+    """
+
+    if len(tokens) < k:
+        return []
+    hashes = [zlib.crc32(" ".join(tokens[i : i + k]).encode()) for i in range(len(tokens) - k + 1)]
+    if len(hashes) <= w:
+        return [min(hashes)]
+    picked: set[int] = set()
+    for i in range(len(hashes) - w + 1):
+        picked.add(min(hashes[i : i + w]))
+    return sorted(picked)
+
+
+def fingerprints(module: ast.Module, min_tokens: int = MIN_TOKENS) -> dict[str, list[int]]:
+    """qualified name -> fingerprints, for functions big enough to be worth flagging."""
+
+    out: dict[str, list[int]] = {}
+    stack: list[tuple[ast.AST, str]] = [(module, "")]
+    while stack:
+        node, prefix = stack.pop()
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, _SCOPES):
+                name = f"{prefix}{child.name}"
+                if not isinstance(child, ast.ClassDef):
+                    tokens = normalize(child)
+                    if len(tokens) >= min_tokens:
+                        out[name] = winnow(tokens)
+                stack.append((child, name + "."))
+            elif not isinstance(child, ast.expr):
+                stack.append((child, prefix))
+    return out
+
+
+class _UnionFind:
+    def __init__(self, n: int) -> None:
+        self.parent = list(range(n))
+
+    def find(self, i: int) -> int:
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, a: int, b: int) -> None:
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self.parent[max(ra, rb)] = min(ra, rb)
+
+
+def clone_groups(
+    functions: list[tuple[str, str, list[int]]],
+    threshold: float = 0.8,
+    max_postings: int = 200,
+) -> list[dict]:
+    """Group near-duplicate functions.
+
+    ``functions`` is ``[(file, symbol, fingerprints)]``. Pairs with Jaccard
+    similarity >= ``threshold`` are unioned; each group reports the weakest link
+    that joined it. Candidates come from an inverted index over each function's
+    rarest fingerprints (prefix filtering): two sets with Jaccard >= t must share
+    one of the first ``len - ceil(t * len) + 1`` fingerprints in a fixed global
+    order, so only that prefix is indexed and probed. Byte-for-byte identical
+    fingerprint sets are collapsed before indexing. Postings lists longer than
+    ``max_postings`` are not probed, which bounds the work on boilerplate.
+    """
+
+    uf = _UnionFind(len(functions))
+    edges: list[tuple[int, int, float]] = []
+
+    exact: dict[tuple[int, ...], int] = {}
+    reps: list[int] = []
+    for i, (_, _, fps) in enumerate(functions):
+        if not fps:
+            continue
+        first = exact.setdefault(tuple(fps), i)
+        if first == i:
+            reps.append(i)
+        else:
+            uf.union(first, i)
+            edges.append((first, i, 1.0))
+
+    df: dict[int, int] = {}
+    for i in reps:
+        for fp in functions[i][2]:
+            df[fp] = df.get(fp, 0) + 1
+    rank = {fp: n for n, fp in enumerate(sorted(df, key=lambda fp: (df[fp], fp)))}
+
+    sets: dict[int, set[int]] = {}
+    index: dict[int, deque[int]] = {}
+    # Ascending size: everything already indexed is no larger than the probe, and
+    # anything smaller than threshold * probe size can never match a later probe
+    # either, so it is dropped from the front of the postings list.
+    for i in sorted(reps, key=lambda r: len(functions[r][2])):
+        fps = functions[i][2]
+        sets[i] = set(fps)
+        ordered = sorted(fps, key=rank.__getitem__)
+        prefix = ordered[: len(fps) - math.ceil(threshold * len(fps)) + 1]
+        min_size = threshold * len(fps)
+        candidates: set[int] = set()
+        for fp in prefix:
+            postings = index.get(fp)
+            if postings is None:
+                postings = index[fp] = deque()
+            while postings and len(sets[postings[0]]) < min_size:
+                postings.popleft()
+            if len(postings) <= max_postings:
+                candidates.update(postings)
+            postings.append(i)
+        for j in candidates:
+            shared = len(sets[i] & sets[j])
+            similarity = shared / (len(sets[i]) + len(sets[j]) - shared)
+            if similarity >= threshold:
+                uf.union(i, j)
+                edges.append((i, j, similarity))
+
+    members: dict[int, list[int]] = {}
+    weakest: dict[int, float] = {}
+    for i, j, similarity in edges:
+        root = uf.find(i)
+        weakest[root] = min(weakest.get(root, 1.0), similarity)
+    for i in range(len(functions)):
+        root = uf.find(i)
+        if root in weakest:
+            members.setdefault(root, []).append(i)
+
+    groups = [
+        {
+            "similarity": round(weakest[root], 3),
+            "members": sorted((functions[i][0], functions[i][1]) for i in ids),
+        }
+        for root, ids in members.items()
+    ]
+    groups.sort(key=lambda g: (-len(g["members"]), -g["similarity"], g["members"]))
+    return groups
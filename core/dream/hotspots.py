@@ -0,0 +1,289 @@
+from __future__ import annotations
+
+import ast
+import bisect
+import re
+import subprocess
+from pathlib import Path
+
+from core.dream.scan import _complexity, iter_functions
+from core.graph.git_objects import CatFile
+
+_HUNK_RE = re.compile(rb"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+_COMMIT = b"\x1e"
+_BODY = (b"+", b"-", b"\\")
+
+
+class _FileHistory:
+    """Line ownership for one file that exists at the scanned revision.
+
+    ``spans`` is a sorted, disjoint list of ``[lo, hi, shift]``: line ``p`` of the
+    file as of the commit being read is line ``p + shift`` at the scanned
+    revision. Lines outside every span (added later, or deleted since) have no
+    current counterpart. There is at most one span per current line, so memory is
+    bounded by the size of the tree, not the length of history.
+    """
+
+    def __init__(self, path: str, lines: int, owner: list[int]) -> None:
+        self.path = path  # at the scanned revision; history keys follow renames
+        self.spans: list[list[int]] = [[1, lines, 0]] if lines else []
+        self.owner = owner  # current line -> innermost function index (or -1)
+
+    def current(self, start: int, end: int) -> list[int]:
+        out: list[int] = []
+        i = bisect.bisect_right(self.spans, [start, float("inf")]) - 1
+        i = max(i, 0)
+        while i < len(self.spans) and self.spans[i][0] <= end:
+            lo, hi, shift = self.spans[i]
+            a, b = max(lo, start), min(hi, end)
+            if a <= b:
+                out.extend(range(a + shift, b + shift + 1))
+            i += 1
+        return out
+
+    def before(self, p: int) -> int | None:
+        """Current line of the nearest mapped line at or above ``p`` (None at the top)."""
+
+        i = bisect.bisect_right(self.spans, [p, float("inf")]) - 1
+        if i < 0:
+            return None
+        lo, hi, shift = self.spans[i]
+        return min(p, hi) + shift
+
+    def rewind(self, hunks: list[tuple[int, int, int, int]]) -> None:
+        """Map spans from post-image to pre-image coordinates of one diff.
+
+        Post-image lines a hunk added have no pre-image line and are dropped;
+        pre-image lines it deleted are simply never mapped to.
+        """
+
+        if not hunks:
+            return
+        ends = [ns + nl - 1 if nl else ns for _, _, ns, nl in hunks]
+        deltas = [0]
+        for _, ol, _, nl in hunks:
+            deltas.append(deltas[-1] + nl - ol)
+
+        # Spans wholly above the first hunk are unchanged and those wholly below the
+        # last one move by the total delta; only the ones in between are split.
+        first = hunks[0][2] if hunks[0][3] else hunks[0][2] + 1
+        start = bisect.bisect_left(self.spans, [first, 0])
+        if start and self.spans[start - 1][1] >= first:
+            start -= 1
+        stop = bisect.bisect_right(self.spans, [ends[-1], float("inf")])
+        spans = self.spans[:start]
+        for lo, hi, shift in self.spans[start:stop]:
+            cursor = lo
+            h = bisect.bisect_left(ends, lo)
+            while cursor <= hi:
+                if h == len(hunks):
+                    last = hi
+                else:
+                    _, _, ns, nl = hunks[h]
+                    last = min(hi, ns - 1 if nl else ns)
+                if cursor <= last:
+                    # Every line in [cursor, last] sits after exactly h hunks.
+                    d = deltas[h]
+                    spans.append([cursor - d, last - d, shift + d])
+                if h == len(hunks):
+                    break
+                cursor = max(cursor, ends[h] + 1)
+                h += 1
+        d = deltas[-1]
+        spans.extend([lo - d, hi - d, shift + d] for lo, hi, shift in self.spans[stop:])
+        self.spans = spans
+
+
+def _spans(data: bytes) -> tuple[int, list[tuple[str, int, int, int]]]:
+    """(line count, [(qualname, start, end, complexity)]) for one Python blob."""
+
+    text = data.decode("utf-8", "replace")
+    lines = len(text.splitlines())
+    try:
+        module = ast.parse(text)
+    except SyntaxError:
+        return lines, []
+    return lines, [(name, node.lineno, node.end_lineno or node.lineno, _complexity(node)) for name, node in iter_functions(module)]
+
+
+def _owner(lines: int, spans: list[tuple[str, int, int, int]]) -> list[int]:
+    owner = [-1] * (lines + 2)
+    # Outer spans first so nested functions overwrite their parent's lines.
+    for idx in sorted(range(len(spans)), key=lambda k: (spans[k][1], -spans[k][2])):
+        _, start, end, _ = spans[idx]
+        end = min(end, lines + 1)
+        owner[start : end + 1] = [idx] * (end - start + 1)
+    return owner
+
+
+def _git_log(root: Path, rev: str, since: str | None, max_commits: int | None) -> subprocess.Popen:
+    cmd = [
+        "git",
+        "-c",
+        "core.quotePath=false",
+        "log",
+        "--first-parent",
+        "-p",
+        "-U0",
+        "-M",
+        "--no-color",
+        "--no-ext-diff",
+        "--relative",
+        "--format=%x1e%H",
+    ]
+    if since:
+        cmd.append(f"--since={since}")
+    if max_commits:
+        cmd.append(f"--max-count={max_commits}")
+    cmd += [rev, "--", "."]
+    return subprocess.Popen(cmd, cwd=root, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+
+
+def _path(raw: bytes, prefix: bytes) -> str | None:
+    raw = raw.rstrip(b"\n").split(b"\t", 1)[0]
+    if raw == b"/dev/null":
+        return None
+    if raw.startswith(prefix):
+        raw = raw[len(prefix) :]
+    return raw.decode("utf-8", "surrogateescape")
+
+
+class _Churn:
+    """Per-file and per-function churn accumulated while one ``git log -p`` streams by."""
+
+    def __init__(self, cat: CatFile, rev: str, suffixes: tuple[str, ...]) -> None:
+        self.files: dict[str, dict] = {}
+        self.functions: dict[str, list[tuple[str, int, int, int]]] = {}
+        self.history: dict[str, _FileHistory] = {}
+        for path, sha in cat.tree_blobs(rev, ".", set(suffixes)):
+            _, _, data = cat.read(sha)
+            lines, spans = _spans(data)
+            self.functions[path] = spans
+            self.history[path] = _FileHistory(path, lines, _owner(lines, spans))
+            self.files[path] = {"lines": lines, "commits": 0, "added": 0, "deleted": 0}
+        self.fn_stats = {path: [[0, 0] for _ in spans] for path, spans in self.functions.items()}  # [commits, churn]
+        self.commits = 0
+        self.touched: set[tuple[str, int]] = set()
+        self.state: dict = {}  # the file diff being read: old/target paths and hunks
+
+    def feed(self, line: bytes) -> None:
+        state = self.state
+        if line[:1] in _BODY and "hunks" in state:
+            return  # hunk body: the header already has positions and counts
+        if line.startswith(_COMMIT):
+            self.finish_commit()
+            self.commits += 1
+        elif line.startswith(b"diff --git "):
+            self.finish_file()
+        elif line.startswith(b"rename from "):
+            state["old"] = line[len(b"rename from ") :].rstrip(b"\n").decode("utf-8", "surrogateescape")
+        elif line.startswith(b"rename to "):
+            new = line[len(b"rename to ") :].rstrip(b"\n").decode("utf-8", "surrogateescape")
+            state["target"] = new if new in self.history else None
+        elif line.startswith(b"--- ") and "hunks" not in state:
+            state.setdefault("old", _path(line[4:], b"a/"))
+        elif line.startswith(b"+++ ") and "hunks" not in state:
+            new = _path(line[4:], b"b/")
+            state["target"] = new if new in self.history else None
+            state["hunks"] = []
+        elif line.startswith(b"@@ "):
+            m = _HUNK_RE.match(line)
+            if m and state.get("target") is not None:
+                ol = 1 if m.group(2) is None else int(m.group(2))
+                nl = 1 if m.group(4) is None else int(m.group(4))
+                state["hunks"].append((int(m.group(1)), ol, int(m.group(3)), nl))
+
+    def _attribute(self, tracked: _FileHistory, hunks: list[tuple[int, int, int, int]]) -> None:
+        current = self.files[tracked.path]
+        current["commits"] += 1
+        stats = self.fn_stats[tracked.path]
+        for _, ol, ns, nl in hunks:
+            current["added"] += nl
+            current["deleted"] += ol
+            # Lines that survive to ``rev`` are owned by the function holding them
+            # now; lines rewritten since (and deletions) go to the function around
+            # the hunk, i.e. the one owning the nearest surviving line above it.
+            mapped = tracked.current(ns, ns + nl - 1) if nl else []
+            owners: dict[int, int] = {}
+            for line in mapped:
+                idx = tracked.owner[line]
+                if idx >= 0:
+                    owners[idx] = owners.get(idx, 0) + 1
+            rest = nl + ol - len(mapped)
+            if rest:
+                above = tracked.before(ns - 1 if nl else ns)
+                idx = tracked.owner[above] if above is not None else -1
+                if idx >= 0:
+                    owners[idx] = owners.get(idx, 0) + rest
+            for idx, n in owners.items():
+                stats[idx][1] += n
+                self.touched.add((tracked.path, idx))
+
+    def finish_file(self) -> None:
+        state, self.state = self.state, {}
+        target = state.get("target")
+        if target is None:
+            return
+        tracked = self.history[target]
+        if state.get("hunks"):
+            self._attribute(tracked, state["hunks"])
+            tracked.rewind(state["hunks"])
+        old = state.get("old", target)
+        if old is None:
+            # Created in this commit: nothing older belongs to the current file.
+            self.history.pop(target, None)
+        elif old != target:
+            self.history[old] = self.history.pop(target)
+
+    def finish_commit(self) -> None:
+        self.finish_file()
+        for path, idx in self.touched:
+            self.fn_stats[path][idx][0] += 1
+        self.touched.clear()
+
+    def rows(self) -> dict:
+        fn_rows = []
+        for path, spans in self.functions.items():
+            for idx, (name, start, _, cc) in enumerate(spans):
+                n_commits, churn = self.fn_stats[path][idx]
+                if n_commits:
+                    fn_rows.append(
+                        {"file": path, "symbol": name, "line": start, "cc": cc, "commits": n_commits, "churn": churn, "score": n_commits * cc}
+                    )
+        file_rows = []
+        for path, f in self.files.items():
+            if f["commits"]:
+                cc = sum(s[3] for s in self.functions[path])
+                file_rows.append(dict(f, file=path, cc=cc, score=f["commits"] * max(cc, 1)))
+        fn_rows.sort(key=lambda r: (-r["score"], -r["churn"], r["file"], r["line"]))
+        file_rows.sort(key=lambda r: (-r["score"], -(r["added"] + r["deleted"]), r["file"]))
+        return {"commits": self.commits, "functions": fn_rows, "files": file_rows}
+
+
+def hotspots(
+    root: Path,
+    rev: str = "HEAD",
+    since: str | None = None,
+    max_commits: int | None = None,
+    suffixes: tuple[str, ...] = (".py",),
+) -> dict:
+    """Churn per file and per function over one streamed ``git log``, joined with complexity.
+
+    History is read newest first from a single ``git log -p -U0`` process (first
+    parent only, renames followed). Hunk headers carry the same added/deleted
+    counts as ``--numstat`` plus their positions, which are mapped back to lines
+    of ``rev`` so churn lands on the functions that exist now. Complexity and
+    function spans come from the blobs at ``rev`` via one ``git cat-file`` process.
+    """
+
+    with CatFile(cwd=str(root)) as cat:
+        churn = _Churn(cat, rev, suffixes)
+    proc = _git_log(root, rev, since, max_commits)
+    assert proc.stdout is not None
+    for line in proc.stdout:
+        churn.feed(line)
+    churn.finish_commit()
+    proc.stdout.close()
+    if proc.wait() != 0 and churn.commits == 0:
+        raise RuntimeError(f"git log failed in {root}")
+    return churn.rows()
@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import ast
+import hashlib
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from core.dream.clones import fingerprints
+from core.inventory import inventory
+
+CACHE_VERSION = 2
+
+_FUNCTIONS = (ast.FunctionDef, ast.AsyncFunctionDef)
+_SCOPES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+_DECISIONS = (ast.If, ast.IfExp, ast.For, ast.AsyncFor, ast.While, ast.ExceptHandler, ast.match_case)
+
+
+def _complexity(fn: ast.AST) -> int:
+    """McCabe complexity of one function body: 1 + decision points.
+
+    Nested functions and classes are scored on their own, not added to the parent.
+    """
+
+    cc = 1
+    stack = list(ast.iter_child_nodes(fn))
+    while stack:
+        node = stack.pop()
+        if isinstance(node, _SCOPES):
+            continue
+        if isinstance(node, _DECISIONS):
+            cc += 1
+        elif isinstance(node, ast.BoolOp):
+            cc += len(node.values) - 1
+        elif isinstance(node, ast.comprehension):
+            cc += 1 + len(node.ifs)
+        stack.extend(ast.iter_child_nodes(node))
+    return cc
+
+
+def iter_functions(module: ast.Module):
+    """Yield (qualified name, node) for every function, method and nested function."""
+
+    stack: list[tuple[ast.AST, str]] = [(module, "")]
+    while stack:
+        node, prefix = stack.pop()
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, _SCOPES):
+                name = f"{prefix}{child.name}"
+                if isinstance(child, _FUNCTIONS):
+                    yield name, child
+                stack.append((child, name + "."))
+            elif not isinstance(child, ast.expr):
+                # Statements can hold defs (if TYPE_CHECKING:, try/except imports, ...).
+                stack.append((child, prefix))
+
+
+def functions(module: ast.Module) -> list[tuple[str, int, int]]:
+    """(qualified name, line, complexity) for every function, method and nested function."""
+
+    out = [(name, node.lineno, _complexity(node)) for name, node in iter_functions(module)]
+    out.sort(key=lambda f: f[1])
+    return out
+
+
+def file_facts(data: bytes) -> dict:
+    """Threshold-independent facts for one file (what the cache stores)."""
+
+    try:
+        text = data.decode("utf-8")
+    except UnicodeDecodeError:
+        return {"skip": True}
+    facts: dict = {"lines": len(text.splitlines())}
+    try:
+        module = ast.parse(text)
+    except SyntaxError:
+        facts["syntax_error"] = True
+        return facts
+    facts["functions"] = functions(module)
+    facts["fingerprints"] = fingerprints(module)
+    return facts
+
+
+def _read(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def _facts_for_path(path: str) -> tuple[str, dict]:
+    data = _read(path)
+    return hashlib.sha256(data).hexdigest(), file_facts(data)
+
+
+def _facts_chunk(paths: list[str]) -> list[tuple[str, dict]]:
+    return [_facts_for_path(p) for p in paths]
+
+
+def iter_py(root: Path):
+    """Yield (path, (mtime_ns, size)) for ``*.py`` in the inventory of ``root``.
+
+    A manifest-backed inventory may predate the last edit, so its files are
+    stat'ed again; a fresh walk's stat is reused.
+    """
+
+    inv = inventory(root)
+    base = os.path.join(str(root), "")
+    for e in inv.files({".py"}):
+        path = base + e.path
+        if inv.fresh:
+            yield path, (e.mtime_ns, e.size)
+            continue
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        yield path, (st.st_mtime_ns, st.st_size)
+
+
+class ScanCache:
+    """path -> (mtime_ns, size, sha) and sha -> facts, pickled.
+
+    An unchanged file (same mtime and size) is never read; a touched file whose
+    content hash is known is read and hashed but not parsed again. The cache is
+    shared by scans of different roots, so a save only forgets deleted files
+    under the root it scanned, and evicts the least recently scanned paths once
+    there are more than ``MAX_PATHS``.
+    """
+
+    MAX_PATHS = 200_000
+
+    def __init__(self, path: Path | None) -> None:
+        self.path = path
+        self.stats: dict[str, tuple[int, int, str]] = {}
+        self.facts: dict[str, dict] = {}
+        self._dirty = False
+        if path is not None and path.exists():
+            try:
+                with path.open("rb") as f:
+                    data = pickle.load(f)
+            except (OSError, pickle.UnpicklingError, EOFError):
+                data = None
+            if isinstance(data, dict) and data.get("version") == CACHE_VERSION:
+                self.stats = data["stats"]
+                self.facts = data["facts"]
+
+    def remember(self, path: str, stat_key: tuple[int, int], sha: str) -> None:
+        self.stats[path] = (stat_key[0], stat_key[1], sha)
+        self._dirty = True
+
+    def save(self, live_paths: set[str], under: str = "") -> None:
+        """Persist; ``live_paths`` are the files just scanned below the ``under`` prefix."""
+
+        stale = [p for p in self.stats if p not in live_paths and p.startswith(under)]
+        if stale or len(self.stats) > self.MAX_PATHS:
+            for p in stale:
+                del self.stats[p]
+            if len(self.stats) > self.MAX_PATHS:
+                # Oldest first: other roots in their stored order, then this scan.
+                order = [p for p in self.stats if p not in live_paths] + [p for p in self.stats if p in live_paths]
+                self.stats = {p: self.stats[p] for p in order[-self.MAX_PATHS :]}
+            live = {s[2] for s in self.stats.values()}
+            self.facts = {k: v for k, v in self.facts.items() if k in live}
+            self._dirty = True
+        if self.path is None or not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with tmp.open("wb") as f:
+            pickle.dump(
+                {"version": CACHE_VERSION, "stats": self.stats, "facts": self.facts},
+                f,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        tmp.replace(self.path)
+        self._dirty = False
+
+
+def scan(root: Path, cache: ScanCache, workers: int | None = None, min_batch: int = 64) -> tuple[dict[str, dict], dict]:
+    """Facts for every ``*.py`` under ``root`` -> ({path: facts}, stats)."""
+
+    results: dict[str, dict] = {}
+    pending: dict[str, list[str]] = {}  # sha -> paths; identical files are parsed once
+    stat_hits = hash_hits = 0
+    live: set[str] = set()
+
+    for path, key in iter_py(root):
+        live.add(path)
+        known = cache.stats.get(path)
+        if known is not None and known[:2] == key and known[2] in cache.facts:
+            stat_hits += 1
+            results[path] = cache.facts[known[2]]
+            continue
+        try:
+            data = _read(path)
+        except OSError:
+            continue
+        sha = hashlib.sha256(data).hexdigest()
+        cache.remember(path, key, sha)
+        if sha in cache.facts:
+            hash_hits += 1
+            results[path] = cache.facts[sha]
+        else:
+            pending.setdefault(sha, []).append(path)
+
+    parse = [paths[0] for paths in pending.values()]
+    if parse:
+        workers = workers or os.cpu_count() or 1
+        if workers > 1 and len(parse) >= min_batch:
+            size = max(1, -(-len(parse) // (workers * 4)))
+            chunks = [parse[i : i + size] for i in range(0, len(parse), size)]
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                parsed = [r for rs in pool.map(_facts_chunk, chunks) for r in rs]
+        else:
+            parsed = _facts_chunk(parse)
+        for (expected, paths), (sha, facts) in zip(pending.items(), parsed):
+            # Parsing re-reads the file; key the facts by the hash of what was parsed.
+            cache.facts[sha] = facts
+            for path in paths:
+                cache.remember(path, cache.stats[path][:2], sha if path == paths[0] else expected)
+                results[path] = facts
+
+    cache.save(live, under=os.path.join(str(root), ""))
+    return results, {"files": len(live), "stat_hits": stat_hits, "hash_hits": hash_hits, "parsed": len(parse)}
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+# Checked in this order in each directory; the nearest directory with any marker wins.
+MARKERS = (
+    ("pyproject.toml", "python"),
+    ("requirements.txt", "python"),
+    ("package.json", "javascript"),
+)
+DEFAULT_LANGUAGE = "python"  # conservative default for this demo repo
+
+
+class MarkerIndex:
+    """Directory -> language, memoized across targets.
+
+    Each directory is probed for the marker files at most once; walking up from a
+    target stops at the first directory already in the index, and every directory
+    passed on the way is filled in with the answer. Targets sharing ancestors
+    (services in one repo, files in one package) therefore cost one dict lookup
+    after the first.
+    """
+
+    def __init__(self) -> None:
+        self.languages: dict[str, str | None] = {}  # None: no marker here or above
+        self.probes = 0
+
+    def _probe(self, directory: str) -> str | None:
+        self.probes += 1
+        for name, language in MARKERS:
+            if os.path.exists(os.path.join(directory, name)):
+                return language
+        return None
+
+    def language(self, target: str | Path) -> str:
+        path = os.path.normpath(str(target))
+        if os.path.isfile(path):
+            path = os.path.dirname(path) or "."
+
+        # Same chain as ``[p] + list(p.parents)``: a relative target stops at ".".
+        walked: list[str] = []
+        found: str | None = None
+        while True:
+            if path in self.languages:
+                found = self.languages[path]
+                break
+            walked.append(path)
+            found = self._probe(path)
+            if found is not None:
+                break
+            parent = os.path.dirname(path)
+            if parent == path or path == ".":
+                break
+            path = parent or "."
+        for directory in walked:
+            self.languages[directory] = found
+        return found or DEFAULT_LANGUAGE
+
+
+def compile_registry(registry: dict) -> dict[tuple[str, str], list[str]]:
+    """``{action: [{match: {language}, cmd}]}`` -> ``{(action, language): cmd}``.
+
+    The first matching rule wins, as in a linear scan of the registry.
+    """
+
+    compiled: dict[tuple[str, str], list[str]] = {}
+    for action, rules in registry.items():
+        for rule in rules or []:
+            language = rule.get("match", {}).get("language")
+            if language is not None:
+                compiled.setdefault((action, language), rule.get("cmd"))
+    return compiled
+
+
+def load_registry(path: Path) -> dict[tuple[str, str], list[str]]:
+    return compile_registry(json.loads(path.read_text(encoding="utf-8")))
+
+
+def resolve(compiled: dict[tuple[str, str], list[str]], index: MarkerIndex, action: str, target: str | Path) -> dict:
+    """One resolution record: ``{action, target, language, cmd}`` or ``{..., error}``."""
+
+    language = index.language(target)
+    record = {"action": action, "target": str(target), "language": language}
+    cmd = compiled.get((action, language))
+    if cmd is None:
+        record["error"] = f"no driver for action={action} language={language}"
+    else:
+        record["cmd"] = cmd
+    return record
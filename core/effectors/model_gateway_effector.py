@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import argparse
+import difflib
+import os
+import sys
+from pathlib import Path
+
+from core.effectors.unified_diff import apply_unified_diff
+from core.missions.loader import load_mission
+from core.model.gateway import GatewayError, MissionBudget, ModelGateway
+from core.prep.render import compile_template, doc_sync_variables, render
+from core.prep.terrain import heading_block, public_function_signatures
+
+HEADING = "## Public Interfaces"
+DEFAULT_ENDPOINT = "http://127.0.0.1:8765/v1/complete"
+DEFAULT_TEMPLATE = Path(__file__).resolve().parents[2] / "factory/templates/doc_sync_diff_request.txt"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Model-backed Effector: request a Map diff through the model gateway."
+    )
+    parser.add_argument("--src", type=Path, required=True, help="Source root (Terrain)")
+    parser.add_argument("--doc", type=Path, required=True, help="Docs file (Map)")
+    parser.add_argument("--apply", action="store_true", help="Apply the diff to the Map file")
+    parser.add_argument("--endpoint", default=os.environ.get("AOI_MODEL_ENDPOINT", DEFAULT_ENDPOINT))
+    parser.add_argument("--model", default=os.environ.get("AOI_MODEL", "stub"))
+    parser.add_argument("--template", type=Path, default=DEFAULT_TEMPLATE)
+    parser.add_argument("--mission", type=Path, default=None, help="Mission Object (budgets + id)")
+    parser.add_argument("--retries", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args()
+
+    mission_id = "adhoc"
+    budget = MissionBudget()
+    if args.mission is not None:
+        mission = load_mission(args.mission)
+        mission_id = str(mission.get("mission_id", args.mission.stem))
+        budget = MissionBudget.from_mission(mission)
+
+    before = args.doc.read_text(encoding="utf-8")
+    context = {
+        "task_id": f"doc_sync:{mission_id}",
+        "target_file": str(args.doc),
+        "allowed_heading": HEADING,
+        "extracted_signatures": public_function_signatures(args.src),
+        "current_block": heading_block(before, HEADING),
+    }
+    request = render(compile_template(args.template.read_text(encoding="utf-8")), doc_sync_variables(context))
+
+    with ModelGateway(args.endpoint, model=args.model, retries=args.retries, timeout=args.timeout) as gateway:
+        gateway.set_budget(mission_id, budget)
+        try:
+            response = gateway.complete(request, mission_id=mission_id)
+        except GatewayError as e:
+            print(f"[effector] model call failed: {e}", file=sys.stderr)
+            return 1
+    usage = budget.summary()
+    print(f"[effector] model_calls={usage['calls']} est_tokens={usage['tokens']}", file=sys.stderr)
+
+    if "@@" not in response:
+        if response.strip() == "" or "no drift" in response.lower():
+            print("[effector] no drift detected (model proposed no change)")
+            return 0
+        print("[effector] model response is not a unified diff", file=sys.stderr)
+        return 1
+
+    try:
+        after = apply_unified_diff(before, response)
+    except ValueError as e:
+        print(f"[effector] model diff does not apply: {e}", file=sys.stderr)
+        return 1
+
+    # Re-emit the diff from the actual before/after, so what reviewers see is exactly
+    # what gets written.
+    diff = difflib.unified_diff(
+        before.splitlines(),
+        after.splitlines(),
+        fromfile=str(args.doc),
+        tofile=str(args.doc),
+        lineterm="",
+    )
+    print("\n".join(diff))
+
+    if args.apply:
+        args.doc.write_text(after, encoding="utf-8")
+        print(f"[effector] applied patch to {args.doc}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -6,10 +6,12 @@ import difflib
 import random
 from pathlib import Path
 
+from core.inventory import inventory
+
 
 def _public_functions(src_root: Path) -> list[tuple[str, list[str]]]:
     functions: list[tuple[str, list[str]]] = []
-    for path in sorted(src_root.rglob("*.py")):
+    for path in inventory(src_root).paths({".py"}):
         module = ast.parse(path.read_text(encoding="utf-8"))
         for node in module.body:
             if isinstance(node, ast.FunctionDef) and not node.name.startswith("_"):
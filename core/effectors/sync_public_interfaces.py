@@ -5,6 +5,8 @@ import difflib
 import re
 from pathlib import Path
 
+from core.inventory import inventory
+
 _DEF_RE = re.compile(
     r"^def\s+(?P<name>[A-Za-z_][A-Za-z0-9_]*)\s*\((?P<args>[^)]*)\)\s*(?:->\s*[^:]+)?\s*:"
 )
@@ -33,7 +35,7 @@ def _public_function_signatures(src_root: Path) -> list[str]:
     """
 
     signatures: set[str] = set()
-    for path in sorted(src_root.rglob("*.py")):
+    for path in inventory(src_root).paths({".py"}):
         for line in path.read_text(encoding="utf-8").splitlines():
             match = _DEF_RE.match(line)
             if not match:
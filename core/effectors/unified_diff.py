@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import re
+
+_HUNK_RE = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+
+def apply_unified_diff(text: str, diff: str) -> str:
+    """Apply a single-file unified diff to ``text``.
+
+    Context and removed lines must match exactly; any mismatch raises ValueError
+    rather than guessing (model output is untrusted).
+    """
+
+    old = text.splitlines()
+    out: list[str] = []
+    pos = 0
+    hunks = 0
+
+    lines = diff.splitlines()
+    i = 0
+    while i < len(lines) and not lines[i].startswith("@@"):
+        i += 1
+
+    while i < len(lines):
+        m = _HUNK_RE.match(lines[i])
+        if m is None:
+            raise ValueError(f"malformed hunk header: {lines[i]!r}")
+        start, count = int(m.group(1)), int(m.group(2) or "1")
+        idx = start - 1 if count > 0 else start
+        if idx < pos or idx > len(old):
+            raise ValueError(f"hunk out of order or out of range: {lines[i]!r}")
+        out.extend(old[pos:idx])
+        pos = idx
+        hunks += 1
+
+        i += 1
+        while i < len(lines) and not lines[i].startswith("@@"):
+            line = lines[i]
+            tag, body = line[:1], line[1:]
+            if tag in {" ", "", "-"}:
+                if pos >= len(old) or old[pos] != body:
+                    raise ValueError(f"diff does not apply at line {pos + 1}: expected {body!r}")
+                if tag != "-":
+                    out.append(body)
+                pos += 1
+            elif tag == "+":
+                out.append(body)
+            elif tag != "\\":  # "\ No newline at end of file"
+                raise ValueError(f"unexpected diff line: {line!r}")
+            i += 1
+
+    if hunks == 0:
+        raise ValueError("no hunks in diff")
+    out.extend(old[pos:])
+    return "\n".join(out) + ("\n" if text.endswith("\n") or not text else "")
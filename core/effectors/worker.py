@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import traceback
+from pathlib import Path
+from types import ModuleType
+from typing import Callable
+
+# JSON-lines Effector worker protocol (version 1), over stdin/stdout:
+#
+#   worker -> {"ready": true, "protocol": 1, "effector": "<path>", "pid": <pid>}
+#   runner -> {"id": <any>, "src": "<dir>", "doc": "<path>", "doc_text": "<optional>",
+#              "seed": <int|null>, "apply": <bool>, "args": [<extra argv>]}
+#   worker -> {"id": <any>, "returncode": <int>, "stdout": "...", "stderr": "...",
+#              "new_text": "<doc text after the call>", "elapsed_ms": <float>}
+#
+# With "doc_text" the Effector runs on a private temp copy (so concurrent workers
+# never share a file) and "doc" is only the logical path: occurrences of the temp
+# path in stdout/stderr are rewritten to it, so diffs look as if "doc" was edited.
+# Without "doc_text" the Effector reads (and with "apply", writes) "doc" directly.
+
+PROTOCOL_VERSION = 1
+
+
+def load_effector(path: Path) -> Callable[[], int]:
+    """Import an Effector script once and return its ``main``."""
+
+    spec = importlib.util.spec_from_file_location(f"_aoi_effector_{path.stem}", path)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"cannot load effector: {path}")
+    module: ModuleType = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    main = getattr(module, "main", None)
+    if not callable(main):
+        raise ImportError(f"effector has no main(): {path}")
+    return main
+
+
+def _call(main: Callable[[], int], argv: list[str]) -> tuple[int, str, str]:
+    out, err = io.StringIO(), io.StringIO()
+    saved_argv = sys.argv
+    sys.argv = argv
+    try:
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+            try:
+                rc = main()
+            except SystemExit as e:  # argparse errors, explicit exits
+                rc = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+                if isinstance(e.code, str):
+                    print(e.code, file=sys.stderr)
+            except Exception:
+                traceback.print_exc()
+                rc = 1
+    finally:
+        sys.argv = saved_argv
+    return int(rc or 0), out.getvalue(), err.getvalue()
+
+
+def handle(main: Callable[[], int], effector: str, request: dict) -> dict:
+    t0 = time.perf_counter()
+    doc = str(request["doc"])
+    tmpdir = None
+    run_doc = doc
+    if request.get("doc_text") is not None:
+        tmpdir = tempfile.mkdtemp(prefix="aoi_worker_")
+        run_doc = str(Path(tmpdir) / Path(doc).name)
+        Path(run_doc).write_text(request["doc_text"], encoding="utf-8")
+
+    argv = [effector, "--src", str(request["src"]), "--doc", run_doc]
+    if request.get("seed") is not None:
+        argv += ["--seed", str(request["seed"])]
+    if request.get("apply"):
+        argv.append("--apply")
+    argv += [str(a) for a in request.get("args", [])]
+
+    try:
+        rc, stdout, stderr = _call(main, argv)
+        result: dict = {"id": request.get("id"), "returncode": rc}
+        if tmpdir is not None:
+            stdout = stdout.replace(run_doc, doc)
+            stderr = stderr.replace(run_doc, doc)
+            result["new_text"] = Path(run_doc).read_text(encoding="utf-8")
+        result["stdout"] = stdout
+        result["stderr"] = stderr
+    finally:
+        if tmpdir is not None:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+    result["elapsed_ms"] = round((time.perf_counter() - t0) * 1000, 3)
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Host an Effector as a long-lived JSON-lines worker.")
+    parser.add_argument("--effector", type=Path, required=True, help="Effector script exposing main()")
+    args = parser.parse_args()
+
+    # Keep the protocol channel private: anything the Effector prints at import
+    # time or during a call must not interleave with protocol lines.
+    channel = os.fdopen(os.dup(sys.stdout.fileno()), "w", encoding="utf-8", buffering=1)
+    sys.stdout.flush()
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+
+    try:
+        effector_main = load_effector(args.effector)
+    except Exception as e:
+        channel.write(json.dumps({"ready": False, "error": f"{type(e).__name__}: {e}"}) + "\n")
+        return 1
+
+    channel.write(
+        json.dumps({"ready": True, "protocol": PROTOCOL_VERSION, "effector": str(args.effector), "pid": os.getpid()})
+        + "\n"
+    )
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        request: dict = {}
+        try:
+            request = json.loads(line)
+            result = handle(effector_main, str(args.effector), request)
+        except Exception as e:
+            result = {
+                "id": request.get("id"),
+                "returncode": 1,
+                "stdout": "",
+                "stderr": f"[worker] bad request: {type(e).__name__}: {e}\n",
+            }
+        channel.write(json.dumps(result) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
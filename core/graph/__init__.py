@@ -0,0 +1 @@
+"""Context graph: snapshot indexes and helpers shared by the graph tools."""
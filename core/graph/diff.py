@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import posixpath
+from pathlib import Path
+
+
+def _node_hash(node: dict) -> str:
+    # Snapshots built before content hashes existed: fall back to the node itself.
+    if "content_hash" in node:
+        return str(node["content_hash"])
+    blob = json.dumps(node, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(blob).hexdigest()[:16]
+
+
+def _edge_key(edge: dict) -> tuple[str, str, str]:
+    return (edge["src"], edge["dst"], edge.get("kind", ""))
+
+
+def diff_graphs(old: dict, new: dict) -> dict:
+    """Compare two snapshots in O(nodes + edges).
+
+    Nodes are matched by id and compared by content hash. Edges carry no content
+    beyond their (src, dst, kind) key, so they are only ever added or removed.
+    """
+
+    old_nodes = {n["id"]: n for n in old.get("nodes", [])}
+    new_nodes = {n["id"]: n for n in new.get("nodes", [])}
+
+    added = [n for nid, n in new_nodes.items() if nid not in old_nodes]
+    removed = [n for nid, n in old_nodes.items() if nid not in new_nodes]
+    changed = [
+        n
+        for nid, n in new_nodes.items()
+        if nid in old_nodes and _node_hash(old_nodes[nid]) != _node_hash(n)
+    ]
+
+    old_edges = {_edge_key(e): e for e in old.get("edges", [])}
+    new_edges = {_edge_key(e): e for e in new.get("edges", [])}
+
+    return {
+        "nodes": {"added": added, "removed": removed, "changed": changed},
+        "edges": {
+            "added": [e for k, e in new_edges.items() if k not in old_edges],
+            "removed": [e for k, e in old_edges.items() if k not in new_edges],
+        },
+    }
+
+
+def _norm(path: str) -> str:
+    return posixpath.normpath(path.replace("\\", "/"))
+
+
+def changed_paths(diff: dict) -> set[str]:
+    """Files touched by a diff: node paths plus the source file of every edge."""
+
+    paths: set[str] = set()
+    for bucket in diff["nodes"].values():
+        paths.update(_norm(str(n.get("path") or n["id"])) for n in bucket)
+    for bucket in diff["edges"].values():
+        paths.update(_norm(e["src"]) for e in bucket)
+    return paths
+
+
+def _under(path: str, root: str) -> bool:
+    return root == "." or path == root or path.startswith(root.rstrip("/") + "/")
+
+
+def affected_missions(paths: set[str], missions: list[tuple[Path, dict]]) -> list[dict]:
+    """Missions whose slice or scope covers any of ``paths``.
+
+    Matches ``slice.terrain_roots`` as directory prefixes, and ``slice.map_files`` and
+    ``scope.target_file`` (or its older spelling ``scope.file``) exactly.
+    """
+
+    ordered = sorted(paths)
+    affected: list[dict] = []
+    for mission_path, mission in missions:
+        scope = mission.get("scope") if isinstance(mission.get("scope"), dict) else {}
+        slice_spec = mission.get("slice") if isinstance(mission.get("slice"), dict) else {}
+
+        reasons: list[str] = []
+        for root in slice_spec.get("terrain_roots", []):
+            hits = [p for p in ordered if _under(p, _norm(root))]
+            if hits:
+                reasons.append(f"terrain_roots:{root} ({len(hits)} paths)")
+        for f in slice_spec.get("map_files", []):
+            if _norm(f) in paths:
+                reasons.append(f"map_files:{f}")
+        for key in ("target_file", "file"):
+            target = scope.get(key)
+            if isinstance(target, str) and _norm(target) in paths:
+                reasons.append(f"scope.{key}:{target}")
+
+        if reasons:
+            affected.append(
+                {
+                    "mission_id": mission.get("mission_id", "<missing>"),
+                    "path": str(mission_path),
+                    "reasons": reasons,
+                }
+            )
+    return affected
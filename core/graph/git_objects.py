@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import subprocess
+from pathlib import PurePosixPath
+from typing import Iterator
+
+_TREE_MODE = b"40000"
+_BLOB_MODES = {b"100644", b"100755"}
+
+
+class CatFile:
+    """A single long-lived ``git cat-file --batch`` process.
+
+    Objects are requested one line at a time over stdin, so reading thousands of
+    blobs (or walking trees across many revisions) costs one process, not one each.
+    """
+
+    def __init__(self, cwd: str | None = None) -> None:
+        self._proc = subprocess.Popen(
+            ["git", "cat-file", "--batch"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            cwd=cwd,
+        )
+        self._trees: dict[tuple[str, frozenset[str]], list[tuple[str, str]]] = {}
+
+    def __enter__(self) -> "CatFile":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._proc.stdin:
+            self._proc.stdin.close()
+        self._proc.wait()
+        if self._proc.stdout:
+            self._proc.stdout.close()
+
+    def read(self, spec: str) -> tuple[str, str, bytes]:
+        """Return (sha, type, content) for an object name such as ``<sha>`` or ``REV:./dir``."""
+
+        assert self._proc.stdin is not None and self._proc.stdout is not None
+        self._proc.stdin.write(spec.encode("utf-8") + b"\n")
+        self._proc.stdin.flush()
+
+        header = self._proc.stdout.readline()
+        if not header:
+            raise RuntimeError("git cat-file exited unexpectedly")
+        parts = header.split()
+        if len(parts) != 3:
+            raise ValueError(f"git object not found: {spec}")
+        size = int(parts[2])
+        content = self._proc.stdout.read(size)
+        self._proc.stdout.read(1)  # trailing LF
+        return parts[0].decode("ascii"), parts[1].decode("ascii"), content
+
+    def _tree_entries(self, sha: str) -> list[tuple[bytes, bytes, str]]:
+        _, kind, data = self.read(sha)
+        if kind != "tree":
+            raise ValueError(f"not a tree: {sha}")
+        entries = []
+        i = 0
+        while i < len(data):
+            space = data.index(b" ", i)
+            nul = data.index(b"\0", space)
+            mode = data[i:space]
+            name = data[space + 1 : nul]
+            entries.append((mode, name, data[nul + 1 : nul + 21].hex()))
+            i = nul + 21
+        return entries
+
+    def blobs(self, tree_sha: str, suffixes: set[str]) -> list[tuple[str, str]]:
+        """(relative path, blob sha) under a tree, depth-first with names sorted per directory.
+
+        Results are memoized per (tree sha, suffixes): subtrees unchanged between
+        revisions are only walked once.
+        """
+
+        key = (tree_sha, frozenset(suffixes))
+        cached = self._trees.get(key)
+        if cached is not None:
+            return cached
+
+        out: list[tuple[str, str]] = []
+        entries = sorted(self._tree_entries(tree_sha), key=lambda e: e[1].decode("utf-8", "surrogateescape"))
+        for mode, raw_name, sha in entries:
+            name = raw_name.decode("utf-8", "surrogateescape")
+            if mode == _TREE_MODE:
+                out.extend((f"{name}/{sub}", s) for sub, s in self.blobs(sha, suffixes))
+            elif mode in _BLOB_MODES and PurePosixPath(name).suffix in suffixes:
+                out.append((name, sha))
+        self._trees[key] = out
+        return out
+
+    def tree_blobs(self, rev: str, root: str, suffixes: set[str]) -> Iterator[tuple[str, str]]:
+        """(relative path, blob sha) for ``root`` (relative to the cwd) at ``rev``."""
+
+        sha, kind, _ = self.read(f"{rev}:./{root}")
+        if kind != "tree":
+            raise ValueError(f"{rev}:{root} is not a directory")
+        yield from self.blobs(sha, suffixes)
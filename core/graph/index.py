@@ -0,0 +1,353 @@
+from __future__ import annotations
+
+import bisect
+import math
+import pickle
+from array import array
+from collections import deque
+from pathlib import Path
+
+from core.graph.snapshot import load_graph
+
+INDEX_VERSION = 1
+
+# Sections and symbols are looked up by name; files by their path.
+_NAMED_KINDS = {"symbol", "doc_section"}
+
+# The index is stored column-wise (lists of str, arrays of int) rather than as
+# dicts of dicts: that is what keeps unpickling a large snapshot cheap.
+
+
+def index_path_for(graph_path: Path) -> Path:
+    # build/context_graph.json -> build/context_graph.json.index.pickle; keeping the
+    # full name means graph.json and graph.ndjson (or v1.2.json) never share an index.
+    return graph_path.with_name(graph_path.name + ".index.pickle")
+
+
+def _stamp(path: Path) -> list[int]:
+    st = path.stat()
+    return [st.st_size, st.st_mtime_ns]
+
+
+def _trigrams(text: str) -> set[str]:
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+def _postings(table: dict[str, list[int]]) -> dict[str, array]:
+    return {k: array("I", v) for k, v in table.items()}
+
+
+def _adjacency(pairs: list[tuple[int, int, int]], size: int) -> tuple[array, array, array]:
+    # CSR layout: neighbors of endpoint e are targets[offsets[e]:offsets[e + 1]].
+    pairs.sort()
+    offsets = array("I", [0]) * (size + 1)
+    for a, _, _ in pairs:
+        offsets[a + 1] += 1
+    for e in range(size):
+        offsets[e + 1] += offsets[e]
+    targets = array("I", (b for _, b, _ in pairs))
+    kinds = array("I", (k for _, _, k in pairs))
+    return offsets, targets, kinds
+
+
+def build_index(graph: dict) -> dict:
+    """Build lookup tables for a graph snapshot.
+
+    Node tables hold positions in snapshot order. Edges are keyed by "endpoints": every
+    node id plus any edge target that is not a node (e.g. an imported module name).
+    """
+
+    nodes = list(graph.get("nodes", []))
+    ids = [n["id"] for n in nodes]
+    kinds = [n.get("kind", "") for n in nodes]
+    paths = [str(n.get("path", "")) for n in nodes]
+    names = [n.get("name") for n in nodes]
+
+    by_kind: dict[str, list[int]] = {}
+    named: list[tuple[str, int]] = []
+    trigrams: dict[str, list[int]] = {}
+    labels: list[str] = []
+    trigram_counts = array("I")
+
+    for i in range(len(nodes)):
+        by_kind.setdefault(kinds[i], []).append(i)
+        if kinds[i] in _NAMED_KINDS and names[i]:
+            named.append((str(names[i]).lower(), i))
+
+        label = str(names[i] or paths[i] or ids[i]).lower()
+        labels.append(label)
+        grams = _trigrams(label)
+        trigram_counts.append(len(grams))
+        for g in grams:
+            trigrams.setdefault(g, []).append(i)
+
+    named.sort()
+    path_order = sorted(range(len(nodes)), key=paths.__getitem__)
+
+    edges = graph.get("edges", [])
+    endpoints = sorted(set(ids).union(e["src"] for e in edges).union(e["dst"] for e in edges))
+    position = {e: i for i, e in enumerate(endpoints)}
+    endpoint_node = array("i", [-1]) * len(endpoints)
+    for i, node_id in enumerate(ids):
+        endpoint_node[position[node_id]] = i
+
+    edge_kinds = sorted({e.get("kind", "") for e in edges})
+    kind_pos = {k: i for i, k in enumerate(edge_kinds)}
+    out_pairs = []
+    in_pairs = []
+    for e in edges:
+        s, d, k = position[e["src"]], position[e["dst"]], kind_pos[e.get("kind", "")]
+        out_pairs.append((s, d, k))
+        in_pairs.append((d, s, k))
+
+    return {
+        "version": INDEX_VERSION,
+        "root": graph.get("root", "."),
+        "ids": ids,
+        "kinds": kinds,
+        "paths": paths,
+        "names": names,
+        "labels": labels,
+        "by_kind": _postings(by_kind),
+        "name_keys": [k for k, _ in named],
+        "name_nodes": array("I", (i for _, i in named)),
+        "trigrams": _postings(trigrams),
+        "trigram_counts": trigram_counts,
+        "sorted_paths": [paths[i] for i in path_order],
+        "path_order": array("I", path_order),
+        "endpoints": endpoints,
+        "endpoint_node": endpoint_node,
+        "edge_kinds": edge_kinds,
+        "out": _adjacency(out_pairs, len(endpoints)),
+        "in": _adjacency(in_pairs, len(endpoints)),
+    }
+
+
+def write_index(index: dict, graph_path: Path, index_path: Path | None = None) -> Path:
+    index_path = index_path or index_path_for(graph_path)
+    index = dict(index, stamp=_stamp(graph_path))
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = index_path.with_name(index_path.name + ".tmp")
+    with tmp.open("wb") as f:
+        pickle.dump(index, f, protocol=pickle.HIGHEST_PROTOCOL)
+    tmp.replace(index_path)
+    return index_path
+
+
+def load_index(graph_path: Path, index_path: Path | None = None) -> dict:
+    """Load the prebuilt index, rebuilding it when missing or stale."""
+
+    index_path = index_path or index_path_for(graph_path)
+    if index_path.exists():
+        try:
+            with index_path.open("rb") as f:
+                index = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            index = None
+        if (
+            isinstance(index, dict)
+            and index.get("version") == INDEX_VERSION
+            and index.get("stamp") == _stamp(graph_path)
+        ):
+            return index
+
+    index = build_index(load_graph(graph_path))
+    write_index(index, graph_path, index_path)
+    return index
+
+
+def node(index: dict, i: int) -> dict:
+    """Rebuild the snapshot's node dict at position ``i``."""
+
+    out = {"id": index["ids"][i], "kind": index["kinds"][i], "path": index["paths"][i]}
+    if index["names"][i] is not None:
+        out["name"] = index["names"][i]
+    return out
+
+
+def _endpoint(index: dict, node_id: str) -> int | None:
+    endpoints = index["endpoints"]
+    e = bisect.bisect_left(endpoints, node_id)
+    if e < len(endpoints) and endpoints[e] == node_id:
+        return e
+    return None
+
+
+def has_node(index: dict, node_id: str) -> bool:
+    e = _endpoint(index, node_id)
+    return e is not None and index["endpoint_node"][e] >= 0
+
+
+def _named(index: dict, name: str) -> set[int]:
+    keys = index["name_keys"]
+    lo = bisect.bisect_left(keys, name)
+    hi = bisect.bisect_right(keys, name, lo)
+    return set(index["name_nodes"][lo:hi])
+
+
+def _with_prefix(index: dict, prefix: str) -> set[int]:
+    paths = index["sorted_paths"]
+    lo = bisect.bisect_left(paths, prefix)
+    hi = bisect.bisect_left(paths, prefix + "\uffff")
+    return set(index["path_order"][lo:hi])
+
+
+def _containing(index: dict, needle: str) -> set[int]:
+    needle = needle.lower()
+    labels = index["labels"]
+    grams = _trigrams(needle)
+    if not grams:
+        # Too short for the trigram index; scan labels instead.
+        return {i for i, label in enumerate(labels) if needle in label}
+
+    postings = sorted((index["trigrams"].get(g, ()) for g in grams), key=len)
+    candidates = set(postings[0])
+    for p in postings[1:]:
+        if not candidates:
+            break
+        candidates.intersection_update(p)
+    return {i for i in candidates if needle in labels[i]}
+
+
+def fuzzy(index: dict, text: str, threshold: float = 0.3) -> list[tuple[float, int]]:
+    """Rank nodes by trigram similarity between ``text`` and their label.
+
+    The score averages query coverage with Jaccard similarity, so short queries still
+    match long labels while closer-length labels rank first.
+    """
+
+    grams = _trigrams(text.lower())
+    if not grams:
+        return []
+
+    # A label scoring >= threshold shares at least `need` query trigrams, so it must
+    # appear in one of the rarest len(grams) - need + 1 posting lists.
+    need = max(1, math.ceil(threshold * len(grams)))
+    postings = sorted((index["trigrams"].get(g, ()) for g in grams), key=len)
+    candidates: set[int] = set()
+    for p in postings[: len(grams) - need + 1]:
+        candidates.update(p)
+
+    labels = index["labels"]
+    counts = index["trigram_counts"]
+    scored = []
+    for i in candidates:
+        label = labels[i]
+        n = sum(1 for g in grams if g in label)
+        score = (n / len(grams) + n / (len(grams) + counts[i] - n)) / 2
+        if score >= threshold:
+            scored.append((score, i))
+    scored.sort(key=lambda t: (-t[0], t[1]))
+    return scored
+
+
+def query(
+    index: dict,
+    *,
+    kind: str | None = None,
+    path_prefix: str | None = None,
+    name: str | None = None,
+    heading: str | None = None,
+    contains: str | None = None,
+    fuzzy_text: str | None = None,
+    limit: int | None = 50,
+) -> list[dict]:
+    """Return nodes matching every given filter.
+
+    Results are in snapshot order, except fuzzy queries, which are ranked by score
+    and carry it in a ``score`` field.
+    """
+
+    # Selective tables narrow the candidates first; kinds are then checked per node
+    # instead of materializing the (usually huge) set of every node of a kind.
+    kinds = {kind} if kind is not None else set()
+    sets: list[set[int]] = []
+    if path_prefix is not None:
+        sets.append(_with_prefix(index, path_prefix))
+    if name is not None:
+        kinds.add("symbol")
+        sets.append(_named(index, name.lower()))
+    if heading is not None:
+        kinds.add("doc_section")
+        sets.append(_containing(index, heading))
+    if contains is not None:
+        sets.append(_containing(index, contains))
+
+    if len(kinds) > 1:
+        return []
+
+    selected: set[int] | None = None
+    for s in sorted(sets, key=len):
+        selected = s if selected is None else selected & s
+    if kinds:
+        (wanted,) = kinds
+        if selected is None:
+            selected = set(index["by_kind"].get(wanted, ()))
+        else:
+            selected = {i for i in selected if index["kinds"][i] == wanted}
+
+    if fuzzy_text is not None:
+        ranked = [
+            (score, i) for score, i in fuzzy(index, fuzzy_text) if selected is None or i in selected
+        ]
+        return [dict(node(index, i), score=round(score, 3)) for score, i in ranked[:limit]]
+
+    positions = range(len(index["ids"])) if selected is None else sorted(selected)
+    return [node(index, i) for i in positions[:limit]]
+
+
+def neighbors(
+    index: dict,
+    node_id: str,
+    *,
+    direction: str = "both",
+    edge_kind: str | None = None,
+    depth: int = 1,
+) -> list[dict]:
+    """Breadth-first neighborhood of ``node_id`` up to ``depth`` hops.
+
+    Edge endpoints that are not graph nodes (e.g. imported module names) are still
+    reported, with ``kind`` set to ``None``.
+    """
+
+    if direction not in {"out", "in", "both"}:
+        raise ValueError(f"unknown direction: {direction}")
+
+    start = _endpoint(index, node_id)
+    if start is None:
+        return []
+
+    tables = [(way, index[way]) for way in ("out", "in") if direction in {way, "both"}]
+    endpoints = index["endpoints"]
+    endpoint_node = index["endpoint_node"]
+    edge_kinds = index["edge_kinds"]
+
+    seen = {start}
+    found: list[dict] = []
+    frontier = deque([(start, 0)])
+    while frontier:
+        current, hops = frontier.popleft()
+        if hops >= depth:
+            continue
+        for way, (offsets, targets, kinds) in tables:
+            for j in range(offsets[current], offsets[current + 1]):
+                kind = edge_kinds[kinds[j]]
+                if edge_kind is not None and kind != edge_kind:
+                    continue
+                other = targets[j]
+                if other in seen:
+                    continue
+                seen.add(other)
+                pos = endpoint_node[other]
+                found.append(
+                    {
+                        "id": endpoints[other],
+                        "kind": index["kinds"][pos] if pos >= 0 else None,
+                        "edge": kind,
+                        "direction": way,
+                        "from": endpoints[current],
+                        "depth": hops + 1,
+                    }
+                )
+                frontier.append((other, hops + 1))
+    return found
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Iterable, Iterator
+
+# NDJSON snapshot layout (one JSON object per line):
+#
+#   {"graph": {"format": "ndjson", "root": "<root>", "version": 1}}
+#   {"node": {...}} / {"edge": {...}}   -- in walk order, grouped per file
+#   {"end": {"edges": <n>, "nodes": <n>}}
+#
+# Records for one file are contiguous and start with its "file" node; every edge
+# follows the nodes it was derived from. Readers can rely on that to stop early.
+
+NDJSON_VERSION = 1
+
+
+def is_ndjson(path: Path) -> bool:
+    """True for NDJSON snapshots: by suffix, or by sniffing the header line."""
+
+    if path.suffix in {".ndjson", ".jsonl"}:
+        return True
+    try:
+        with path.open(encoding="utf-8") as f:
+            return f.readline(64).startswith('{"graph":')
+    except OSError:
+        return False
+
+
+def write_ndjson(path: Path, root: str, records: Iterable[tuple[str, dict]]) -> tuple[int, int]:
+    """Stream ``(kind, payload)`` records to ``path``; return (nodes, edges) written."""
+
+    counts = {"node": 0, "edge": 0}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        header = {"format": "ndjson", "root": root, "version": NDJSON_VERSION}
+        f.write(json.dumps({"graph": header}, sort_keys=True) + "\n")
+        for kind, payload in records:
+            counts[kind] += 1
+            f.write(json.dumps({kind: payload}, sort_keys=True) + "\n")
+        f.write(json.dumps({"end": {"edges": counts["edge"], "nodes": counts["node"]}}, sort_keys=True) + "\n")
+    tmp.replace(path)
+    return counts["node"], counts["edge"]
+
+
+def iter_ndjson(path: Path) -> Iterator[tuple[str, dict]]:
+    """Yield ``(kind, payload)`` for every line: "graph", "node", "edge", then "end"."""
+
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            (kind, payload), = record.items()
+            yield kind, payload
+
+
+def load_graph(path: Path) -> dict:
+    """Load a snapshot in either format as ``{"root", "nodes", "edges"}``."""
+
+    if not is_ndjson(path):
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    graph: dict = {"root": ".", "nodes": [], "edges": []}
+    for kind, payload in iter_ndjson(path):
+        if kind == "graph":
+            graph["root"] = payload.get("root", ".")
+        elif kind == "node":
+            graph["nodes"].append(payload)
+        elif kind == "edge":
+            graph["edges"].append(payload)
+    return graph
+
+
+def find_neighborhood(path: Path, anchor: str) -> dict | None:
+    """Resolve ``anchor`` and its incident edges, reading only as far as needed.
+
+    Returns ``{"root", "node", "edges"}`` or ``None`` when the anchor is absent. For
+    NDJSON snapshots, reading stops at the end of the anchor's file group.
+    """
+
+    if not is_ndjson(path):
+        graph = json.loads(path.read_text(encoding="utf-8"))
+        node = next((n for n in graph.get("nodes", []) if n["id"] == anchor), None)
+        if node is None:
+            return None
+        edges = [e for e in graph.get("edges", []) if anchor in (e["src"], e["dst"])]
+        return {"root": graph.get("root", "."), "node": node, "edges": edges}
+
+    root = "."
+    found: dict | None = None
+    for kind, payload in iter_ndjson(path):
+        if kind == "graph":
+            root = payload.get("root", ".")
+        elif kind == "node":
+            if found is not None and payload.get("kind") == "file":
+                break
+            if payload["id"] == anchor:
+                found = {"root": root, "node": payload, "edges": []}
+        elif kind == "edge" and found is not None:
+            if anchor in (payload["src"], payload["dst"]):
+                found["edges"].append(payload)
+    return found
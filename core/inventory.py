@@ -0,0 +1,361 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+from pathlib import Path
+
+MANIFEST_VERSION = 1
+
+# Never listed, whatever the ignore files say.
+ALWAYS_SKIP = {".git"}
+
+
+def _translate(pattern: str) -> str:
+    """gitignore glob -> regex body (``**``, ``*``, ``?`` and ``[...]``)."""
+
+    out: list[str] = []
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+            continue
+        if pattern.startswith("/**", i) and i + 3 == len(pattern):
+            out.append("/.*")
+            i += 3
+            continue
+        if pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+            continue
+        if c == "*":
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            end = pattern.find("]", i + 2)
+            if end == -1:
+                out.append(re.escape(c))
+            else:
+                body = pattern[i + 1 : end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append("[" + body.replace("\\", "\\\\") + "]")
+                i = end
+        elif c == "\\" and i + 1 < len(pattern):
+            i += 1
+            out.append(re.escape(pattern[i]))
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+class IgnoreRules:
+    """The patterns of one ignore file, matched against paths relative to its directory.
+
+    Follows gitignore: ``#`` comments, ``!`` re-includes, a trailing ``/`` matches
+    directories only, a pattern with a ``/`` before its end is anchored to the
+    file's directory, otherwise it matches a name at any depth. The last matching
+    pattern wins.
+    """
+
+    def __init__(self, lines: list[str]) -> None:
+        self.rules: list[tuple[re.Pattern[str], bool, bool]] = []
+        for raw in lines:
+            line = raw.rstrip("\n")
+            if not line.endswith("\\ "):
+                line = line.rstrip()
+            if not line or line.startswith("#"):
+                continue
+            negate = line.startswith("!")
+            if negate:
+                line = line[1:]
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            if not line:
+                continue
+            anchored = "/" in line
+            body = _translate(line.lstrip("/"))
+            if not anchored:
+                body = "(?:.*/)?" + body
+            self.rules.append((re.compile(body + r"\Z"), negate, dir_only))
+        # One alternation per kind answers "does anything match?" for the common miss.
+        self._any_dir = self._union(r for r, _, _ in self.rules)
+        self._any_file = self._union(r for r, _, dir_only in self.rules if not dir_only)
+
+    @staticmethod
+    def _union(patterns) -> re.Pattern[str] | None:
+        bodies = [p.pattern for p in patterns]
+        return re.compile("|".join(f"(?:{b})" for b in bodies)) if bodies else None
+
+    @classmethod
+    def read(cls, path: Path) -> "IgnoreRules | None":
+        try:
+            rules = cls(path.read_text(encoding="utf-8", errors="replace").splitlines())
+        except OSError:
+            return None
+        return rules if rules.rules else None
+
+    def match(self, rel: str, is_dir: bool) -> bool | None:
+        """True (ignored), False (re-included by ``!``) or None (no pattern matched)."""
+
+        quick = self._any_dir if is_dir else self._any_file
+        if quick is None or quick.match(rel) is None:
+            return None
+        for regex, negate, dir_only in reversed(self.rules):
+            if dir_only and not is_dir:
+                continue
+            if regex.match(rel):
+                return not negate
+        return None
+
+
+class Entry:
+    __slots__ = ("path", "is_dir", "size", "mtime_ns")
+
+    def __init__(self, path: str, is_dir: bool, size: int, mtime_ns: int) -> None:
+        self.path = path  # posix, relative to the inventory root
+        self.is_dir = is_dir
+        self.size = size
+        self.mtime_ns = mtime_ns
+
+    @property
+    def name(self) -> str:
+        return self.path.rsplit("/", 1)[-1]
+
+    @property
+    def suffix(self) -> str:
+        name = self.name
+        dot = name.rfind(".")
+        return name[dot:] if dot > 0 else ""
+
+
+def _ancestor_rules(root: Path) -> list[tuple[str, int, IgnoreRules]]:
+    """``.gitignore`` files from the enclosing repository root down to ``root``'s parent."""
+
+    root = root.resolve()
+    chain: list[tuple[str, int, IgnoreRules]] = []
+    for parent in root.parents:
+        rules = IgnoreRules.read(parent / ".gitignore")
+        if rules is not None:
+            chain.append((root.relative_to(parent).as_posix() + "/", 0, rules))
+        if (parent / ".git").exists():
+            break
+    else:
+        return []
+    chain.reverse()
+    return chain
+
+
+def _ignored(chain: list[tuple[str, int, IgnoreRules]], rel: str, is_dir: bool) -> bool:
+    # Deeper ignore files override shallower ones.
+    for prefix, strip, rules in reversed(chain):
+        verdict = rules.match(prefix + rel[strip:], is_dir)
+        if verdict is not None:
+            return verdict
+    return False
+
+
+class Inventory:
+    """Every file and directory under ``root`` from one ``os.scandir`` pass.
+
+    Tools filter this instead of calling ``rglob`` again. Entries are sorted by
+    path, so filtered views come out in a stable order.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        entries: list[Entry],
+        dir_mtimes: dict[str, int] | None = None,
+        fresh: bool = True,
+    ) -> None:
+        self.root = root
+        self.entries = entries
+        self.dir_mtimes = dir_mtimes or {}
+        self.fresh = fresh  # False when loaded from a manifest: sizes/mtimes may predate edits
+
+    def files(self, suffixes: set[str] | tuple[str, ...] | None = None, under: str | Path | None = None) -> list[Entry]:
+        prefix = self._prefix(under)
+        return [
+            e
+            for e in self.entries
+            if not e.is_dir and e.path.startswith(prefix) and (suffixes is None or e.suffix in suffixes)
+        ]
+
+    def dirs(self, under: str | Path | None = None) -> list[Entry]:
+        prefix = self._prefix(under)
+        return [e for e in self.entries if e.is_dir and e.path.startswith(prefix)]
+
+    def paths(self, suffixes: set[str] | tuple[str, ...] | None = None, under: str | Path | None = None) -> list[Path]:
+        """Files as ``root / path`` (what ``sorted(root.rglob("*<suffix>"))`` used to return)."""
+
+        return [self.root / e.path for e in self.files(suffixes, under)]
+
+    def children(self) -> dict[str, int]:
+        """Direct child count per directory ("" is the root)."""
+
+        counts: dict[str, int] = {e.path: 0 for e in self.entries if e.is_dir}
+        counts[""] = 0
+        for e in self.entries:
+            parent = e.path.rsplit("/", 1)[0] if "/" in e.path else ""
+            counts[parent] = counts.get(parent, 0) + 1
+        return counts
+
+    def subtree(self, root: Path) -> "Inventory | None":
+        """The part of this inventory under ``root`` (None if ``root`` is outside it)."""
+
+        try:
+            rel = root.resolve().relative_to(self.root.resolve()).as_posix()
+        except ValueError:
+            return None
+        if rel == ".":
+            return Inventory(root, self.entries, self.dir_mtimes, self.fresh)
+        prefix = rel + "/"
+        n = len(prefix)
+        return Inventory(
+            root,
+            [Entry(e.path[n:], e.is_dir, e.size, e.mtime_ns) for e in self.entries if e.path.startswith(prefix)],
+            {k[n:]: v for k, v in self.dir_mtimes.items() if k.startswith(prefix)},
+            self.fresh,
+        )
+
+    @staticmethod
+    def _prefix(under: str | Path | None) -> str:
+        """``under`` is relative to the inventory root."""
+
+        if under is None:
+            return ""
+        text = Path(under).as_posix()
+        return "" if text in ("", ".") else text.rstrip("/") + "/"
+
+    def save(self, path: Path) -> None:
+        """Persist as a JSON manifest (written to a tmp file, then renamed)."""
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Creating the manifest's directory changed its parents' mtimes; record the new ones.
+        root = self.root.resolve()
+        for parent in path.resolve().parents[1:]:
+            try:
+                rel = parent.relative_to(root).as_posix()
+            except ValueError:
+                break
+            key = "" if rel == "." else rel
+            if key in self.dir_mtimes:
+                self.dir_mtimes[key] = os.stat(parent).st_mtime_ns
+        tmp = path.with_name(path.name + ".tmp")
+        data = {
+            "version": MANIFEST_VERSION,
+            "root": str(root),
+            "dirs": self.dir_mtimes,
+            "entries": [[e.path, int(e.is_dir), e.size, e.mtime_ns] for e in self.entries],
+        }
+        tmp.write_text(json.dumps(data, separators=(",", ":")) + "\n", encoding="utf-8")
+        tmp.replace(path)
+
+
+def build(root: Path, gitignore: bool = True, extra_ignores: list[str] | None = None) -> Inventory:
+    """Walk ``root`` once with ``os.scandir``, honouring ``.gitignore`` files on the way.
+
+    Ignore files above ``root`` (up to the repository root) apply too, as in git.
+    ``extra_ignores`` are gitignore-style patterns relative to ``root``. Ignored
+    directories are not descended into.
+    """
+
+    chain: list[tuple[str, int, IgnoreRules]] = _ancestor_rules(root) if gitignore else []
+    if extra_ignores:
+        chain.insert(0, ("", 0, IgnoreRules(extra_ignores)))
+
+    entries: list[Entry] = []
+    dir_mtimes: dict[str, int] = {}
+    try:
+        dir_mtimes[""] = os.stat(root).st_mtime_ns
+    except OSError:
+        return Inventory(root, [], {})
+
+    stack: list[tuple[str, str, list]] = [(str(root), "", chain)]
+    while stack:
+        current, rel_dir, rules = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                listing = list(it)
+        except OSError:
+            continue
+        if gitignore and any(e.name == ".gitignore" for e in listing):
+            local = IgnoreRules.read(Path(current) / ".gitignore")
+            if local is not None:
+                rules = rules + [("", len(rel_dir), local)]
+        for entry in listing:
+            name = entry.name
+            rel = rel_dir + name
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
+            if is_dir and name in ALWAYS_SKIP:
+                continue
+            if rules and _ignored(rules, rel, is_dir):
+                continue
+            try:
+                st = entry.stat(follow_symlinks=False) if is_dir else entry.stat()
+            except OSError:
+                continue
+            entries.append(Entry(rel, is_dir, 0 if is_dir else st.st_size, st.st_mtime_ns))
+            if is_dir:
+                dir_mtimes[rel] = st.st_mtime_ns
+                stack.append((entry.path, rel + "/", rules))
+
+    # Same order as sorted(Path.rglob(...)): component-wise, so "a/b" < "a.py".
+    entries.sort(key=lambda e: e.path.split("/"))
+    return Inventory(root, entries, dir_mtimes)
+
+
+def load(manifest: Path) -> Inventory | None:
+    """The manifest's inventory if no directory under its root changed since it was built.
+
+    A listing only changes when some directory's mtime does, so one ``stat`` per
+    directory validates it. File sizes and mtimes are as of the manifest build.
+    """
+
+    try:
+        data = json.loads(manifest.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+    if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+        return None
+    root = Path(data["root"])
+    # Writing the manifest itself bumps its directory's mtime; that one is not a listing change.
+    try:
+        own = manifest.resolve().parent.relative_to(root).as_posix()
+    except ValueError:
+        own = None
+    for rel, mtime_ns in data["dirs"].items():
+        if rel == own:
+            continue
+        try:
+            if os.stat(root / rel).st_mtime_ns != mtime_ns:
+                return None
+        except OSError:
+            return None
+    entries = [Entry(p, bool(d), size, mtime) for p, d, size, mtime in data["entries"]]
+    return Inventory(root, entries, data["dirs"], fresh=False)
+
+
+def inventory(root: Path, manifest: Path | None = None) -> Inventory:
+    """Inventory for ``root``: from ``manifest`` (default ``$AOI_INVENTORY``) when valid, else a fresh walk.
+
+    A manifest built for an ancestor of ``root`` is reused, narrowed to ``root``.
+    """
+
+    if manifest is None and os.environ.get("AOI_INVENTORY"):
+        manifest = Path(os.environ["AOI_INVENTORY"])
+    if manifest is not None:
+        loaded = load(manifest)
+        if loaded is not None:
+            narrowed = loaded.subtree(root)
+            if narrowed is not None:
+                return narrowed
+    return build(root)
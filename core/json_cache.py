@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+
+class JsonCache:
+    """A versioned ``{key: value}`` map persisted as one JSON file.
+
+    Subclasses set ``VERSION`` (a file written under another version is ignored)
+    and ``FIELD``, the name the map is stored under. ``path=None`` keeps the cache
+    in memory only. ``hits``/``misses`` are for callers to count lookups.
+
+    With ``MAX_ENTRIES`` set, the map is kept in least-recently-used order (see
+    ``touch``) and ``save`` evicts the oldest entries beyond the bound, so a cache
+    shared by many runs stays bounded without one run dropping another's entries.
+    """
+
+    VERSION = 1
+    FIELD = "entries"
+    MAX_ENTRIES: int | None = None
+
+    def __init__(self, path: Path | None) -> None:
+        self.path = path
+        self.entries: dict = {}
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        if path is not None and path.exists():
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, json.JSONDecodeError):
+                data = None
+            if isinstance(data, dict) and data.get("version") == self.VERSION:
+                self.entries = data.get(self.FIELD, {})
+
+    def put(self, key: str, value) -> None:
+        self.entries.pop(key, None)
+        self.entries[key] = value
+        self._dirty = True
+
+    def touch(self, key: str) -> None:
+        """Mark an existing ``key`` as the most recently used (bounded caches only)."""
+
+        if self.MAX_ENTRIES is None or next(reversed(self.entries)) == key:
+            return
+        self.entries[key] = self.entries.pop(key)
+        self._dirty = True
+
+    def prune(self, live: set[str]) -> None:
+        """Drop entries whose key is not in ``live``."""
+
+        if set(self.entries) - live:
+            self.entries = {k: v for k, v in self.entries.items() if k in live}
+            self._dirty = True
+
+    def save(self, live: set[str] | None = None) -> None:
+        """Persist (atomically) if anything changed; with ``live``, prune first."""
+
+        if live is not None:
+            self.prune(live)
+        if self.MAX_ENTRIES is not None and len(self.entries) > self.MAX_ENTRIES:
+            self.entries = dict(list(self.entries.items())[-self.MAX_ENTRIES :])
+            self._dirty = True
+        if self.path is None or not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(
+            json.dumps(
+                {"version": self.VERSION, self.FIELD: self.entries},
+                sort_keys=self.MAX_ENTRIES is None,  # bounded caches keep their LRU order
+                separators=(",", ":"),
+            ),
+            encoding="utf-8",
+        )
+        tmp.replace(self.path)
+        self._dirty = False
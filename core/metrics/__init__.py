@@ -0,0 +1 @@
+"""Repo metrics: a plugin registry computed in one walk, with per-file caching."""
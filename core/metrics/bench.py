@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Pipeline stages timed by `aoi bench`, each on a fixed in-repo corpus and writing
+# only under {tmp}. ok: exit codes that count as a normal run (the demo Map is
+# deliberately out of date, so validate exits 1).
+STAGES: dict[str, dict] = {
+    "sync": {
+        "cmd": ["factory/tools/sync_public_interfaces.py", "--src", "product/src", "--doc", "product/docs/architecture.md"],
+    },
+    "validate": {
+        "cmd": ["factory/tools/validate_map_alignment.py", "--src", "product/src", "--doc", "product/docs/architecture.md"],
+        "ok": (0, 1),
+    },
+    "graph": {
+        "cmd": ["factory/tools/build_context_graph.py", "--root", "examples/tax_service", "--out", "{tmp}/graph.json"],
+    },
+    "slice": {
+        "cmd": [
+            "factory/tools/slice_context_graph.py",
+            "--graph",
+            "{tmp}/graph.json",
+            "--anchor",
+            "examples/tax_service/tests/test_tax_service.py:test_calculate_income_tax_high_earner_scenario",
+            "--out",
+            "{tmp}/slice.md",
+        ],
+        "needs": "graph",
+    },
+    "drift": {
+        "cmd": [
+            "factory/tools/measure_drift.py",
+            "--src",
+            "product/src",
+            "--doc",
+            "product/docs/architecture.md",
+            "--runs",
+            "5",
+            "--mock",
+        ],
+    },
+    "dream-scan": {
+        "cmd": ["factory/tools/dream_scan.py", "--root", "examples/tax_service", "--no-cache"],
+    },
+    "metrics": {
+        "cmd": [
+            "factory/tools/collect_metrics.py",
+            "--root",
+            ".",
+            "--out-dir",
+            "{tmp}/metrics",
+            "--no-cache",
+            "--no-history",
+        ],
+    },
+}
+
+
+class StageFailed(RuntimeError):
+    pass
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Nearest-rank ``q`` quantile of an ascending list; 0.0 when it is empty."""
+
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, max(0, round(q * (len(sorted_values) - 1))))
+    return sorted_values[k]
+
+
+def _run_stage(name: str, tmp: str) -> float:
+    spec = STAGES[name]
+    cmd = [sys.executable] + [a.replace("{tmp}", tmp) for a in spec["cmd"]]
+    t0 = time.perf_counter()
+    p = subprocess.run(cmd, capture_output=True, text=True)
+    elapsed_ms = (time.perf_counter() - t0) * 1000.0
+    if p.returncode not in spec.get("ok", (0,)):
+        tail = (p.stdout + p.stderr).strip()[-500:]
+        raise StageFailed(f"stage {name} exited {p.returncode}: {tail}")
+    return elapsed_ms
+
+
+def run_bench(stages: list[str], runs: int = 5, warmup: int = 1) -> dict[str, dict]:
+    """Time each stage ``runs`` times (after ``warmup`` untimed runs); wall ms per run."""
+
+    unknown = [s for s in stages if s not in STAGES]
+    if unknown:
+        raise ValueError(f"unknown stage(s): {', '.join(unknown)} (known: {', '.join(STAGES)})")
+
+    results: dict[str, dict] = {}
+    with tempfile.TemporaryDirectory(prefix="aoi_bench_") as tmp:
+        for name in stages:
+            needs = STAGES[name].get("needs")
+            if needs and needs not in results:
+                _run_stage(needs, tmp)
+            for _ in range(warmup):
+                _run_stage(name, tmp)
+            samples = [round(_run_stage(name, tmp), 3) for _ in range(runs)]
+            ordered = sorted(samples)
+            results[name] = {
+                "runs": runs,
+                "median_ms": round(statistics.median(ordered), 3),
+                "p95_ms": round(percentile(ordered, 0.95), 3),
+                "min_ms": ordered[0],
+                "samples_ms": samples,
+            }
+    return results
+
+
+def metric_name(stage: str, stat: str) -> str:
+    return f"bench_{stage.replace('-', '_')}_{stat}"
+
+
+def write_bench(out_dir: Path, results: dict[str, dict]) -> list[str]:
+    """Write ``bench.json`` and per-stage ``bench_<stage>_{median,p95}_ms.json``.
+
+    Per-metric files carry the raw samples too, so ratchets can compare the
+    best sample instead of a single noisy number.
+    """
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    (out_dir / "bench.json").write_text(json.dumps(results, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    written: list[str] = []
+    for stage, r in results.items():
+        for stat in ("median_ms", "p95_ms"):
+            name = metric_name(stage, stat)
+            (out_dir / f"{name}.json").write_text(
+                json.dumps({"value": r[stat], "samples": r["samples_ms"]}, indent=2, sort_keys=True) + "\n",
+                encoding="utf-8",
+            )
+            written.append(name)
+    return written
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from pathlib import Path
+
+from core.inventory import inventory
+from core.json_cache import JsonCache
+from core.metrics.registry import METRICS, Metric
+
+SNAPSHOT_VERSION = 1
+
+# Directories that never hold project Python; everything else under the root is walked.
+SKIP_DIRS = {".git", "__pycache__", ".metrics", ".sdac", ".mypy_cache", ".pytest_cache", ".ruff_cache"}
+
+
+class FactCache(JsonCache):
+    """Per-file metric values keyed by content hash (and metric version), persisted as JSON."""
+
+    VERSION = SNAPSHOT_VERSION
+    FIELD = "facts"
+
+    @property
+    def facts(self) -> dict[str, dict[str, float]]:
+        return self.entries
+
+
+def iter_python_files(root: Path):
+    """Yield (path, rel_posix) for every ``*.py`` under ``root``, from the shared inventory."""
+
+    for e in inventory(root).files({".py"}):
+        if SKIP_DIRS.isdisjoint(e.path.split("/")[:-1]):
+            yield root / e.path, e.path
+
+
+def file_facts(data: bytes, path: str, metrics: list[Metric]) -> dict[str, float]:
+    """One decode and one in-memory compile(); every metric measures the same source."""
+
+    try:
+        # Bytes so PEP 263 coding cookies are honoured, as py_compile would; no .pyc is written.
+        code = compile(data, path, "exec", dont_inherit=True)
+    except (SyntaxError, ValueError):
+        code = None
+    text = data.decode("utf-8", errors="replace")
+    return {m.key: m.measure(text, code) for m in metrics}
+
+
+def collect(root: Path, cache: FactCache, metrics: list[Metric] | None = None) -> dict:
+    """Compute every registered metric over ``root`` and return the snapshot dict."""
+
+    metrics = list(METRICS.values()) if metrics is None else metrics
+    t0 = time.perf_counter()
+    totals: dict[str, float] = {m.name: 0 for m in metrics}
+    live: set[str] = set()
+    files = 0
+
+    for path, rel in iter_python_files(root):
+        data = path.read_bytes()
+        key = hashlib.sha256(data).hexdigest()
+        live.add(key)
+        files += 1
+        facts = cache.facts.get(key)
+        missing = metrics if facts is None else [m for m in metrics if m.key not in facts]
+        if missing:
+            cache.misses += 1
+            facts = dict(facts or {}, **file_facts(data, rel, missing))
+            cache.put(key, facts)
+        else:
+            cache.hits += 1
+        for m in metrics:
+            if m.applies(rel):
+                value = facts[m.key]
+                totals[m.name] = totals[m.name] + value if m.aggregate == "sum" else max(totals[m.name], value)
+
+    cache.save(live)
+    return {
+        "version": SNAPSHOT_VERSION,
+        "metrics": totals,
+        "files": files,
+        "cache": {"hits": cache.hits, "misses": cache.misses},
+        "elapsed_s": round(time.perf_counter() - t0, 4),
+    }
+
+
+def write_snapshot(out_dir: Path, snapshot: dict) -> None:
+    """Write ``snapshot.json`` plus one ``<metric>.json`` per metric (what ratchets read)."""
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    (out_dir / "snapshot.json").write_text(json.dumps(snapshot, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    for name, value in snapshot["metrics"].items():
+        (out_dir / f"{name}.json").write_text(
+            json.dumps({"value": value}, indent=2, sort_keys=True) + "\n",
+            encoding="utf-8",
+        )
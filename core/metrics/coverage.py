@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import inspect
+import os
+import sys
+import threading
+from pathlib import Path
+from types import CodeType, FrameType
+
+from core.inventory import inventory
+
+# Line coverage without a per-line cost after the first hit.
+#
+# sys.monitoring (3.12+): every LINE callback returns DISABLE, so CPython stops
+# reporting that location and covered code runs at full speed.
+# sys.settrace fallback: a code object is traced only while some of its lines are
+# still unseen; once all have fired, new frames of it are not traced at all and a
+# running frame turns its own tracing off.
+
+
+def _code_objects(code: CodeType):
+    yield code
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            yield from _code_objects(const)
+
+
+def _lines(code: CodeType) -> set[int]:
+    return {line for _, _, line in code.co_lines() if line}
+
+
+def executable_lines(path: Path) -> set[int]:
+    """Lines that carry bytecode (0 = module prologue is excluded)."""
+
+    try:
+        code = compile(path.read_bytes(), str(path), "exec", dont_inherit=True)
+    except (SyntaxError, ValueError):
+        return set()
+    lines: set[int] = set()
+    for c in _code_objects(code):
+        lines |= _lines(c)
+    return lines
+
+
+def _expected(code: CodeType) -> set[int]:
+    lines = _lines(code)
+    if code.co_flags & inspect.CO_OPTIMIZED:
+        # A function's RESUME sits on its def line, which only fires in the enclosing frame.
+        lines.discard(code.co_firstlineno)
+    return lines
+
+
+class LineCoverage:
+    """Record executed lines of files under ``roots`` (all threads)."""
+
+    def __init__(self, roots: list[Path]) -> None:
+        self.roots = [str(r.resolve()) + os.sep for r in roots]
+        self.hits: dict[str, set[int]] = {}
+        self.backend = "sys.monitoring" if hasattr(sys, "monitoring") else "settrace"
+        self._wanted: dict[str, bool] = {}
+        self._local: dict[CodeType, object] = {}
+        self._done: set[CodeType] = set()
+        self._tool: int | None = None
+        self._previous: tuple = (None, None)
+
+    def _is_wanted(self, filename: str) -> bool:
+        wanted = self._wanted.get(filename)
+        if wanted is None:
+            absolute = os.path.abspath(filename)
+            wanted = self._wanted[filename] = any(absolute.startswith(r) for r in self.roots)
+        return wanted
+
+    # sys.monitoring backend
+
+    def _on_line(self, code: CodeType, line: int):
+        if self._is_wanted(code.co_filename):
+            hits = self.hits.get(code.co_filename)
+            if hits is None:
+                hits = self.hits[code.co_filename] = set()
+            hits.add(line)
+        return sys.monitoring.DISABLE
+
+    # settrace backend
+
+    def _trace_call(self, frame: FrameType, event: str, arg: object):
+        code = frame.f_code
+        local = self._local.get(code)
+        if local is None:
+            if code in self._done or not self._is_wanted(code.co_filename):
+                return None
+            local = self._local[code] = self._make_local(code)
+        return local
+
+    def _make_local(self, code: CodeType):
+        # One closure per code object: the per-line path touches only locals.
+        pending = _expected(code)
+        hits = self.hits.setdefault(code.co_filename, set())
+        local_map, done = self._local, self._done
+
+        def local(frame: FrameType, event: str, arg: object):
+            if event == "line":
+                line = frame.f_lineno
+                if line in pending:
+                    pending.discard(line)
+                    hits.add(line)
+                    if not pending:
+                        done.add(code)
+                        local_map.pop(code, None)
+                        return None
+            return local
+
+        if not pending:
+            done.add(code)
+        return local
+
+    def start(self) -> None:
+        if self.backend == "sys.monitoring":
+            mon = sys.monitoring
+            # COVERAGE_ID may be taken (e.g. a collector measuring this one); 3 and 4 are unassigned.
+            for tool in (mon.COVERAGE_ID, 3, 4):
+                try:
+                    mon.use_tool_id(tool, "aoi-coverage")
+                except ValueError:
+                    continue
+                self._tool = tool
+                break
+            else:
+                raise RuntimeError("no free sys.monitoring tool id")
+            mon.register_callback(self._tool, mon.events.LINE, self._on_line)
+            mon.set_events(self._tool, mon.events.LINE)
+        else:
+            self._previous = (sys.gettrace(), threading.gettrace())
+            threading.settrace(self._trace_call)
+            sys.settrace(self._trace_call)
+
+    def stop(self) -> None:
+        if self.backend == "sys.monitoring":
+            mon = sys.monitoring
+            mon.set_events(self._tool, 0)
+            mon.register_callback(self._tool, mon.events.LINE, None)
+            mon.free_tool_id(self._tool)
+        else:
+            # Restore an outer tracer (a debugger, or coverage measuring these tests).
+            previous, previous_threads = self._previous
+            sys.settrace(previous)
+            threading.settrace(previous_threads)  # type: ignore[arg-type]
+
+    def report(self, base: Path = Path(".")) -> dict:
+        """Per-file and total line coverage over every ``*.py`` under the roots (imported or not)."""
+
+        base_abs = base.resolve()
+        hits_by_path = {os.path.abspath(f): lines for f, lines in self.hits.items()}
+        files: dict[str, dict] = {}
+        total = covered = 0
+        for root in self.roots:
+            for path in inventory(Path(root)).paths({".py"}):
+                lines = executable_lines(path)
+                hit = lines & hits_by_path.get(str(path), set())
+                total += len(lines)
+                covered += len(hit)
+                try:
+                    rel = path.relative_to(base_abs).as_posix()
+                except ValueError:
+                    rel = str(path)
+                files[rel] = {
+                    "lines": len(lines),
+                    "covered": len(hit),
+                    "missing": sorted(lines - hit),
+                }
+        return {
+            "backend": self.backend,
+            "lines": total,
+            "covered": covered,
+            "line_coverage": round(100.0 * covered / total, 2) if total else 100.0,
+            "files": files,
+        }
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import sqlite3
+import subprocess
+import time
+from pathlib import Path
+
+DEFAULT_PATH = Path(".metrics/history.sqlite")
+
+# Append-only: one row per collection run, one row per (metric, run). The samples
+# table is clustered by (metric, snapshot) so a trend query reads one metric's
+# rows in order without touching the others.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    commit_sha TEXT NOT NULL,
+    ts REAL NOT NULL,
+    source TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS samples (
+    metric TEXT NOT NULL,
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots(id),
+    value REAL NOT NULL,
+    PRIMARY KEY (metric, snapshot_id)
+) WITHOUT ROWID;
+"""
+
+
+def head_commit(cwd: Path = Path(".")) -> str:
+    try:
+        p = subprocess.run(["git", "rev-parse", "HEAD"], cwd=cwd, capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.TimeoutExpired):
+        return "unknown"
+    return p.stdout.strip() if p.returncode == 0 and p.stdout.strip() else "unknown"
+
+
+def tree_dirty(cwd: Path = Path(".")) -> bool:
+    """True when tracked files differ from ``HEAD``; False outside git."""
+
+    try:
+        p = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            cwd=cwd,
+            capture_output=True,
+            text=True,
+            timeout=60,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return False
+    return p.returncode == 0 and bool(p.stdout.strip())
+
+
+def commit_order(rev: str = "HEAD", cwd: Path = Path(".")) -> list[str] | None:
+    """Commits reachable from ``rev``, oldest first in topological order; None outside git."""
+
+    try:
+        p = subprocess.run(
+            ["git", "rev-list", "--topo-order", "--reverse", rev],
+            cwd=cwd,
+            capture_output=True,
+            text=True,
+            timeout=60,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    return p.stdout.split() if p.returncode == 0 else None
+
+
+def connect(path: Path = DEFAULT_PATH) -> sqlite3.Connection:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def record(
+    path: Path,
+    values: dict[str, float],
+    source: str,
+    commit: str | None = None,
+    ts: float | None = None,
+    cwd: Path = Path("."),
+) -> int | None:
+    """Append one snapshot of ``values``; returns its id.
+
+    Without ``commit`` the snapshot is keyed by ``HEAD``, so nothing is recorded
+    (None) while tracked files have uncommitted changes: work in progress would
+    otherwise replace ``HEAD``'s value in ``series``.
+    """
+
+    if commit is None:
+        if tree_dirty(cwd):
+            return None
+        commit = head_commit(cwd)
+    conn = connect(path)
+    try:
+        with conn:
+            cur = conn.execute(
+                "INSERT INTO snapshots (commit_sha, ts, source) VALUES (?, ?, ?)",
+                (commit, time.time() if ts is None else ts, source),
+            )
+            snapshot_id = int(cur.lastrowid)
+            conn.executemany(
+                "INSERT INTO samples (metric, snapshot_id, value) VALUES (?, ?, ?)",
+                [(name, snapshot_id, float(v)) for name, v in values.items()],
+            )
+        return snapshot_id
+    finally:
+        conn.close()
+
+
+def series(path: Path, metric: str, last: int | None = None, order: list[str] | None = None) -> list[dict]:
+    """Value per commit, oldest first; a commit measured several times keeps its latest value.
+
+    Without ``order`` points are in recording order, which differs from commit
+    order when older commits are measured later (bisecting, backfilling). With
+    ``order`` (e.g. from ``commit_order``) points follow their position in it and
+    commits not in it are dropped. ``last`` limits the result to the most recent
+    ``last`` commits.
+    """
+
+    conn = connect(path)
+    try:
+        rows = conn.execute(
+            """
+            SELECT s.commit_sha, s.ts, x.value, s.id
+            FROM samples x JOIN snapshots s ON s.id = x.snapshot_id
+            WHERE x.metric = ? AND x.snapshot_id IN (
+                SELECT MAX(x2.snapshot_id)
+                FROM samples x2 JOIN snapshots s2 ON s2.id = x2.snapshot_id
+                WHERE x2.metric = ?
+                GROUP BY s2.commit_sha
+            )
+            ORDER BY s.id DESC
+            LIMIT ?
+            """,
+            (metric, metric, -1 if last is None or order is not None else last),
+        ).fetchall()
+    finally:
+        conn.close()
+    points = [{"commit": c, "ts": ts, "value": v} for c, ts, v, _ in reversed(rows)]
+    if order is not None:
+        position = {sha: i for i, sha in enumerate(order)}
+        points = sorted((p for p in points if p["commit"] in position), key=lambda p: position[p["commit"]])
+        if last is not None:
+            points = points[-last:] if last > 0 else []
+    return points
+
+
+def metric_names(path: Path) -> list[str]:
+    conn = connect(path)
+    try:
+        return [r[0] for r in conn.execute("SELECT DISTINCT metric FROM samples ORDER BY metric")]
+    finally:
+        conn.close()
+
+
+def slope(points: list[dict]) -> float:
+    """Least-squares slope of value per commit (points are equally spaced)."""
+
+    n = len(points)
+    if n < 2:
+        return 0.0
+    mean_x = (n - 1) / 2.0
+    mean_y = sum(p["value"] for p in points) / n
+    num = sum((i - mean_x) * (p["value"] - mean_y) for i, p in enumerate(points))
+    den = sum((i - mean_x) ** 2 for i in range(n))
+    return num / den
+
+
+def first_regression(
+    points: list[dict],
+    direction: str,
+    tolerance: float = 0.0,
+    relative_tolerance: float = 0.0,
+) -> dict | None:
+    """First point worse than the best value seen before it, beyond the ratchet allowance."""
+
+    best: float | None = None
+    for p in points:
+        v = p["value"]
+        if best is not None:
+            allowed = max(tolerance, relative_tolerance * abs(best))
+            worse = v > best + allowed if direction == "down" else v < best - allowed
+            if worse:
+                return dict(p, best=best, allowed=allowed)
+        if best is None or (v < best if direction == "down" else v > best):
+            best = v
+    return None
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import json
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+_LINE_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+def parse_importtime(stderr: str) -> dict[str, tuple[int, int]]:
+    """``-X importtime`` output -> {module: (self_us, cumulative_us)}.
+
+    A module imported once appears once; the header line and other stderr are ignored.
+    """
+
+    out: dict[str, tuple[int, int]] = {}
+    for line in stderr.splitlines():
+        m = _LINE_RE.match(line)
+        if m:
+            out[m.group(4)] = (int(m.group(1)), int(m.group(2)))
+    return out
+
+
+def import_once(module: str, path: str = ".", python: str = sys.executable) -> tuple[float, dict[str, tuple[int, int]]]:
+    """Import ``module`` in a fresh isolated interpreter; (process wall ms, per-module times).
+
+    ``-I`` keeps user site-packages and PYTHON* variables out; ``path`` is put on
+    sys.path explicitly so only the configured tree is importable.
+    """
+
+    code = f"import sys; sys.path.insert(0, {path!r}); import {module}"
+    t0 = time.perf_counter()
+    p = subprocess.run([python, "-I", "-X", "importtime", "-c", code], capture_output=True, text=True)
+    wall_ms = (time.perf_counter() - t0) * 1000.0
+    if p.returncode != 0:
+        raise RuntimeError(f"import {module} failed: {p.stderr.strip().splitlines()[-1] if p.stderr.strip() else p.returncode}")
+    return wall_ms, parse_importtime(p.stderr)
+
+
+def measure_entry(module: str, path: str = ".", runs: int = 5, warmup: int = 1) -> dict:
+    """Median per-module self/cumulative ms over ``runs`` fresh interpreters.
+
+    ``value`` is the entry module's cumulative import time; ``self_ms`` attributes it
+    to individual modules so a regression can name the module responsible.
+    """
+
+    for _ in range(warmup):  # writes .pyc files, so timed runs match a warm deployment
+        import_once(module, path)
+    walls: list[float] = []
+    samples: list[float] = []
+    per_module: dict[str, list[tuple[int, int]]] = {}
+    for _ in range(runs):
+        wall_ms, times = import_once(module, path)
+        walls.append(wall_ms)
+        samples.append(round(times.get(module, (0, 0))[1] / 1000.0, 3))
+        for name, t in times.items():
+            per_module.setdefault(name, []).append(t)
+
+    def med(values: list[int]) -> float:
+        # A module missing from some runs (imported conditionally) counts as 0 there.
+        return round(statistics.median(values + [0] * (runs - len(values))) / 1000.0, 3)
+
+    return {
+        "module": module,
+        "value": round(statistics.median(samples), 3),
+        "samples": samples,
+        "startup_ms": round(statistics.median(walls), 3),
+        "startup_samples": [round(w, 3) for w in walls],
+        "self_ms": {name: med([s for s, _ in ts]) for name, ts in sorted(per_module.items())},
+        "cumulative_ms": {name: med([c for _, c in ts]) for name, ts in sorted(per_module.items())},
+    }
+
+
+def metric_name(entry: str) -> str:
+    return f"importtime_{entry}_ms"
+
+
+def write_entry(out_dir: Path, entry: str, result: dict) -> Path:
+    out_dir.mkdir(parents=True, exist_ok=True)
+    path = out_dir / f"{metric_name(entry)}.json"
+    path.write_text(json.dumps(result, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    return path
+
+
+def top_self_increase(baseline: dict, current: dict) -> dict | None:
+    """Module whose self time grew the most between two measurements (new modules count fully)."""
+
+    before = baseline.get("self_ms") or {}
+    after = current.get("self_ms") or {}
+    if not after:
+        return None
+    name = max(after, key=lambda m: after[m] - before.get(m, 0.0))
+    delta = after[name] - before.get(name, 0.0)
+    if delta <= 0:
+        return None
+    return {
+        "module": name,
+        "baseline_self_ms": before.get(name, 0.0),
+        "current_self_ms": after[name],
+        "delta_ms": round(delta, 3),
+    }
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from types import CodeType
+from typing import Callable
+
+# measure(text, code) -> number for one file. ``code`` is the compiled module, or
+# None when the file does not compile. Values depend only on file content, so the
+# collector caches them by content hash; ``scope`` (a path prefix relative to the
+# root) decides which files count towards the metric.
+Measure = Callable[[str, "CodeType | None"], float]
+
+
+class Metric:
+    def __init__(self, name: str, measure: Measure, scope: str = "", aggregate: str = "sum", version: int = 1) -> None:
+        if aggregate not in ("sum", "max"):
+            raise ValueError(f"unknown aggregate: {aggregate!r}")
+        self.name = name
+        self.measure = measure
+        self.scope = scope
+        self.aggregate = aggregate
+        self.version = version
+
+    @property
+    def key(self) -> str:
+        """Cache key: bump ``version`` when ``measure`` changes."""
+
+        return f"{self.name}@{self.version}"
+
+    def applies(self, rel_path: str) -> bool:
+        return rel_path.startswith(self.scope)
+
+
+METRICS: dict[str, Metric] = {}
+
+
+def metric(name: str, scope: str = "", aggregate: str = "sum", version: int = 1) -> Callable[[Measure], Measure]:
+    """Register ``measure`` as a metric plugin (registration order = report order)."""
+
+    def wrap(measure: Measure) -> Measure:
+        if name in METRICS:
+            raise ValueError(f"metric already registered: {name}")
+        METRICS[name] = Metric(name, measure, scope=scope, aggregate=aggregate, version=version)
+        return measure
+
+    return wrap
+
+
+@metric("test_count", scope="tests/")
+def _test_count(text: str, code: CodeType | None) -> int:
+    # Line-based on purpose: counts test functions even in files that do not compile.
+    return sum(1 for line in text.splitlines() if line.lstrip().startswith("def test_"))
+
+
+@metric("python_syntax_errors")
+def _syntax_errors(text: str, code: CodeType | None) -> int:
+    return 1 if code is None else 0
+
+
+@metric("python_files")
+def _python_files(text: str, code: CodeType | None) -> int:
+    return 1
+
+
+@metric("python_loc")
+def _python_loc(text: str, code: CodeType | None) -> int:
+    return sum(1 for line in text.splitlines() if line.strip() and not line.lstrip().startswith("#"))
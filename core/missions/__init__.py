@@ -0,0 +1 @@
+"""Mission Objects: loading and discovery shared by the mission tools."""
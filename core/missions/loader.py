@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import json
+import re
+from pathlib import Path
+
+from core.inventory import inventory
+
+MISSION_SUFFIXES = {".json", ".yaml", ".yml"}
+
+
+def _parse_scalar(text: str) -> object:
+    t = text.strip()
+    if t.startswith('"') and t.endswith('"') and len(t) >= 2:
+        return t[1:-1]
+    if t.startswith("'") and t.endswith("'") and len(t) >= 2:
+        return t[1:-1]
+    if t.lower() in {"true", "false"}:
+        return t.lower() == "true"
+    if re.fullmatch(r"-?\d+", t):
+        return int(t)
+    if re.fullmatch(r"-?\d+\.\d+", t):
+        return float(t)
+    return t
+
+
+def _yaml_minimal_load(text: str) -> object:
+    lines = []
+    for raw in text.splitlines():
+        if not raw.strip():
+            continue
+        if raw.lstrip().startswith("#"):
+            continue
+        lines.append(raw.rstrip("\n"))
+
+    def parse_block(i: int, indent: int) -> tuple[object, int]:
+        # Find the first line at this indent to decide list vs dict.
+        j = i
+        while j < len(lines):
+            if len(lines[j]) - len(lines[j].lstrip(" ")) < indent:
+                return {}, j
+            if lines[j].strip():
+                break
+            j += 1
+        if j >= len(lines):
+            return {}, j
+
+        is_list = lines[j].startswith(" " * indent + "- ")
+        if is_list:
+            out: list[object] = []
+            while j < len(lines):
+                cur_indent = len(lines[j]) - len(lines[j].lstrip(" "))
+                if cur_indent < indent:
+                    break
+                if not lines[j].startswith(" " * indent + "- "):
+                    break
+                item_text = lines[j][indent + 2 :].strip()
+                j += 1
+                if item_text == "":
+                    item, j = parse_block(j, indent + 2)
+                    out.append(item)
+                    continue
+                if ":" in item_text and not item_text.startswith(("'", '"')):
+                    k, v = item_text.split(":", 1)
+                    k = k.strip()
+                    v = v.strip()
+                    if v == "":
+                        nested, j = parse_block(j, indent + 4)
+                        out.append({k: nested})
+                    else:
+                        out.append({k: _parse_scalar(v)})
+                    continue
+                out.append(_parse_scalar(item_text))
+            return out, j
+
+        out_dict: dict[str, object] = {}
+        while j < len(lines):
+            cur_indent = len(lines[j]) - len(lines[j].lstrip(" "))
+            if cur_indent < indent:
+                break
+            if cur_indent != indent:
+                raise ValueError(f"unexpected indentation: {lines[j]!r}")
+
+            line = lines[j].strip()
+            if ":" not in line:
+                raise ValueError(f"expected key: value, got: {line!r}")
+            key, rest = line.split(":", 1)
+            key = key.strip()
+            rest = rest.strip()
+            j += 1
+
+            if rest == "":
+                val, j = parse_block(j, indent + 2)
+                out_dict[key] = val
+            else:
+                out_dict[key] = _parse_scalar(rest)
+        return out_dict, j
+
+    obj, _ = parse_block(0, 0)
+    return obj
+
+
+def parse_mission(text: str, suffix: str) -> dict[str, object]:
+    """Parse mission text by file suffix (``.json``, ``.yaml``, ``.yml``)."""
+
+    if suffix in {".json"}:
+        return json.loads(text)
+
+    if suffix in {".yaml", ".yml"}:
+        try:
+            import yaml  # type: ignore
+        except Exception:  # pragma: no cover
+            yaml = None
+
+        if yaml is not None:
+            # libyaml's C loader when PyYAML was built with it: several times faster.
+            loaded = yaml.load(text, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+        else:
+            loaded = _yaml_minimal_load(text)
+
+        if not isinstance(loaded, dict):
+            raise ValueError("mission YAML must be a mapping at root")
+        return loaded
+
+    raise ValueError(f"unsupported mission format: {suffix}")
+
+
+def load_mission(path: Path) -> dict[str, object]:
+    if path.suffix not in MISSION_SUFFIXES:
+        raise ValueError(f"unsupported mission format: {path}")
+    return parse_mission(path.read_text(encoding="utf-8"), path.suffix)
+
+
+def discover_missions(root: Path) -> list[Path]:
+    """Mission files under ``root`` (recursive), skipping the ``schema/`` directory."""
+
+    if not root.exists():
+        return []
+    return [
+        root / e.path
+        for e in inventory(root).files(MISSION_SUFFIXES)
+        if "schema" not in e.path.split("/")[:-1]
+    ]
@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+import difflib
+import subprocess
+from fnmatch import fnmatchcase
+from pathlib import Path
+
+from core.inventory import build
+
+_WILDCARDS = "*?["
+
+
+def _prefix(pattern: str) -> str:
+    """Literal part of a glob pattern up to the first wildcard ("src/**" -> "src/")."""
+
+    pattern = _norm(pattern)
+    cut = min((i for i, c in enumerate(pattern) if c in _WILDCARDS), default=len(pattern))
+    return pattern[:cut]
+
+
+def _norm(pattern: str) -> str:
+    return pattern[2:] if pattern.startswith("./") else pattern
+
+
+def write_set(mission: dict) -> list[str]:
+    """Glob patterns a mission may write: ``scope.write_allowlist`` or its target."""
+
+    scope = mission.get("scope") or {}
+    patterns = list(scope.get("write_allowlist") or [])
+    if not patterns:
+        for key in ("target_file", "file"):
+            if isinstance(scope.get(key), str):
+                patterns.append(scope[key])
+        if isinstance(scope.get("target_dir"), str):
+            patterns.append(scope["target_dir"].rstrip("/") + "/**")
+    return patterns
+
+
+def read_set(mission: dict) -> list[str]:
+    """Patterns a mission (its Effector or Validators) reads besides its write set."""
+
+    scope = mission.get("scope") or {}
+    slice_spec = mission.get("slice") or {}
+    patterns = list(scope.get("read_allowlist") or [])
+    patterns += [r.rstrip("/") + "/**" for r in slice_spec.get("terrain_roots") or []]
+    patterns += list(slice_spec.get("map_files") or [])
+    return patterns
+
+
+def patterns_overlap(a: list[str], b: list[str]) -> bool:
+    # Conservative: two patterns may touch the same file if one literal prefix
+    # extends the other. False positives only serialize work; they never race.
+    prefixes_b = [_prefix(p) for p in b]
+    for pa in a:
+        x = _prefix(pa)
+        for y in prefixes_b:
+            if x.startswith(y) or y.startswith(x):
+                return True
+    return False
+
+
+def conflicts(a: dict, b: dict) -> bool:
+    """Missions conflict when one writes where the other writes or reads."""
+
+    wa, wb = write_set(a), write_set(b)
+    return (
+        patterns_overlap(wa, wb)
+        or patterns_overlap(wa, read_set(b))
+        or patterns_overlap(wb, read_set(a))
+    )
+
+
+def components(missions: list[dict]) -> list[list[int]]:
+    """Partition mission indexes into conflict-connected groups (input order kept)."""
+
+    parent = list(range(len(missions)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i in range(len(missions)):
+        for j in range(i + 1, len(missions)):
+            if find(i) != find(j) and conflicts(missions[i], missions[j]):
+                parent[find(j)] = find(i)
+
+    groups: dict[int, list[int]] = {}
+    for i in range(len(missions)):
+        groups.setdefault(find(i), []).append(i)
+    return list(groups.values())
+
+
+def _matches(path: str, patterns: list[str]) -> bool:
+    for pattern in patterns:
+        p = _norm(pattern)
+        if fnmatchcase(path, p) or (p.endswith("/**") and path.startswith(p[:-2])):
+            return True
+        if "/**/" in p and fnmatchcase(path, p.replace("/**/", "/")):  # "**" may match no directories
+            return True
+    return False
+
+
+def expand(patterns: list[str], root: Path = Path(".")) -> list[Path]:
+    """Existing files matched by ``patterns`` (relative to ``root``).
+
+    Files come from one gitignore-aware inventory of ``root`` and match the way
+    ``protected_paths`` do, so the write set and the rest of the tree partition
+    the same inventory.
+    """
+
+    found: set[Path] = set()
+    tree = None
+    for pattern in patterns:
+        p = _norm(pattern)
+        if not any(c in p for c in _WILDCARDS):
+            candidate = root / p
+            if candidate.is_file():
+                found.add(candidate)
+                continue
+            if not candidate.is_dir():
+                continue
+            p = p.rstrip("/") + "/**"
+        if tree is None:
+            tree = build(root)
+        found.update(root / e.path for e in tree.files(under=_prefix(p).rpartition("/")[0]) if _matches(e.path, [p]))
+    return sorted(found)
+
+
+def _stat(p: Path) -> tuple[int, int] | None:
+    try:
+        st = p.stat()
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+def _git_paths(root: Path, *args: str) -> set[str]:
+    """NUL-separated paths printed by ``git <args> -z`` in ``root``; empty outside a repository."""
+
+    try:
+        proc = subprocess.run(["git", *args, "-z"], cwd=root, capture_output=True, timeout=60)
+    except (OSError, subprocess.TimeoutExpired):
+        return set()
+    if proc.returncode != 0:
+        return set()
+    return {s for s in proc.stdout.decode("utf-8", "surrogateescape").split("\0") if s}
+
+
+class Snapshot:
+    """A write set's contents plus the stats of the rest of the tree, for change accounting and rollback.
+
+    Budgets count changes inside the write set, whose files are kept in memory so
+    they can be diffed and restored. With ``guard_tree``, every other file in the
+    (gitignore-aware) inventory of ``root`` is recorded by ``(size, mtime_ns)``
+    only, so memory does not grow with the size of the repository. Contents are
+    kept for files matching ``protected`` alone; any other edited file is restored
+    from the git index if it matched the index when the snapshot was taken. Paths
+    matching ``others`` (the write sets of missions running alongside) are left to
+    their own snapshots.
+    """
+
+    def __init__(
+        self,
+        patterns: list[str],
+        root: Path = Path("."),
+        guard_tree: bool = False,
+        others: list[str] | None = None,
+        protected: list[str] | None = None,
+    ) -> None:
+        self.patterns = patterns
+        self.root = root
+        self.others = others or []
+        self.files = {p: p.read_bytes() for p in expand(patterns, root)}
+        self.stats = {p: _stat(p) for p in self.files}
+        self.outside: dict[str, tuple[int, int]] | None = None
+        self.kept: dict[str, bytes] = {}
+        self.clean: set[str] = set()
+        if guard_tree:
+            self.outside = self._outside()
+            for rel in self.outside:
+                if protected and _matches(rel, protected):
+                    try:
+                        self.kept[rel] = (root / rel).read_bytes()
+                    except OSError:
+                        continue
+            self.clean = _git_paths(root, "ls-files") - _git_paths(root, "diff-files", "--name-only", "--relative")
+
+    def _outside(self) -> dict[str, tuple[int, int]]:
+        return {
+            e.path: (e.size, e.mtime_ns)
+            for e in build(self.root).files()
+            if not (_matches(e.path, self.patterns) or _matches(e.path, self.others))
+        }
+
+    def changes(self) -> tuple[list[str], int]:
+        """(changed paths under ``root``, changed lines) since the snapshot; lines = added + removed.
+
+        Files whose size and mtime are unchanged are not read.
+        """
+
+        current = expand(self.patterns, self.root)
+        changed: list[str] = []
+        lines = 0
+        for p in sorted(set(current) | set(self.files)):
+            if p in self.files and _stat(p) == self.stats[p]:
+                continue
+            before = self.files.get(p)
+            after = p.read_bytes() if p.exists() else None
+            if before == after:
+                continue
+            changed.append(self._rel(p))
+            a = (before or b"").decode("utf-8", "replace").splitlines()
+            b = (after or b"").decode("utf-8", "replace").splitlines()
+            for op, i1, i2, j1, j2 in difflib.SequenceMatcher(None, a, b, autojunk=False).get_opcodes():
+                if op != "equal":
+                    lines += (i2 - i1) + (j2 - j1)
+        return changed, lines
+
+    def outside_changes(self) -> list[str]:
+        """Files created, modified or deleted outside the write set (needs ``guard_tree``)."""
+
+        if self.outside is None:
+            return []
+        current = self._outside()
+        return sorted(rel for rel in set(current) | set(self.outside) if current.get(rel) != self.outside.get(rel))
+
+    def _rel(self, p: Path) -> str:
+        return p.relative_to(self.root).as_posix() if p.is_relative_to(self.root) else str(p)
+
+    def _original(self, rel: str) -> bytes | None:
+        if rel in self.kept:
+            return self.kept[rel]
+        if rel not in self.clean:
+            return None
+        try:
+            proc = subprocess.run(
+                ["git", "cat-file", "blob", f":./{rel}"], cwd=self.root, capture_output=True, timeout=60
+            )
+        except (OSError, subprocess.TimeoutExpired):
+            return None
+        return proc.stdout if proc.returncode == 0 else None
+
+    def restore(self) -> list[str]:
+        """Roll the write set back, and outside edits and deletions where possible.
+
+        Files created outside the write set are never deleted: a validator or
+        another in-flight mission may own them. Returns the outside paths left
+        as they are.
+        """
+
+        for p in expand(self.patterns, self.root):
+            if p not in self.files:
+                p.unlink()
+        for p, data in self.files.items():
+            if _stat(p) == self.stats[p] or (p.exists() and p.read_bytes() == data):
+                continue
+            p.parent.mkdir(parents=True, exist_ok=True)
+            p.write_bytes(data)
+        left: list[str] = []
+        for rel in self.outside_changes():
+            data = self._original(rel) if rel in (self.outside or {}) else None
+            if data is None:
+                left.append(rel)
+                continue
+            p = self.root / rel
+            p.parent.mkdir(parents=True, exist_ok=True)
+            p.write_bytes(data)
+        return left
+
+
+def protected_violations(changed: list[str], mission: dict) -> list[str]:
+    protected = list((mission.get("scope") or {}).get("protected_paths") or [])
+    return [p for p in changed if _matches(p, protected)]
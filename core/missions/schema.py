@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable
+
+from core.missions.loader import parse_mission
+
+# A checker appends "<path>: <message>" strings to ``errors`` for ``value``.
+Checker = Callable[[object, str, list], None]
+
+CACHE_VERSION = 1
+
+# Keywords that only annotate; everything else must be understood or compile fails,
+# so a schema never silently stops enforcing a rule this subset does not implement.
+_ANNOTATIONS = {"$schema", "$id", "$comment", "title", "description", "default", "examples"}
+_SUPPORTED = {"type", "required", "properties", "additionalProperties", "items", "enum"}
+
+_TYPES: dict[str, tuple[type, ...]] = {
+    "object": (dict,),
+    "array": (list,),
+    "string": (str,),
+    "integer": (int,),
+    "number": (int, float),
+    "boolean": (bool,),
+    "null": (type(None),),
+}
+
+
+def compile_schema(schema: dict) -> Checker:
+    """Compile the JSON Schema subset used by ``mission.schema.json`` into closures.
+
+    Supported: ``type`` (name or list), ``required``, ``properties``,
+    ``additionalProperties`` (bool or schema), ``items`` and ``enum``.
+    """
+
+    unknown = set(schema) - _SUPPORTED - _ANNOTATIONS
+    if unknown:
+        raise ValueError(f"unsupported schema keyword(s): {', '.join(sorted(unknown))}")
+
+    checks: list[Checker] = []
+
+    if "type" in schema:
+        names = schema["type"] if isinstance(schema["type"], list) else [schema["type"]]
+        try:
+            accepted = tuple(t for n in names for t in _TYPES[n])
+        except KeyError as e:
+            raise ValueError(f"unsupported schema type: {e.args[0]!r}") from None
+        # bool is an int subclass, but JSON true/false is neither integer nor number.
+        reject_bool = bool not in accepted
+        expected = " or ".join(names)
+
+        def check_type(value: object, where: str, errors: list) -> None:
+            if not isinstance(value, accepted) or (reject_bool and isinstance(value, bool)):
+                errors.append(f"{where}: expected {expected}, got {type(value).__name__}")
+
+        checks.append(check_type)
+
+    if "enum" in schema:
+        allowed = list(schema["enum"])
+
+        def check_enum(value: object, where: str, errors: list) -> None:
+            if value not in allowed:
+                errors.append(f"{where}: {value!r} not one of {allowed!r}")
+
+        checks.append(check_enum)
+
+    required = list(schema.get("required") or [])
+    props = {k: compile_schema(v) for k, v in (schema.get("properties") or {}).items()}
+    extra = schema.get("additionalProperties", True)
+    extra_check = compile_schema(extra) if isinstance(extra, dict) else None
+    if required or props or extra is not True:
+
+        def check_object(value: object, where: str, errors: list) -> None:
+            if not isinstance(value, dict):
+                return
+            for key in required:
+                if key not in value:
+                    errors.append(f"{where}: missing required {key!r}")
+            for key, item in value.items():
+                sub = props.get(key)
+                if sub is not None:
+                    sub(item, f"{where}.{key}", errors)
+                elif extra is False:
+                    errors.append(f"{where}: unexpected property {key!r}")
+                elif extra_check is not None:
+                    extra_check(item, f"{where}.{key}", errors)
+
+        checks.append(check_object)
+
+    if "items" in schema:
+        item_check = compile_schema(schema["items"])
+
+        def check_items(value: object, where: str, errors: list) -> None:
+            if isinstance(value, list):
+                for i, item in enumerate(value):
+                    item_check(item, f"{where}[{i}]", errors)
+
+        checks.append(check_items)
+
+    if len(checks) == 1:
+        return checks[0]
+
+    def check_all(value: object, where: str, errors: list) -> None:
+        for check in checks:
+            check(value, where, errors)
+
+    return check_all
+
+
+def validate(checker: Checker, instance: object) -> list[str]:
+    errors: list[str] = []
+    checker(instance, "$", errors)
+    return errors
+
+
+def _parse_and_check(checker: Checker, data: bytes, suffix: str) -> dict:
+    try:
+        mission = parse_mission(data.decode("utf-8"), suffix)
+    except Exception as e:
+        return {"mission": None, "errors": [f"parse error: {e}"]}
+    return {"mission": mission, "errors": validate(checker, mission)}
+
+
+_worker_checker: Checker | None = None
+
+
+def _init_worker(schema: dict) -> None:
+    global _worker_checker
+    _worker_checker = compile_schema(schema)
+
+
+def _check_chunk(items: list[tuple[bytes, str]]) -> list[dict]:
+    assert _worker_checker is not None
+    return [_parse_and_check(_worker_checker, data, suffix) for data, suffix in items]
+
+
+class MissionCache:
+    """Parsed missions and their schema errors keyed by content hash, persisted as JSON.
+
+    Entries are dropped wholesale when the schema (or the cache format) changes.
+    """
+
+    def __init__(self, path: Path | None, schema_hash: str) -> None:
+        self.path = path
+        self.schema_hash = schema_hash
+        self.entries: dict[str, dict] = {}
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        if path is not None and path.exists():
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, json.JSONDecodeError):
+                data = {}
+            if data.get("version") == CACHE_VERSION and data.get("schema") == schema_hash:
+                self.entries = data.get("entries", {})
+
+    def put(self, key: str, entry: dict) -> None:
+        self.entries[key] = entry
+        self._dirty = True
+
+    def save(self) -> None:
+        if self.path is None or not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        payload = {"version": CACHE_VERSION, "schema": self.schema_hash, "entries": self.entries}
+        tmp.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
+        tmp.replace(self.path)
+        self._dirty = False
+
+
+def load_schema(path: Path) -> tuple[dict, str]:
+    data = path.read_bytes()
+    return json.loads(data), hashlib.sha256(data).hexdigest()
+
+
+def validate_files(
+    paths: list[Path],
+    schema: dict,
+    cache: MissionCache,
+    workers: int | None = None,
+    min_batch: int = 256,
+) -> list[dict]:
+    """Parse and schema-check mission files; results are ``{"mission", "errors"}`` in input order.
+
+    Each file is read once and looked up by content hash; only cache misses are
+    parsed, in a process pool when there are at least ``min_batch`` of them.
+    """
+
+    results: list[dict | None] = [None] * len(paths)
+    pending: list[tuple[int, str, bytes, str]] = []
+    for i, p in enumerate(paths):
+        try:
+            data = p.read_bytes()
+        except OSError as e:
+            results[i] = {"mission": None, "errors": [f"read error: {e}"]}
+            continue
+        key = f"{hashlib.sha256(data).hexdigest()}{p.suffix}"
+        hit = cache.entries.get(key)
+        if hit is not None:
+            cache.hits += 1
+            results[i] = hit
+        else:
+            cache.misses += 1
+            pending.append((i, key, data, p.suffix))
+
+    if pending:
+        workers = workers if workers is not None else (os.cpu_count() or 1)
+        items = [(data, suffix) for _, _, data, suffix in pending]
+        if workers > 1 and len(pending) >= min_batch:
+            size = max(1, -(-len(items) // (workers * 4)))
+            chunks = [items[i : i + size] for i in range(0, len(items), size)]
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(schema,)) as pool:
+                checked = [r for rs in pool.map(_check_chunk, chunks) for r in rs]
+        else:
+            checker = compile_schema(schema)
+            checked = [_parse_and_check(checker, data, suffix) for data, suffix in items]
+        for (i, key, _, _), entry in zip(pending, checked):
+            results[i] = entry
+            cache.put(key, entry)
+
+    return results  # type: ignore[return-value]
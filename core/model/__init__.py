@@ -0,0 +1 @@
+"""Model calls: response caching, gateway client and an offline stub server."""
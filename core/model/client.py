@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from core.model.gateway import ModelGateway
+from core.model.response_cache import ResponseCache, request_key
+
+
+def complete(url: str, model: str, request: str, timeout: float = 60.0) -> str:
+    """POST one rendered request to a ``/v1/complete`` endpoint; return the response text.
+
+    Uses :class:`ModelGateway`'s transport with one connection and no retries, so
+    there is a single HTTP client for model calls. Failures raise ``GatewayError``.
+    """
+
+    with ModelGateway(url, model, max_concurrency=1, retries=0, timeout=timeout) as gateway:
+        return gateway.complete(request)
+
+
+def cached_complete(
+    cache: ResponseCache | None, url: str, model: str, request: str, timeout: float = 60.0
+) -> tuple[str, bool]:
+    """Like :func:`complete`, but consult ``cache`` first. Returns (response, cache_hit)."""
+
+    if cache is None:
+        return complete(url, model, request, timeout), False
+    key = request_key(request, model)
+    hit = cache.get(key)
+    if hit is not None:
+        return hit, True
+    response = complete(url, model, request, timeout)
+    cache.put(key, response, meta={"model": model})
+    return response, False
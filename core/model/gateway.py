@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+import http.client
+import json
+import queue
+import random
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from core.prep.tokens import count_tokens
+
+# Status codes worth retrying: throttling and transient server-side failures.
+_RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class GatewayError(RuntimeError):
+    pass
+
+
+class BudgetExceeded(GatewayError):
+    pass
+
+
+def estimate_tokens(text: str) -> int:
+    # The offline estimate slice budgets use too, so a mission's token budget means
+    # the same thing at prep and call time. Rendered requests are mostly prose.
+    return count_tokens(text, "markdown")
+
+
+class MissionBudget:
+    """Per-mission accounting of model calls and (estimated) tokens.
+
+    Limits come from a Mission Object's ``budgets`` block: ``max_tokens`` and the
+    optional ``max_model_calls``. Missing limits are not enforced, but usage is
+    still counted.
+    """
+
+    def __init__(self, max_tokens: int | None = None, max_calls: int | None = None) -> None:
+        self.max_tokens = max_tokens
+        self.max_calls = max_calls
+        self.calls = 0
+        self.tokens = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_mission(cls, mission: dict) -> "MissionBudget":
+        budgets = mission.get("budgets") or {}
+        return cls(max_tokens=budgets.get("max_tokens"), max_calls=budgets.get("max_model_calls"))
+
+    def reserve(self, calls: int, tokens: int) -> None:
+        """Charge the request side up front; refuse if it would cross a limit."""
+
+        with self._lock:
+            if self.max_calls is not None and self.calls + calls > self.max_calls:
+                raise BudgetExceeded(f"max_model_calls={self.max_calls} exhausted (used {self.calls})")
+            if self.max_tokens is not None and self.tokens + tokens > self.max_tokens:
+                raise BudgetExceeded(f"max_tokens={self.max_tokens} exhausted (used {self.tokens})")
+            self.calls += calls
+            self.tokens += tokens
+
+    def release(self, calls: int, tokens: int) -> None:
+        """Refund a reservation whose call never produced a usable response."""
+
+        with self._lock:
+            self.calls -= calls
+            self.tokens -= tokens
+
+    def charge(self, tokens: int) -> None:
+        with self._lock:
+            self.tokens += tokens
+
+    def summary(self) -> dict:
+        return {
+            "calls": self.calls,
+            "tokens": self.tokens,
+            "max_model_calls": self.max_calls,
+            "max_tokens": self.max_tokens,
+        }
+
+
+class _NoDelayHTTPConnection(http.client.HTTPConnection):
+    # http.client writes headers and body separately; without TCP_NODELAY the second
+    # write stalls on Nagle + delayed ACK (~40ms per call on keep-alive connections).
+    def connect(self) -> None:
+        super().connect()
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+
+class _NoDelayHTTPSConnection(http.client.HTTPSConnection):
+    def connect(self) -> None:
+        super().connect()
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+
+class ModelGateway:
+    """Client for ``/v1/complete`` and ``/v1/batch`` endpoints (see core/model/stub_server.py).
+
+    - Persistent HTTP/1.1 connections, kept in a pool of at most ``max_concurrency``;
+      that pool size is also the bound on in-flight requests.
+    - ``complete_many`` packs requests into ``/v1/batch`` calls of ``batch_size``.
+    - Connection errors and retryable statuses are retried up to ``retries`` times
+      with full-jitter exponential backoff.
+    - Every call is charged to a per-mission :class:`MissionBudget`.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        model: str = "stub",
+        max_concurrency: int = 4,
+        batch_size: int = 8,
+        retries: int = 3,
+        backoff_s: float = 0.1,
+        timeout: float = 60.0,
+    ) -> None:
+        parts = urlsplit(url)
+        if parts.scheme not in {"http", "https"} or not parts.hostname:
+            raise ValueError(f"unsupported gateway url: {url}")
+        self._https = parts.scheme == "https"
+        self._host = parts.hostname
+        self._port = parts.port
+        self._base = parts.path.rsplit("/", 1)[0] if parts.path.endswith("/complete") else parts.path.rstrip("/")
+        self.model = model
+        self.max_concurrency = max(1, max_concurrency)
+        self.batch_size = max(1, batch_size)
+        self.retries = retries
+        self.backoff_s = backoff_s
+        self.timeout = timeout
+
+        self._pool: queue.LifoQueue[http.client.HTTPConnection] = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+        self._budgets: dict[str, MissionBudget] = {}
+        self._lock = threading.Lock()
+        self.stats = {"http_calls": 0, "retries": 0, "connections_opened": 0}
+
+    # -- budgets ---------------------------------------------------------------
+
+    def set_budget(self, mission_id: str, budget: MissionBudget) -> None:
+        self._budgets[mission_id] = budget
+
+    def budget(self, mission_id: str) -> MissionBudget:
+        with self._lock:
+            return self._budgets.setdefault(mission_id, MissionBudget())
+
+    # -- transport -------------------------------------------------------------
+
+    def _connect(self) -> http.client.HTTPConnection:
+        with self._lock:
+            self.stats["connections_opened"] += 1
+        if self._https:
+            return _NoDelayHTTPSConnection(self._host, self._port, timeout=self.timeout)
+        return _NoDelayHTTPConnection(self._host, self._port, timeout=self.timeout)
+
+    def _post_once(self, path: str, body: bytes) -> tuple[int, bytes]:
+        with self._slots:
+            try:
+                conn = self._pool.get_nowait()
+            except queue.Empty:
+                conn = self._connect()
+            try:
+                conn.request("POST", path, body=body, headers={"Content-Type": "application/json"})
+                resp = conn.getresponse()
+                data = resp.read()
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                raise
+            if resp.will_close:
+                conn.close()
+            else:
+                self._pool.put(conn)
+            with self._lock:
+                self.stats["http_calls"] += 1
+            return resp.status, data
+
+    def _post(self, path: str, payload: dict) -> dict:
+        body = json.dumps(payload).encode("utf-8")
+        last_error = ""
+        for attempt in range(self.retries + 1):
+            if attempt:
+                with self._lock:
+                    self.stats["retries"] += 1
+                time.sleep(random.uniform(0, self.backoff_s * (2 ** (attempt - 1))))
+            try:
+                status, data = self._post_once(path, body)
+            except (OSError, http.client.HTTPException) as e:
+                last_error = f"{type(e).__name__}: {e}"
+                continue
+            if status == 200:
+                return json.loads(data)
+            last_error = f"HTTP {status}: {data[:200].decode('utf-8', 'replace')}"
+            if status not in _RETRY_STATUS:
+                break
+        raise GatewayError(f"POST {path} failed after {attempt + 1} attempt(s): {last_error}")
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def __enter__(self) -> "ModelGateway":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    # -- calls -----------------------------------------------------------------
+
+    def complete(self, request: str, mission_id: str = "default") -> str:
+        budget = self.budget(mission_id)
+        tokens = estimate_tokens(request)
+        budget.reserve(1, tokens)
+        try:
+            response = self._post(f"{self._base}/complete", {"model": self.model, "request": request})["response"]
+        except Exception:
+            budget.release(1, tokens)
+            raise
+        budget.charge(estimate_tokens(response))
+        return response
+
+    def complete_batch(self, requests: list[str], mission_id: str = "default") -> list[str]:
+        """One ``/v1/batch`` call for ``requests``; responses are returned in order."""
+
+        budget = self.budget(mission_id)
+        tokens = sum(estimate_tokens(r) for r in requests)
+        budget.reserve(len(requests), tokens)
+        try:
+            responses = self._post(f"{self._base}/batch", {"model": self.model, "requests": requests})["responses"]
+            if len(responses) != len(requests):
+                raise GatewayError(f"batch returned {len(responses)} responses for {len(requests)} requests")
+        except Exception:
+            budget.release(len(requests), tokens)
+            raise
+        budget.charge(sum(estimate_tokens(r) for r in responses))
+        return responses
+
+    def complete_many(self, requests: list[str], mission_id: str = "default") -> list[str]:
+        """Complete ``requests`` in order using batched calls run concurrently."""
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+            if self.batch_size == 1:
+                return list(pool.map(lambda r: self.complete(r, mission_id), requests))
+            chunks = [requests[i : i + self.batch_size] for i in range(0, len(requests), self.batch_size)]
+            results = list(pool.map(lambda c: self.complete_batch(c, mission_id), chunks))
+        return [r for chunk in results for r in chunk]
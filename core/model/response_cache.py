@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+
+def request_key(request: str, model: str = "") -> str:
+    """Content address for a rendered request (and the model it is sent to)."""
+
+    h = hashlib.sha256()
+    h.update(model.encode("utf-8"))
+    h.update(b"\0")
+    h.update(request.encode("utf-8"))
+    return h.hexdigest()
+
+
+class ResponseCache:
+    """On-disk response cache keyed by request hash, with TTL and a size-capped LRU.
+
+    Entries live at ``<root>/<key[:2]>/<key>.json``. Recency is the file mtime, which
+    a hit refreshes, so eviction order survives across processes. Expired entries
+    are dropped on read; when the total size exceeds ``max_bytes`` the least recently
+    used entries are removed until it fits.
+    """
+
+    def __init__(self, root: Path, ttl_s: float = 7 * 24 * 3600, max_bytes: int = 64 * 1024 * 1024) -> None:
+        self.root = root
+        self.ttl_s = ttl_s
+        self.max_bytes = max_bytes
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "puts": 0, "evictions": 0}
+        self._sizes: dict[Path, int] | None = None
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def _entries(self) -> dict[Path, int]:
+        if self._sizes is None:
+            self._sizes = {}
+            if self.root.is_dir():
+                for p in self.root.glob("*/*.json"):
+                    try:
+                        self._sizes[p] = p.stat().st_size
+                    except FileNotFoundError:
+                        pass
+        return self._sizes
+
+    def _drop(self, path: Path) -> None:
+        path.unlink(missing_ok=True)
+        self._entries().pop(path, None)
+
+    def get(self, key: str) -> str | None:
+        path = self._path(key)
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.stats["misses"] += 1
+            return None
+        # A partial or foreign entry is a miss; the next ``put`` overwrites it.
+        response = entry.get("response") if isinstance(entry, dict) else None
+        if response is None:
+            self.stats["misses"] += 1
+            return None
+
+        if time.time() - float(entry.get("created", 0)) > self.ttl_s:
+            self._drop(path)
+            self.stats["expired"] += 1
+            self.stats["misses"] += 1
+            return None
+
+        os.utime(path)
+        self.stats["hits"] += 1
+        return response
+
+    def put(self, key: str, response: str, meta: dict | None = None) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        entry = {"created": time.time(), "key": key, "response": response}
+        if meta:
+            entry["meta"] = meta
+        data = json.dumps(entry, sort_keys=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(data, encoding="utf-8")
+        tmp.replace(path)
+
+        sizes = self._entries()
+        sizes[path] = len(data.encode("utf-8"))
+        self.stats["puts"] += 1
+        self._evict()
+
+    def _evict(self) -> None:
+        sizes = self._entries()
+        total = sum(sizes.values())
+        if total <= self.max_bytes:
+            return
+
+        def mtime(p: Path) -> float:
+            try:
+                return p.stat().st_mtime
+            except FileNotFoundError:
+                return 0.0
+
+        for p in sorted(sizes, key=mtime):
+            if total <= self.max_bytes:
+                break
+            total -= sizes[p]
+            self._drop(p)
+            self.stats["evictions"] += 1
+
+    def summary(self) -> dict:
+        sizes = self._entries()
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return dict(
+            self.stats,
+            entries=len(sizes),
+            bytes=sum(sizes.values()),
+            hit_rate=round(self.stats["hits"] / lookups, 4) if lookups else 0.0,
+        )
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+
+class StubModelServer(ThreadingHTTPServer):
+    """Offline stand-in for a model endpoint (HTTP/1.1, keep-alive).
+
+    ``POST /v1/complete`` with ``{"model", "request"}`` returns ``{"model",
+    "request_sha", "response"}``; ``POST /v1/batch`` with ``{"model", "requests"}``
+    returns ``{"model", "responses"}`` in request order.
+
+    Responses come from ``canned`` (first entry whose ``match`` substring occurs in
+    the request; an empty match always applies) or else are a deterministic
+    function of the request. Each call sleeps ``latency_ms`` plus up to
+    ``jitter_ms``; ``fail_rate`` answers that fraction of calls with HTTP 503.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        fail_rate: float = 0.0,
+        canned: list[dict] | None = None,
+        seed: int | None = None,
+    ) -> None:
+        super().__init__(address, _Handler)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.fail_rate = fail_rate
+        self.canned = canned or []
+        self.calls = 0
+        self.failures = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def count_call(self) -> bool:
+        """Count a call; return False if it should be failed (per ``fail_rate``)."""
+
+        with self._lock:
+            self.calls += 1
+            if self.fail_rate and self._rng.random() < self.fail_rate:
+                self.failures += 1
+                return False
+            return True
+
+    def delay(self) -> None:
+        with self._lock:
+            jitter = self._rng.uniform(0, self.jitter_ms) if self.jitter_ms else 0.0
+        if self.latency_ms or jitter:
+            time.sleep((self.latency_ms + jitter) / 1000)
+
+    def respond(self, model: str, request: str) -> tuple[str, str]:
+        sha, response = stub_response(model, request)
+        for entry in self.canned:
+            if entry.get("match", "") in request:
+                return sha, entry["response"]
+        return sha, response
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1/complete"
+
+
+def stub_response(model: str, request: str) -> tuple[str, str]:
+    sha = hashlib.sha256(request.encode("utf-8")).hexdigest()
+    return sha, f"stub:{model or 'default'}:{sha[:12]}\n"
+
+
+def load_canned(path: Path) -> list[dict]:
+    """Canned responses: a JSON list (or JSONL) of ``{"match": str, "response": str}``."""
+
+    text = path.read_text(encoding="utf-8")
+    if text.lstrip().startswith("["):
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: StubModelServer
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002 - stdlib signature
+        pass
+
+    def _reply(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload, sort_keys=True).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self) -> None:  # noqa: N802 - stdlib naming
+        if self.path not in {"/v1/complete", "/v1/batch"}:
+            self._reply(404, {"error": f"unknown path: {self.path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", "0"))
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            requests = payload["requests"] if self.path == "/v1/batch" else [payload["request"]]
+            if not all(isinstance(r, str) for r in requests):
+                raise ValueError("requests must be strings")
+        except (ValueError, KeyError) as e:
+            self._reply(400, {"error": f"bad request: {e}"})
+            return
+
+        if not self.server.count_call():
+            self._reply(503, {"error": "injected failure"})
+            return
+        self.server.delay()
+        model = str(payload.get("model", ""))
+        answers = [self.server.respond(model, r) for r in requests]
+        if self.path == "/v1/batch":
+            self._reply(200, {"model": model, "responses": [a[1] for a in answers]})
+        else:
+            sha, response = answers[0]
+            self._reply(200, {"model": model, "request_sha": sha, "response": response})
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Offline stub model server (for tests and benchmarks).")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Added delay per call")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Extra uniform random delay per call")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Fraction of calls answered with 503")
+    parser.add_argument("--responses", type=Path, default=None, help="Canned responses (JSON list or JSONL)")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    server = StubModelServer(
+        (args.host, args.port),
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        fail_rate=args.fail_rate,
+        canned=load_canned(args.responses) if args.responses else None,
+        seed=args.seed,
+    )
+    print(f"[stub-model] listening url={server.url}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
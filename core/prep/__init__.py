@@ -0,0 +1 @@
+"""Prep: deterministic request construction (structured context + template)."""
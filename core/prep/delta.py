@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import bisect
+import re
+
+_SIGNATURE_LINE_RE = re.compile(r"`([A-Za-z_][A-Za-z0-9_]*)\(([^`]*)\)`")
+
+
+def map_signature_lines(doc_text: str, heading: str) -> tuple[int, list[tuple[int, str, str]]]:
+    """Locate ``heading`` and the signature lines in its block.
+
+    Returns (heading line number, [(line number, line text, signature)]); line
+    numbers are 1-based. Raises ValueError if the heading is missing.
+    """
+
+    lines = doc_text.splitlines()
+    start = next((i for i, line in enumerate(lines) if line.rstrip() == heading), None)
+    if start is None:
+        raise ValueError(f"Heading not found: {heading}")
+    end = next((i for i in range(start + 1, len(lines)) if lines[i].startswith("## ")), len(lines))
+
+    found: list[tuple[int, str, str]] = []
+    for i in range(start + 1, end):
+        m = _SIGNATURE_LINE_RE.search(lines[i])
+        if m is not None:
+            found.append((i + 1, lines[i], f"{m.group(1)}({m.group(2)})"))
+    return start + 1, found
+
+
+def _name(signature: str) -> str:
+    return signature.split("(", 1)[0]
+
+
+def signature_delta(terrain: list[str], doc_text: str, heading: str) -> dict:
+    """Compare Terrain signatures to the Map block under ``heading``.
+
+    A signature whose function name exists on both sides with different arguments
+    is reported as ``changed`` rather than as a removal plus an addition. Anchors are
+    the heading plus the Map lines each change touches (or, for additions, the
+    nearest existing line in sorted order), so a model can place a hunk without
+    seeing the whole block.
+    """
+
+    heading_line, map_lines = map_signature_lines(doc_text, heading)
+    map_by_sig = {sig: (lineno, text) for lineno, text, sig in map_lines}
+    terrain_set = set(terrain)
+
+    added = sorted(s for s in terrain_set if s not in map_by_sig)
+    removed = sorted(s for s in map_by_sig if s not in terrain_set)
+
+    # Names repeat when several modules define the same function: pair each
+    # removed signature with at most one added one of that name, in sorted order.
+    added_by_name: dict[str, list[str]] = {}
+    for s in reversed(added):
+        added_by_name.setdefault(_name(s), []).append(s)
+    changed = []
+    for old in list(removed):
+        candidates = added_by_name.get(_name(old))
+        if candidates:
+            new = candidates.pop()
+            changed.append({"old": old, "new": new})
+            removed.remove(old)
+            added.remove(new)
+
+    anchors: dict[int, str] = {heading_line: heading}
+    for sig in removed + [c["old"] for c in changed]:
+        lineno, text = map_by_sig[sig]
+        anchors[lineno] = text
+    ordered = sorted(map_by_sig)
+    for sig in added:
+        pos = bisect.bisect_left(ordered, sig)
+        for neighbor in ordered[max(0, pos - 1) : pos + 1]:
+            lineno, text = map_by_sig[neighbor]
+            anchors[lineno] = text
+
+    return {
+        "added": added,
+        "removed": removed,
+        "changed": changed,
+        "anchors": [{"line": n, "text": anchors[n]} for n in sorted(anchors)],
+        "map_signature_count": len(map_lines),
+    }
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from string import Formatter
+
+# A compiled template is the literal/field sequence from Formatter.parse, checked
+# once up front, so rendering is a single join with no re-parsing per request.
+CompiledTemplate = list[tuple[str, str | None, str, str | None]]
+
+
+def compile_template(text: str) -> CompiledTemplate:
+    compiled: CompiledTemplate = []
+    for literal, field, spec, conversion in Formatter().parse(text):
+        if field is not None and (not field or "." in field or "[" in field):
+            raise ValueError(f"unsupported template field: {{{field}}}")
+        compiled.append((literal, field, spec or "", conversion))
+    return compiled
+
+
+# Fields whose values differ between requests. Everything else in a template is
+# identical across a batch and can form a cacheable prompt prefix.
+DEFAULT_VOLATILE_FIELDS = frozenset(
+    {"task_id", "target_file", "signatures_block", "current_block", "delta_block", "anchor_block"}
+)
+
+
+def stable_first(text: str, volatile: frozenset[str] | set[str] = DEFAULT_VOLATILE_FIELDS) -> str:
+    """Reorder a template's paragraphs so text without volatile fields comes first.
+
+    Paragraphs (blank-line separated) keep their relative order within each group.
+    Stable paragraphs after the last volatile one (a closing instruction) stay at
+    the end, since they cannot extend the shared prefix anyway.
+    """
+
+    paragraphs = text.rstrip("\n").split("\n\n")
+    is_volatile = [
+        any(field in volatile for _, field, _, _ in Formatter().parse(p) if field is not None)
+        for p in paragraphs
+    ]
+    if not any(is_volatile):
+        return text
+    last = max(i for i, v in enumerate(is_volatile) if v)
+    head = [p for i, p in enumerate(paragraphs[:last]) if not is_volatile[i]]
+    moved = [p for i, p in enumerate(paragraphs[: last + 1]) if is_volatile[i]]
+    tail = paragraphs[last + 1 :]
+    return "\n\n".join(head + moved + tail) + "\n"
+
+
+def template_fields(compiled: CompiledTemplate) -> list[str]:
+    return [field for _, field, _, _ in compiled if field is not None]
+
+
+def render(compiled: CompiledTemplate, variables: dict[str, object]) -> str:
+    """Render like ``str.format(**variables)``; a missing variable raises KeyError."""
+
+    parts: list[str] = []
+    for literal, field, spec, conversion in compiled:
+        parts.append(literal)
+        if field is None:
+            continue
+        value = variables[field]
+        if conversion == "r":
+            value = repr(value)
+        elif conversion == "a":
+            value = ascii(value)
+        elif conversion == "s":
+            value = str(value)
+        parts.append(format(value, spec))
+    return "".join(parts)
+
+
+def doc_sync_variables(context: dict) -> dict[str, str]:
+    """Template variables for a doc-sync context object (see build_doc_sync_context.py)."""
+
+    signatures = context.get("extracted_signatures", [])
+    delta = context.get("delta", {})
+    delta_lines = [f"+ `{s}`" for s in delta.get("added", [])]
+    delta_lines += [f"- `{s}`" for s in delta.get("removed", [])]
+    delta_lines += [f"~ `{c['old']}` -> `{c['new']}`" for c in delta.get("changed", [])]
+    return {
+        "task_id": context.get("task_id", ""),
+        "target_file": context.get("target_file", ""),
+        "allowed_heading": context.get("allowed_heading", ""),
+        "signatures_block": "\n".join(f"- `{s}`" for s in signatures),
+        "current_block": context.get("current_block", "").rstrip(),
+        "delta_block": "\n".join(delta_lines) or "(no changes)",
+        "anchor_block": "\n".join(f"{a['line']}: {a['text']}" for a in context.get("anchors", [])),
+    }
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import ast
+from pathlib import Path
+
+from core.inventory import inventory
+
+
+def public_function_signatures(src_root: Path) -> list[str]:
+    """Sorted ``name(args)`` for every public top-level function under ``src_root``."""
+
+    signatures: set[str] = set()
+    for path in inventory(src_root).paths({".py"}):
+        module = ast.parse(path.read_text(encoding="utf-8"))
+        for node in module.body:
+            if isinstance(node, ast.FunctionDef) and not node.name.startswith("_"):
+                args = [a.arg for a in node.args.args]
+                signatures.add(f"{node.name}({', '.join(args)})")
+    return sorted(signatures)
+
+
+def heading_block(doc_text: str, heading: str) -> str:
+    """The ``heading`` line and everything up to the next ``## `` heading.
+
+    Raises ValueError if the heading is missing.
+    """
+
+    lines = doc_text.splitlines(keepends=True)
+    start = next((i for i, line in enumerate(lines) if line.rstrip() == heading), None)
+    if start is None:
+        raise ValueError(f"Heading not found: {heading}")
+
+    end = next(
+        (i for i in range(start + 1, len(lines)) if lines[i].startswith("## ")),
+        len(lines),
+    )
+    return "".join(lines[start:end]).rstrip() + "\n"
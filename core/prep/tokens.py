@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import hashlib
+import math
+import re
+from pathlib import Path
+
+from core.json_cache import JsonCache
+
+# Offline approximation of a byte-level BPE tokenizer (cl100k-style).
+#
+# Text is pre-split the way such tokenizers do it: words with an optional leading
+# space, digit groups of at most three, punctuation runs and whitespace runs. Each
+# piece is then charged by length with per-kind constants: code has shorter
+# sub-words (identifiers, snake_case) and denser punctuation than prose/markdown.
+# Bump TOKEN_MODEL_VERSION whenever the constants or the split change; cached
+# counts are keyed by it.
+
+TOKEN_MODEL_VERSION = 1
+
+_PIECE_RE = re.compile(
+    r"'(?:s|t|re|ve|m|ll|d)\b"  # English contractions
+    r"| ?[^\W\d_]+"  # words (letters only), optional leading space
+    r"|\d{1,3}"  # numbers split into groups of at most three digits
+    r"| ?[^\s\w]+|_+"  # punctuation / operator runs
+    r"|\s*\n|[ \t]+"  # newline runs (with trailing indentation split off) and blanks
+)
+
+# word_single: letters a word can have and still be one token;
+# word_chars: letters per token beyond that; punct_chars: punctuation per token;
+# blank_chars: spaces/tabs per token (indentation).
+CODE = {"word_single": 6, "word_chars": 4.0, "punct_chars": 2.0, "blank_chars": 8.0}
+MARKDOWN = {"word_single": 9, "word_chars": 5.0, "punct_chars": 3.0, "blank_chars": 4.0}
+
+_CODE_SUFFIXES = {
+    ".py", ".pyi", ".js", ".ts", ".tsx", ".jsx", ".go", ".rs", ".java", ".kt", ".c", ".h",
+    ".cc", ".cpp", ".hpp", ".cs", ".rb", ".php", ".sh", ".sql", ".json", ".toml", ".yaml", ".yml",
+}
+
+
+def kind_for(path: Path) -> str:
+    return "code" if path.suffix.lower() in _CODE_SUFFIXES else "markdown"
+
+
+def count_tokens(text: str, kind: str = "code") -> int:
+    model = CODE if kind == "code" else MARKDOWN
+    single, word_chars = model["word_single"], model["word_chars"]
+    punct_chars, blank_chars = model["punct_chars"], model["blank_chars"]
+
+    total = 0
+    for m in _PIECE_RE.finditer(text):
+        piece = m.group()
+        first = piece[0]
+        if first.isalpha() or (first == " " and len(piece) > 1 and piece[1].isalpha()):
+            letters = len(piece) - (first == " ")
+            total += 1 if letters <= single else 1 + math.ceil((letters - single) / word_chars)
+        elif first.isdigit():
+            total += 1
+        elif first == "\n" or piece.endswith("\n"):
+            total += 1
+        elif first in " \t" and piece.strip(" \t") == "":
+            total += math.ceil(len(piece) / blank_chars)
+        else:
+            total += math.ceil(len(piece.lstrip(" ")) / punct_chars)
+    # Stray whitespace other than space, tab and newline (\r, \f) is not charged.
+    return total
+
+
+class TokenCache(JsonCache):
+    """Per-file token counts keyed by content hash, persisted as JSON.
+
+    The file is shared by every mission, so it is bounded by entry count: the
+    least recently used hashes are evicted first.
+    """
+
+    VERSION = TOKEN_MODEL_VERSION
+    FIELD = "counts"
+    MAX_ENTRIES = 100_000
+
+    @property
+    def counts(self) -> dict[str, int]:
+        return self.entries
+
+    def count_file(self, path: Path) -> tuple[int, int]:
+        """Return (tokens, bytes) for one file, reading it once."""
+
+        data = path.read_bytes()
+        kind = kind_for(path)
+        key = f"{hashlib.sha256(data).hexdigest()}:{kind}"
+        cached = self.counts.get(key)
+        if cached is not None:
+            self.hits += 1
+            self.touch(key)
+            return cached, len(data)
+        self.misses += 1
+        n = count_tokens(data.decode("utf-8", errors="replace"), kind)
+        self.put(key, n)
+        return n, len(data)
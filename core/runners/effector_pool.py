@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import json
+import queue
+import select
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+WORKER = Path(__file__).resolve().parents[1] / "effectors" / "worker.py"
+
+
+class WorkerError(RuntimeError):
+    pass
+
+
+class WorkerTimeout(WorkerError):
+    pass
+
+
+def run_subprocess(effector: str, request: dict, timeout: float | None = None) -> dict:
+    """Per-attempt fallback: same request/result shape as the worker protocol."""
+
+    t0 = time.perf_counter()
+    doc = str(request["doc"])
+    with tempfile.TemporaryDirectory(prefix="aoi_attempt_") as tmpdir:
+        run_doc = doc
+        if request.get("doc_text") is not None:
+            run_doc = str(Path(tmpdir) / Path(doc).name)
+            Path(run_doc).write_text(request["doc_text"], encoding="utf-8")
+
+        cmd = [sys.executable, effector, "--src", str(request["src"]), "--doc", run_doc]
+        if request.get("seed") is not None:
+            cmd += ["--seed", str(request["seed"])]
+        if request.get("apply"):
+            cmd.append("--apply")
+        cmd += [str(a) for a in request.get("args", [])]
+
+        try:
+            p = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            raise WorkerTimeout(f"effector timed out after {timeout}s: {effector}") from None
+        result: dict = {"id": request.get("id"), "returncode": p.returncode}
+        stdout, stderr = p.stdout, p.stderr
+        if run_doc != doc:
+            stdout = stdout.replace(run_doc, doc)
+            stderr = stderr.replace(run_doc, doc)
+            result["new_text"] = Path(run_doc).read_text(encoding="utf-8")
+    result["stdout"] = stdout
+    result["stderr"] = stderr
+    result["elapsed_ms"] = round((time.perf_counter() - t0) * 1000, 3)
+    return result
+
+
+class EffectorWorker:
+    """One long-lived ``core/effectors/worker.py`` process hosting an Effector."""
+
+    def __init__(self, effector: str, startup_timeout: float = 30.0) -> None:
+        self.effector = effector
+        self._proc = subprocess.Popen(
+            [sys.executable, str(WORKER), "--effector", effector],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+            bufsize=1,
+        )
+        hello = self._readline(startup_timeout)
+        if not hello.get("ready"):
+            self.close()
+            raise WorkerError(f"worker failed to start for {effector}: {hello.get('error', 'no handshake')}")
+
+    def _readline(self, timeout: float | None = None, what: str = "handshake") -> dict:
+        assert self._proc.stdout is not None
+        # One line per message, so the pipe is drained between reads and select() sees new data.
+        if timeout is not None and not select.select([self._proc.stdout], [], [], timeout)[0]:
+            self._proc.kill()
+            raise WorkerTimeout(f"worker {what} timed out after {timeout}s for {self.effector}")
+        line = self._proc.stdout.readline()
+        if not line:
+            raise WorkerError(f"worker exited (rc={self._proc.poll()}) for {self.effector}")
+        return json.loads(line)
+
+    def call(self, request: dict, timeout: float | None = None) -> dict:
+        """Send one request and wait for its result; a worker that times out is killed."""
+
+        assert self._proc.stdin is not None
+        try:
+            self._proc.stdin.write(json.dumps(request) + "\n")
+            self._proc.stdin.flush()
+        except BrokenPipeError:
+            raise WorkerError(f"worker exited (rc={self._proc.poll()}) for {self.effector}") from None
+        return self._readline(timeout, what="request")
+
+    def alive(self) -> bool:
+        return self._proc.poll() is None
+
+    def close(self) -> None:
+        if self._proc.stdin:
+            try:
+                self._proc.stdin.close()
+            except BrokenPipeError:
+                pass
+        try:
+            self._proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self._proc.kill()
+            self._proc.wait()
+        if self._proc.stdout:
+            self._proc.stdout.close()
+
+
+class EffectorPool:
+    """A pool of Effector workers; requests are spread over idle workers.
+
+    A worker that dies mid-request is replaced once and the request retried. A
+    request that runs past ``timeout`` seconds kills its worker, which is replaced,
+    and raises ``WorkerTimeout`` without a retry. If a replacement cannot be
+    started the pool shrinks by one; once no workers are left, or if none could
+    be started at all, requests fall back to one subprocess each
+    (``fallback=True``) or raise.
+    """
+
+    def __init__(self, effector: str, size: int = 1, fallback: bool = True, timeout: float | None = 600.0) -> None:
+        self.effector = effector
+        self.size = max(1, size)
+        self.fallback = fallback
+        self.timeout = timeout
+        self.mode = "worker"
+        self._idle: queue.Queue[EffectorWorker | None] = queue.Queue()
+        self._all: list[EffectorWorker] = []
+        try:
+            for _ in range(self.size):
+                self._spawn()
+        except WorkerError as e:
+            self.close()
+            if not fallback:
+                raise
+            print(f"[effector-pool] {e}; falling back to one subprocess per attempt", file=sys.stderr)
+            self.mode = "subprocess"
+
+    def _spawn(self) -> None:
+        w = EffectorWorker(self.effector)
+        self._all.append(w)
+        self._idle.put(w)
+
+    def _replace(self, worker: EffectorWorker) -> EffectorWorker | None:
+        """Close a failed worker and start another; None (the pool shrinks) if that fails."""
+
+        worker.close()
+        if worker in self._all:
+            self._all.remove(worker)
+        try:
+            fresh = EffectorWorker(self.effector)
+        except WorkerError as e:
+            print(f"[effector-pool] {e}; {len(self._all)} worker(s) left", file=sys.stderr)
+            if not self._all:
+                if self.fallback:
+                    self.mode = "subprocess"
+                self._idle.put(None)  # wakes callers waiting for a worker that will never come
+            return None
+        self._all.append(fresh)
+        return fresh
+
+    def run(self, request: dict) -> dict:
+        if self.mode == "subprocess":
+            return run_subprocess(self.effector, request, self.timeout)
+        worker = self._idle.get()
+        if worker is None:
+            self._idle.put(None)
+            if self.fallback:
+                return run_subprocess(self.effector, request, self.timeout)
+            raise WorkerError(f"no workers left for {self.effector}")
+        retry = True
+        while True:
+            try:
+                result = worker.call(request, self.timeout)
+            except WorkerError as e:
+                fresh = self._replace(worker)
+                if fresh is None:
+                    raise
+                if isinstance(e, WorkerTimeout) or not retry:
+                    self._idle.put(fresh)
+                    raise
+                worker, retry = fresh, False
+                continue
+            # Only a worker that just answered goes back to the idle queue.
+            self._idle.put(worker)
+            return result
+
+    def map(self, requests: list[dict]) -> list[dict]:
+        """Run requests concurrently (one per worker); results keep request order."""
+
+        with ThreadPoolExecutor(max_workers=self.size) as pool:
+            return list(pool.map(self.run, requests))
+
+    def close(self) -> None:
+        for w in self._all:
+            w.close()
+        self._all.clear()
+
+    def __enter__(self) -> "EffectorPool":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
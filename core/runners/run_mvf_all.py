@@ -7,6 +7,8 @@ import sys
 from datetime import datetime, timezone
 from pathlib import Path
 
+from core.runners.effector_pool import EffectorPool
+
 
 def _run_id() -> str:
     return datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
@@ -57,6 +59,11 @@ def main() -> int:
         default=Path(".sdac/workflow-quarantine"),
         help="Where failed attempts are stored",
     )
+    parser.add_argument(
+        "--worker",
+        action="store_true",
+        help="Host the Effector in a JSON-lines worker (falls back to a subprocess if it cannot start)",
+    )
     args = parser.parse_args()
 
     before = args.doc.read_text(encoding="utf-8")
@@ -75,11 +82,18 @@ def main() -> int:
 
     _print_cmd(["python3", *effector_cmd[1:]])
 
-    effector = subprocess.run(
-        effector_cmd,
-        capture_output=True,
-        text=True,
-    )
+    if args.worker:
+        with EffectorPool(args.effector, size=1) as pool:
+            result = pool.run({"src": str(args.src), "doc": str(args.doc), "seed": args.seed, "apply": True})
+        effector = subprocess.CompletedProcess(
+            effector_cmd, result["returncode"], result["stdout"], result["stderr"]
+        )
+    else:
+        effector = subprocess.run(
+            effector_cmd,
+            capture_output=True,
+            text=True,
+        )
     if effector.stdout:
         print(effector.stdout, end="" if effector.stdout.endswith("\n") else "\n")
     if effector.stderr:
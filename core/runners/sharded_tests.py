@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import heapq
+import io
+import multiprocessing
+import time
+import unittest
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from core.json_cache import JsonCache
+
+TIMINGS_VERSION = 1
+DEFAULT_TIMINGS = Path(".sdac/test-timings.json")
+UNKNOWN_S = 0.1  # estimate for a test never timed, when nothing has been timed yet
+
+
+def _flatten(suite: unittest.TestSuite):
+    for item in suite:
+        if isinstance(item, unittest.TestSuite):
+            yield from _flatten(item)
+        else:
+            yield item
+
+
+def discover(start_dir: str, pattern: str = "test*.py", top_level_dir: str | None = None) -> list[unittest.TestSuite]:
+    """One suite per discovered test module (or package with ``load_tests``).
+
+    A module is the unit of sharding, so ``setUpModule``/``setUpClass`` run once
+    per module as they do serially. The suites are the loader's own objects, so
+    ``load_tests`` protocols, ``FunctionTestCase`` and doctest suites run exactly
+    as under ``python -m unittest discover``.
+    """
+
+    suite = unittest.defaultTestLoader.discover(start_dir, pattern=pattern, top_level_dir=top_level_dir)
+    return [unit for unit in suite if unit.countTestCases()]
+
+
+class TimingStore(JsonCache):
+    """test id -> seconds from the last run that executed it, as JSON."""
+
+    VERSION = TIMINGS_VERSION
+    FIELD = "tests"
+
+    @property
+    def tests(self) -> dict[str, float]:
+        return self.entries
+
+    def estimate(self, test_ids: list[str]) -> float:
+        known = self.entries
+        default = sum(known.values()) / len(known) if known else UNKNOWN_S
+        return sum(known.get(t, default) for t in test_ids)
+
+    def update(self, durations: dict[str, float], live: set[str]) -> None:
+        self.prune(live)
+        for t, s in durations.items():
+            if self.entries.get(t) != round(s, 4):
+                self.put(t, round(s, 4))
+
+
+def lpt(costs: dict[str, float], shards: int) -> list[tuple[float, list[str]]]:
+    """Longest processing time first: each unit, largest first, goes to the lightest shard.
+
+    Returns ``(estimated seconds, units)`` per non-empty shard. The makespan is at
+    most 4/3 of the optimum.
+    """
+
+    heap = [(0.0, i, []) for i in range(max(1, shards))]
+    for unit in sorted(costs, key=lambda u: (-costs[u], u)):
+        load, i, units = heapq.heappop(heap)
+        units.append(unit)
+        heapq.heappush(heap, (load + costs[unit], i, units))
+    bins = sorted(((load, units) for load, _, units in heap if units), key=lambda b: -b[0])
+    return bins
+
+
+class _TimedResult(unittest.TextTestResult):
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.durations: dict[str, float] = {}
+        self._started = 0.0
+
+    def startTest(self, test) -> None:
+        self._started = time.perf_counter()
+        super().startTest(test)
+
+    def stopTest(self, test) -> None:
+        super().stopTest(test)
+        self.durations[test.id()] = time.perf_counter() - self._started
+
+
+def _run(suite: unittest.TestSuite, verbosity: int) -> dict:
+    """Run ``suite`` in this process; everything in the result pickles."""
+
+    stream = io.StringIO()
+    result = _TimedResult(unittest.runner._WritelnDecorator(stream), True, verbosity)
+    result.buffer = True  # keep test prints with their failure instead of interleaving shards
+    t0 = time.perf_counter()
+    suite(result)
+    return {
+        "output": stream.getvalue(),
+        "run": result.testsRun,
+        "failures": [(result.getDescription(t), tb) for t, tb in result.failures],
+        "errors": [(result.getDescription(t), tb) for t, tb in result.errors],
+        "skipped": len(result.skipped),
+        "expected_failures": len(result.expectedFailures),
+        "unexpected_successes": [result.getDescription(t) for t in result.unexpectedSuccesses],
+        "durations": result.durations,
+        "wall_s": time.perf_counter() - t0,
+    }
+
+
+# Shards for forked workers: they inherit the discovered suites instead of
+# re-loading tests by name, which not every test supports.
+_SHARDS: list[unittest.TestSuite] = []
+
+
+def _run_shard(index: int, verbosity: int) -> dict:
+    return _run(_SHARDS[index], verbosity)
+
+
+def _run_shards(shards: list[unittest.TestSuite], jobs: int, verbosity: int, on_shard) -> list[dict]:
+    """Run shards in forked workers, or in this process when one job (or no fork) is available."""
+
+    results: list[dict] = []
+    forkable = "fork" in multiprocessing.get_all_start_methods()
+    if jobs <= 1 or len(shards) <= 1 or not forkable:
+        for shard in shards:
+            results.append(_run(shard, verbosity))
+            if on_shard is not None:
+                on_shard(results[-1])
+        return results
+    _SHARDS[:] = shards
+    try:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(shards)), mp_context=multiprocessing.get_context("fork")) as pool:
+            futures = [pool.submit(_run_shard, i, verbosity) for i in range(len(shards))]
+            for future in as_completed(futures):
+                results.append(future.result())
+                if on_shard is not None:
+                    on_shard(results[-1])
+    finally:
+        _SHARDS.clear()
+    return results
+
+
+def _merge(results: list[dict]) -> dict:
+    return {
+        "run": sum(r["run"] for r in results),
+        "failures": [f for r in results for f in r["failures"]],
+        "errors": [e for r in results for e in r["errors"]],
+        "skipped": sum(r["skipped"] for r in results),
+        "expected_failures": sum(r["expected_failures"] for r in results),
+        "unexpected_successes": [u for r in results for u in r["unexpected_successes"]],
+        "slowest_shard_s": round(max((r["wall_s"] for r in results), default=0.0), 4),
+        "serial_s": round(sum(r["wall_s"] for r in results), 4),
+    }
+
+
+def run_sharded(
+    start_dir: str,
+    jobs: int,
+    timings: TimingStore,
+    verbosity: int = 1,
+    pattern: str = "test*.py",
+    on_shard=None,
+) -> dict:
+    """Discover, shard by module with LPT on recorded durations, run, merge.
+
+    ``on_shard`` is called with each shard's result as it finishes. Timings
+    observed in this run are written back to ``timings`` for the next one.
+    """
+
+    units = discover(start_dir, pattern)
+    ids = [[t.id() for t in _flatten(unit)] for unit in units]
+    bins = lpt({str(i): timings.estimate(unit_ids) for i, unit_ids in enumerate(ids)}, jobs)
+    shards = [unittest.TestSuite([units[int(k)] for k in keys]) for _, keys in bins]
+
+    t0 = time.perf_counter()
+    results = _run_shards(shards, jobs, verbosity, on_shard)
+    merged = _merge(results)
+    merged.update(
+        shards=len(shards),
+        modules=len(units),
+        predicted_s=round(bins[0][0], 4) if bins else 0.0,
+        wall_s=round(time.perf_counter() - t0, 4),
+    )
+
+    live = {t for unit_ids in ids for t in unit_ids}
+    timings.update({t: s for r in results for t, s in r["durations"].items() if t in live}, live)
+    timings.save()
+    return merged
+
+
+def was_successful(merged: dict) -> bool:
+    # Same rule as unittest.TestResult.wasSuccessful.
+    return not merged["failures"] and not merged["errors"] and not merged["unexpected_successes"]
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import os
+import shlex
+import signal
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+# Validator statuses: passed, failed, timeout, error (could not start),
+# cancelled (killed by fail-fast), skipped (never started because of fail-fast).
+HARD_FAILURES = {"failed", "timeout", "error"}
+
+
+def _kill_group(proc: subprocess.Popen) -> None:
+    # Validators run in their own session, so this also reaches grandchildren
+    # (e.g. `make test` -> python -> subprocesses).
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def run_validators(
+    validators: list[dict],
+    timeout_s: float | None = None,
+    fail_fast: bool = False,
+    jobs: int | None = None,
+    on_result: Callable[[dict], None] | None = None,
+) -> list[dict]:
+    """Run validator commands concurrently; results are returned in input order.
+
+    Each validator is ``{"name", "cmd", "timeout_s"?, "required"?, "cwd"?}``; ``cmd``
+    is a shell-style string or an argv list. ``on_result`` is called with each
+    result as it finishes (one call at a time), for streaming. A validator with
+    ``"required": false`` is advisory: its failure neither fails the run nor
+    triggers fail-fast. With ``fail_fast``, the first hard failure of a required
+    validator kills the others (whole process groups) and skips those not started.
+    """
+
+    cancel = threading.Event()
+    lock = threading.Lock()
+    report_lock = threading.Lock()
+    running: dict[int, subprocess.Popen] = {}
+    killed: set[int] = set()
+    t0 = time.perf_counter()
+
+    def cancel_others(own_pid: int | None) -> None:
+        with lock:
+            cancel.set()
+            for pid, proc in running.items():
+                if pid != own_pid:
+                    killed.add(pid)
+                    _kill_group(proc)
+
+    def run_one(v: dict) -> dict:
+        name = str(v.get("name", "validator"))
+        raw = v.get("cmd", "")
+        cmd = shlex.join(map(str, raw)) if isinstance(raw, list) else str(raw)
+        timeout = v.get("timeout_s", timeout_s)
+        result: dict = {"name": name, "cmd": cmd, "required": v.get("required", True) is not False}
+        start = time.perf_counter()
+        result["started_s"] = round(start - t0, 4)
+        result["worker"] = threading.current_thread().name
+
+        with lock:
+            if cancel.is_set():
+                return finish(dict(result, status="skipped", returncode=None, duration_s=0.0, stdout="", stderr=""))
+            try:
+                proc = subprocess.Popen(
+                    [str(a) for a in raw] if isinstance(raw, list) else shlex.split(cmd),
+                    cwd=v.get("cwd"),
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    text=True,
+                    start_new_session=True,
+                )
+            except (OSError, ValueError) as e:
+                proc = None
+                error = str(e)
+            else:
+                running[proc.pid] = proc
+
+        if proc is None:
+            result.update(status="error", returncode=None, stdout="", stderr=error)
+        else:
+            try:
+                stdout, stderr = proc.communicate(timeout=timeout)
+                status = "passed" if proc.returncode == 0 else "failed"
+            except subprocess.TimeoutExpired:
+                _kill_group(proc)
+                stdout, stderr = proc.communicate()
+                status = "timeout"
+            with lock:
+                running.pop(proc.pid, None)
+                # A process that exited on its own before the kill landed keeps its result.
+                if proc.pid in killed and proc.returncode is not None and proc.returncode < 0:
+                    status = "cancelled"
+            result.update(status=status, returncode=proc.returncode, stdout=stdout, stderr=stderr)
+
+        result["duration_s"] = round(time.perf_counter() - start, 4)
+        if fail_fast and result["required"] and result["status"] in HARD_FAILURES:
+            cancel_others(proc.pid if proc is not None else None)
+        return finish(result)
+
+    def finish(result: dict) -> dict:
+        if on_result is not None:
+            with report_lock:
+                on_result(result)
+        return result
+
+    workers = jobs or max(1, len(validators))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(run_one, validators))
+
+
+def summarize(results: list[dict], wall_s: float) -> dict:
+    counts: dict[str, int] = {}
+    for r in results:
+        counts[r["status"]] = counts.get(r["status"], 0) + 1
+    return {
+        "validators": len(results),
+        "ok": not any(r["required"] and r["status"] in HARD_FAILURES | {"cancelled"} for r in results),
+        "counts": counts,
+        "wall_s": round(wall_s, 4),
+        "serial_s": round(sum(r["duration_s"] for r in results), 4),
+        "slowest": max(results, key=lambda r: r["duration_s"])["name"] if results else None,
+    }
+
+
+def critical_path(results: list[dict]) -> tuple[list[str], float]:
+    """Commands run back to back on the worker that finished last, and when it finished.
+
+    With a bounded pool the wall time is set by that worker's chain, not by the
+    single slowest command; with one worker per command the two are the same.
+    """
+
+    lanes: dict[str, list[dict]] = {}
+    for r in results:
+        if r["status"] != "skipped":
+            lanes.setdefault(r.get("worker", r["name"]), []).append(r)
+    if not lanes:
+        return [], 0.0
+    end = {lane: max(r["started_s"] + r["duration_s"] for r in rs) for lane, rs in lanes.items()}
+    last = max(end, key=end.get)
+    chain = sorted(lanes[last], key=lambda r: r["started_s"])
+    return [r["name"] for r in chain], round(end[last], 4)
@@ -0,0 +1,13 @@
+import tomllib
+import unittest
+from pathlib import Path
+
+
+class TestProject(unittest.TestCase):
+    def test_project_metadata(self) -> None:
+        data = tomllib.loads((Path(__file__).resolve().parents[1] / "pyproject.toml").read_text(encoding="utf-8"))
+        self.assertEqual(data["project"]["name"], "api")
+
+
+if __name__ == "__main__":
+    unittest.main()
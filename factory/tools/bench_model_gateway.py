@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from core.metrics.bench import percentile  # noqa: E402
+from core.model.gateway import ModelGateway  # noqa: E402
+from core.model.stub_server import StubModelServer  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the model gateway (throughput + tail latency), offline by default."
+    )
+    parser.add_argument("--endpoint", default=None, help="Existing endpoint; default: start a local stub")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--request-bytes", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--batch-size", type=int, default=1, help="Requests per call (1 = /v1/complete)")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Stub server base latency")
+    parser.add_argument("--jitter-ms", type=float, default=10.0, help="Stub server latency jitter")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Stub server injected 503 rate")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    server = None
+    endpoint = args.endpoint
+    if endpoint is None:
+        server = StubModelServer(
+            ("127.0.0.1", 0),
+            latency_ms=args.latency_ms,
+            jitter_ms=args.jitter_ms,
+            fail_rate=args.fail_rate,
+            seed=args.seed,
+        )
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        endpoint = server.url
+
+    pad = "x" * max(0, args.request_bytes - 16)
+    requests = [f"req-{i:08d}:{pad}" for i in range(args.requests)]
+    size = max(1, args.batch_size)
+    chunks = [requests[i : i + size] for i in range(0, len(requests), size)]
+
+    gateway = ModelGateway(endpoint, max_concurrency=args.concurrency, batch_size=size, backoff_s=0.01)
+    latencies: list[float] = []
+    lock = threading.Lock()
+
+    def run(chunk: list[str]) -> int:
+        t0 = time.perf_counter()
+        if size == 1:
+            gateway.complete(chunk[0], mission_id="bench")
+        else:
+            gateway.complete_batch(chunk, mission_id="bench")
+        ms = (time.perf_counter() - t0) * 1000
+        with lock:
+            # Every request in a batch waited for the whole call.
+            latencies.extend([ms] * len(chunk))
+        return len(chunk)
+
+    t0 = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            done = sum(pool.map(run, chunks))
+    finally:
+        gateway.close()
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+    wall = time.perf_counter() - t0
+
+    latencies.sort()
+    report = {
+        "requests": done,
+        "batch_size": size,
+        "concurrency": args.concurrency,
+        "wall_s": round(wall, 4),
+        "throughput_rps": round(done / wall, 1) if wall else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 0.50), 3),
+            "p95": round(percentile(latencies, 0.95), 3),
+            "p99": round(percentile(latencies, 0.99), 3),
+            "max": round(latencies[-1], 3) if latencies else 0.0,
+        },
+        "gateway": dict(gateway.stats),
+        "budget": gateway.budget("bench").summary(),
+    }
+    if args.json:
+        print(json.dumps(report, indent=2, sort_keys=True))
+        return 0
+
+    lat = report["latency_ms"]
+    print(
+        f"[bench-gateway] requests={done} batch_size={size} concurrency={args.concurrency} "
+        f"wall_s={report['wall_s']} throughput={report['throughput_rps']}/s"
+    )
+    print(f"[bench-gateway] latency_ms p50={lat['p50']} p95={lat['p95']} p99={lat['p99']} max={lat['max']}")
+    print(
+        "[bench-gateway] "
+        + " ".join(f"{k}={v}" for k, v in sorted(report["gateway"].items()))
+        + f" est_tokens={report['budget']['tokens']}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
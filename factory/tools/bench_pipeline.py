@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from core.metrics import history  # noqa: E402
+from core.metrics.bench import STAGES, StageFailed, metric_name, run_bench, write_bench  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Time pipeline stages over repeated runs; write median metrics for ratchets and p95 for trends."
+    )
+    parser.add_argument(
+        "--stages",
+        default=",".join(STAGES),
+        help=f"Comma-separated stages (default: all of {','.join(STAGES)})",
+    )
+    parser.add_argument("--runs", type=int, default=5, help="Timed runs per stage")
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed runs per stage first (page cache, .pyc)")
+    parser.add_argument("--out-dir", type=Path, default=Path(".metrics/current"))
+    parser.add_argument("--history", type=Path, default=history.DEFAULT_PATH, help="Append-only metric history (SQLite)")
+    parser.add_argument("--no-history", action="store_true")
+    parser.add_argument("--json", action="store_true", help="Emit results as JSON")
+    args = parser.parse_args()
+
+    stages = [s.strip() for s in args.stages.split(",") if s.strip()]
+    try:
+        results = run_bench(stages, runs=max(1, args.runs), warmup=max(0, args.warmup))
+    except (ValueError, StageFailed) as e:
+        print(f"[bench] FAIL {e}", file=sys.stderr)
+        return 1
+    write_bench(args.out_dir, results)
+    if not args.no_history:
+        values = {metric_name(s, stat): r[stat] for s, r in results.items() for stat in ("median_ms", "p95_ms")}
+        if history.record(args.history, values, source="bench") is None:
+            print("[bench] history not recorded: uncommitted changes", file=sys.stderr)
+
+    if args.json:
+        print(json.dumps(results, indent=2, sort_keys=True))
+        return 0
+    for stage, r in results.items():
+        print(
+            f"[bench] stage={stage} runs={r['runs']} median_ms={r['median_ms']} "
+            f"p95_ms={r['p95_ms']} min_ms={r['min_ms']}"
+        )
+    print(f"[bench] wrote {args.out_dir / 'bench.json'} and bench_<stage>_{{median,p95}}_ms.json")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
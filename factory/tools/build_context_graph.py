@@ -2,18 +2,45 @@ from __future__ import annotations
 
 import argparse
 import ast
+import hashlib
 import json
+import os
+import pickle
+import sys
+from collections import Counter
 from pathlib import Path
+from typing import Iterable, Iterator
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
-def _md_headings(text: str) -> list[str]:
-    headings: list[str] = []
+from core.graph.git_objects import CatFile  # noqa: E402
+from core.graph.index import build_index, write_index  # noqa: E402
+from core.graph.snapshot import write_ndjson  # noqa: E402
+from core.inventory import inventory  # noqa: E402
+
+
+def _hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def _md_sections(text: str) -> list[tuple[str, str]]:
+    """Return (heading, content_hash) per heading; a section runs to the next heading."""
+
+    sections: list[tuple[str, str]] = []
+    current: str | None = None
+    body: list[str] = []
     for line in text.splitlines():
         if line.startswith("#"):
+            if current is not None:
+                sections.append((current, _hash("\n".join(body))))
             stripped = line.lstrip("#").strip()
-            if stripped:
-                headings.append(stripped)
-    return headings
+            current = stripped or None
+            body = [line]
+        elif current is not None:
+            body.append(line)
+    if current is not None:
+        sections.append((current, _hash("\n".join(body))))
+    return sections
 
 
 def _imports(module: ast.AST) -> list[str]:
@@ -26,46 +53,164 @@ def _imports(module: ast.AST) -> list[str]:
     return sorted(set(imported))
 
 
-def main() -> int:
-    parser = argparse.ArgumentParser(description="Build a tiny context graph snapshot (demo).")
-    parser.add_argument("--root", type=Path, required=True)
-    parser.add_argument("--out", type=Path, required=True)
-    args = parser.parse_args()
+def _parse(suffix: str, text: str) -> dict:
+    """Path-independent facts about one file: everything its records are built from."""
+
+    facts: dict = {"content_hash": _hash(text)}
+    if suffix == ".py":
+        try:
+            module = ast.parse(text)
+        except SyntaxError:
+            # Keep the file node; historical revisions may not parse on today's Python.
+            facts["syntax_error"] = True
+            return facts
+        facts["symbols"] = [
+            (node.name, _hash(ast.get_source_segment(text, node) or node.name))
+            for node in module.body
+            if isinstance(node, ast.FunctionDef)
+        ]
+        facts["imports"] = _imports(module)
+    if suffix == ".md":
+        facts["sections"] = _md_sections(text)
+    return facts
+
+
+def _file_records(rel: str, facts: dict) -> Iterator[tuple[str, dict]]:
+    yield "node", {"id": rel, "kind": "file", "path": rel, "content_hash": facts["content_hash"]}
+
+    for name, digest in facts.get("symbols", []):
+        sym_id = f"{rel}:{name}"
+        yield "node", {"id": sym_id, "kind": "symbol", "path": rel, "name": name, "content_hash": digest}
+        yield "edge", {"src": rel, "dst": sym_id, "kind": "contains"}
+
+    for mod in facts.get("imports", []):
+        yield "edge", {"src": rel, "dst": mod, "kind": "imports"}
+
+    for heading, digest in facts.get("sections", []):
+        sec_id = f"{rel}#{heading}"
+        yield "node", {"id": sec_id, "kind": "doc_section", "path": rel, "name": heading, "content_hash": digest}
+        yield "edge", {"src": rel, "dst": sec_id, "kind": "contains"}
+
+
+def _records(root: Path) -> Iterator[tuple[str, dict]]:
+    """Yield ("node" | "edge", payload) per file of the (gitignore-aware) inventory, in path order."""
+
+    for path in inventory(root).paths({".py", ".md"}):
+        yield from _file_records(str(path), _parse(path.suffix, path.read_text(encoding="utf-8")))
+
+
+def _rev_records(
+    cat: CatFile, rev: str, root: Path, cache: dict[tuple[str, str], dict], stats: Counter
+) -> Iterator[tuple[str, dict]]:
+    """Like _records, but reading blobs of ``rev`` through ``cat``; facts cached by blob sha."""
+
+    tree_root = Path(os.path.relpath(root)).as_posix()
+    for sub, sha in cat.tree_blobs(rev, tree_root, {".py", ".md"}):
+        suffix = Path(sub).suffix
+        facts = cache.get((sha, suffix))
+        if facts is None:
+            _, _, data = cat.read(sha)
+            facts = _parse(suffix, data.decode("utf-8", errors="replace"))
+            cache[(sha, suffix)] = facts
+            stats["blobs_parsed"] += 1
+        else:
+            stats["blob_cache_hits"] += 1
+        yield from _file_records(str(root / sub), facts)
+
+
+def _load_blob_cache(path: Path | None) -> dict[tuple[str, str], dict]:
+    if path is None or not path.exists():
+        return {}
+    try:
+        with path.open("rb") as f:
+            cache = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def _save_blob_cache(path: Path, cache: dict[tuple[str, str], dict]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("wb") as f:
+        pickle.dump(cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+    tmp.replace(path)
+
+
+def _emit(args: argparse.Namespace, out: Path, records: Iterable[tuple[str, dict]], label: str) -> None:
+    fmt = args.format or ("ndjson" if out.suffix in {".ndjson", ".jsonl"} else "json")
+
+    if fmt == "ndjson":
+        # Streamed while walking: memory stays flat however large the tree is. The
+        # query index is built on first `aoi graph query` instead of here.
+        n_nodes, n_edges = write_ndjson(out, str(args.root), records)
+        print(f"[graph] wrote {out}{label} nodes={n_nodes} edges={n_edges} format=ndjson")
+        return
 
     nodes: list[dict] = []
     edges: list[dict] = []
+    for kind, payload in records:
+        (nodes if kind == "node" else edges).append(payload)
 
-    for path in sorted(args.root.rglob("*")):
-        if path.is_dir():
-            continue
-
-        if path.suffix not in {".py", ".md"}:
-            continue
-
-        rel = str(path)
-        nodes.append({"id": rel, "kind": "file", "path": rel})
+    graph = {"root": str(args.root), "nodes": nodes, "edges": edges}
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(graph, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    print(f"[graph] wrote {out}{label} nodes={len(nodes)} edges={len(edges)}")
 
-        if path.suffix == ".py":
-            module = ast.parse(path.read_text(encoding="utf-8"))
-            for node in module.body:
-                if isinstance(node, ast.FunctionDef):
-                    sym_id = f"{rel}:{node.name}"
-                    nodes.append({"id": sym_id, "kind": "symbol", "path": rel, "name": node.name})
-                    edges.append({"src": rel, "dst": sym_id, "kind": "contains"})
+    if not args.no_index:
+        index_path = write_index(build_index(graph), out, args.index if len(args.rev) <= 1 else None)
+        print(f"[graph] wrote {index_path}")
 
-            for mod in _imports(module):
-                edges.append({"src": rel, "dst": mod, "kind": "imports"})
 
-        if path.suffix == ".md":
-            for heading in _md_headings(path.read_text(encoding="utf-8")):
-                sec_id = f"{rel}#{heading}"
-                nodes.append({"id": sec_id, "kind": "doc_section", "path": rel, "name": heading})
-                edges.append({"src": rel, "dst": sec_id, "kind": "contains"})
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Build a tiny context graph snapshot (demo).")
+    parser.add_argument("--root", type=Path, required=True)
+    parser.add_argument("--out", type=Path, required=True)
+    parser.add_argument(
+        "--format",
+        choices=["json", "ndjson"],
+        default=None,
+        help="Snapshot format (default: ndjson for .ndjson/.jsonl outputs, else json)",
+    )
+    parser.add_argument("--index", type=Path, default=None, help="Index path (default: next to --out)")
+    parser.add_argument("--no-index", action="store_true", help="Skip building query indexes")
+    parser.add_argument(
+        "--rev",
+        action="append",
+        default=[],
+        help="Build from this git revision's objects instead of the working tree (repeatable)",
+    )
+    parser.add_argument(
+        "--blob-cache",
+        type=Path,
+        default=None,
+        help="Persist per-blob parse results here (keyed by blob SHA) for reuse across runs",
+    )
+    args = parser.parse_args()
 
-    graph = {"root": str(args.root), "nodes": nodes, "edges": edges}
-    args.out.parent.mkdir(parents=True, exist_ok=True)
-    args.out.write_text(json.dumps(graph, indent=2, sort_keys=True) + "\n", encoding="utf-8")
-    print(f"[graph] wrote {args.out} nodes={len(nodes)} edges={len(edges)}")
+    if not args.rev:
+        _emit(args, args.out, _records(args.root), "")
+        return 0
+
+    if len(args.rev) > 1 and "{rev}" not in str(args.out):
+        raise SystemExit("--out must contain a {rev} placeholder when several --rev are given")
+
+    cache = _load_blob_cache(args.blob_cache)
+    stats: Counter = Counter()
+    with CatFile() as cat:
+        for rev in args.rev:
+            out = Path(str(args.out).replace("{rev}", rev.replace("/", "_")))
+            try:
+                _emit(args, out, _rev_records(cat, rev, args.root, cache, stats), f" rev={rev}")
+            except ValueError as e:
+                raise SystemExit(f"[graph] {e}")
+
+    if args.blob_cache is not None and stats["blobs_parsed"]:
+        _save_blob_cache(args.blob_cache, cache)
+    print(
+        f"[graph] revs={len(args.rev)} blobs_parsed={stats['blobs_parsed']} "
+        f"blob_cache_hits={stats['blob_cache_hits']}"
+    )
     return 0
 
 
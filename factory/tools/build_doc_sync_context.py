@@ -1,35 +1,16 @@
 from __future__ import annotations
 
 import argparse
-import ast
 import json
+import sys
 from pathlib import Path
 
-HEADING = "## Public Interfaces"
-
-
-def _public_function_signatures(src_root: Path) -> list[str]:
-    signatures: set[str] = set()
-    for path in sorted(src_root.rglob("*.py")):
-        module = ast.parse(path.read_text(encoding="utf-8"))
-        for node in module.body:
-            if isinstance(node, ast.FunctionDef) and not node.name.startswith("_"):
-                args = [a.arg for a in node.args.args]
-                signatures.add(f"{node.name}({', '.join(args)})")
-    return sorted(signatures)
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
+from core.prep.delta import signature_delta  # noqa: E402
+from core.prep.terrain import heading_block, public_function_signatures  # noqa: E402
 
-def _extract_heading_block(doc_text: str, heading: str) -> str:
-    lines = doc_text.splitlines(keepends=True)
-    start = next((i for i, line in enumerate(lines) if line.rstrip() == heading), None)
-    if start is None:
-        raise ValueError(f"Heading not found: {heading}")
-
-    end = next(
-        (i for i in range(start + 1, len(lines)) if lines[i].startswith("## ")),
-        len(lines),
-    )
-    return "".join(lines[start:end]).rstrip() + "\n"
+HEADING = "## Public Interfaces"
 
 
 def main() -> int:
@@ -42,22 +23,43 @@ def main() -> int:
     parser.add_argument(
         "--task-id", default="doc_sync:public_interfaces", help="Task id for tracing"
     )
+    parser.add_argument(
+        "--mode",
+        choices=["full", "delta"],
+        default="full",
+        help="full: every signature + whole block; delta: only changes + anchor lines",
+    )
     args = parser.parse_args()
 
     doc_text = args.doc.read_text(encoding="utf-8")
-    context = {
+    signatures = public_function_signatures(args.src)
+    context: dict = {
         "task_id": args.task_id,
         "target_file": str(args.doc),
         "allowed_heading": HEADING,
-        "extracted_signatures": _public_function_signatures(args.src),
-        "current_block": _extract_heading_block(doc_text, HEADING),
     }
 
+    mode = args.mode
+    delta = signature_delta(signatures, doc_text, HEADING) if mode == "delta" else None
+    if delta is not None and delta["map_signature_count"] == 0:
+        # Cold start: there is nothing in the Map to anchor a delta against.
+        print("[prep] no signatures in the Map block yet; falling back to full mode")
+        mode = "full"
+
+    context["mode"] = mode
+    if mode == "delta":
+        assert delta is not None
+        context["delta"] = {k: delta[k] for k in ("added", "removed", "changed")}
+        context["anchors"] = delta["anchors"]
+    else:
+        context["extracted_signatures"] = signatures
+        context["current_block"] = heading_block(doc_text, HEADING)
+
     args.out.parent.mkdir(parents=True, exist_ok=True)
     args.out.write_text(
         json.dumps(context, indent=2, sort_keys=True) + "\n", encoding="utf-8"
     )
-    print(f"[prep] wrote {args.out}")
+    print(f"[prep] wrote {args.out} mode={mode}")
     return 0
 
 
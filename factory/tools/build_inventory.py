@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from core.inventory import build  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Walk the tree once (honouring .gitignore) and persist the listing as a manifest."
+    )
+    parser.add_argument("--root", type=Path, default=Path("."))
+    parser.add_argument("--out", type=Path, default=Path(".sdac/inventory.json"))
+    parser.add_argument("--ignore", action="append", default=[], help="Extra gitignore-style pattern (repeatable)")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    inv = build(args.root, extra_ignores=args.ignore)
+    inv.save(args.out)
+    files = sum(1 for e in inv.entries if not e.is_dir)
+    print(
+        f"[inventory] root={args.root} files={files} dirs={len(inv.entries) - files} "
+        f"elapsed_s={time.perf_counter() - t0:.3f} wrote={args.out}"
+    )
+    print(f"[inventory] reuse it with: export AOI_INVENTORY={args.out.resolve()}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from core.model.client import cached_complete  # noqa: E402
+from core.model.gateway import GatewayError  # noqa: E402
+from core.model.response_cache import ResponseCache  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Send a rendered request to a model endpoint through the local response cache."
+    )
+    parser.add_argument("--request", default="-", help="Rendered request text ('-' for stdin)")
+    parser.add_argument("--endpoint", default="http://127.0.0.1:8765/v1/complete")
+    parser.add_argument("--model", default="stub")
+    parser.add_argument("--cache-dir", type=Path, default=Path(".sdac/response-cache"))
+    parser.add_argument("--ttl-s", type=float, default=7 * 24 * 3600, help="Entry time-to-live")
+    parser.add_argument("--max-bytes", type=int, default=64 * 1024 * 1024, help="Cache size cap (LRU)")
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args()
+
+    request = sys.stdin.read() if args.request == "-" else Path(args.request).read_text(encoding="utf-8")
+    cache = None if args.no_cache else ResponseCache(args.cache_dir, ttl_s=args.ttl_s, max_bytes=args.max_bytes)
+
+    try:
+        response, hit = cached_complete(cache, args.endpoint, args.model, request, args.timeout)
+    except (GatewayError, ValueError) as e:
+        print(f"[model] call failed endpoint={args.endpoint}: {e}", file=sys.stderr)
+        return 1
+
+    sys.stdout.write(response)
+    status = "hit" if hit else "miss"
+    stats = json.dumps(cache.summary(), sort_keys=True) if cache is not None else "{}"
+    print(f"[model] cache={status} stats={stats}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
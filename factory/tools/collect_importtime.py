@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from core.metrics import history  # noqa: E402
+from core.metrics.importtime import measure_entry, metric_name, write_entry  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Measure import time of configured entry modules (python -X importtime, fresh interpreters)."
+    )
+    parser.add_argument("--config", type=Path, default=Path("governance/importtime.json"))
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--top", type=int, default=5, help="Slowest modules (self time) to list per entry")
+    parser.add_argument("--out-dir", type=Path, default=Path(".metrics/current"))
+    parser.add_argument("--history", type=Path, default=history.DEFAULT_PATH, help="Append-only metric history (SQLite)")
+    parser.add_argument("--no-history", action="store_true")
+    args = parser.parse_args()
+
+    entries = json.loads(args.config.read_text(encoding="utf-8")).get("entries", {})
+    failed = 0
+    values: dict[str, float] = {}
+    for name, spec in entries.items():
+        try:
+            result = measure_entry(spec["module"], spec.get("path", "."), runs=max(1, args.runs), warmup=args.warmup)
+        except RuntimeError as e:
+            print(f"[importtime] FAIL entry={name}: {e}", file=sys.stderr)
+            failed += 1
+            continue
+        path = write_entry(args.out_dir, name, result)
+        values[metric_name(name)] = result["value"]
+        print(
+            f"[importtime] entry={name} module={result['module']} import_ms={result['value']} "
+            f"startup_ms={result['startup_ms']} modules={len(result['self_ms'])} metric={metric_name(name)} file={path}"
+        )
+        slowest = sorted(result["self_ms"].items(), key=lambda kv: kv[1], reverse=True)[: args.top]
+        for module, ms in slowest:
+            print(f"  self_ms={ms} module={module}")
+    if values and not args.no_history:
+        if history.record(args.history, values, source="importtime") is None:
+            print("[importtime] history not recorded: uncommitted changes", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,54 +1,48 @@
 from __future__ import annotations
 
 import argparse
-import json
-import py_compile
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
-def _count_tests(tests_root: Path) -> int:
-    if not tests_root.exists():
-        return 0
+from core.metrics import history  # noqa: E402
+from core.metrics.collector import FactCache, collect, write_snapshot  # noqa: E402
 
-    count = 0
-    for path in sorted(tests_root.rglob("*.py")):
-        for line in path.read_text(encoding="utf-8").splitlines():
-            if line.lstrip().startswith("def test_"):
-                count += 1
-    return count
 
-
-def _count_syntax_errors(root: Path) -> int:
-    errors = 0
-    for path in sorted(root.rglob("*.py")):
-        try:
-            py_compile.compile(str(path), doraise=True)
-        except py_compile.PyCompileError:
-            errors += 1
-    return errors
-
-
-def _write_metric(out_dir: Path, name: str, value: int) -> None:
-    out_dir.mkdir(parents=True, exist_ok=True)
-    (out_dir / f"{name}.json").write_text(
-        json.dumps({"value": value}, indent=2, sort_keys=True) + "\n",
-        encoding="utf-8",
-    )
+def _fmt(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else f"{value:g}"
 
 
 def main() -> int:
     parser = argparse.ArgumentParser(description="Collect demo metrics for ratchets (no external deps).")
     parser.add_argument("--root", type=Path, required=True)
     parser.add_argument("--out-dir", type=Path, required=True)
+    parser.add_argument(
+        "--cache",
+        type=Path,
+        default=Path(".sdac/metrics-cache.json"),
+        help="Per-file metric values keyed by content hash",
+    )
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("--history", type=Path, default=history.DEFAULT_PATH, help="Append-only metric history (SQLite)")
+    parser.add_argument("--no-history", action="store_true")
     args = parser.parse_args()
 
-    test_count = _count_tests(args.root / "tests")
-    syntax_errors = _count_syntax_errors(args.root)
-
-    _write_metric(args.out_dir, "test_count", test_count)
-    _write_metric(args.out_dir, "python_syntax_errors", syntax_errors)
-
-    print(f"[metrics] test_count={test_count} python_syntax_errors={syntax_errors}")
+    cache = FactCache(None if args.no_cache else args.cache)
+    snapshot = collect(args.root, cache)
+    write_snapshot(args.out_dir, snapshot)
+    if not args.no_history:
+        if history.record(args.history, snapshot["metrics"], source="metrics") is None:
+            print("[metrics] history not recorded: uncommitted changes", file=sys.stderr)
+
+    values = " ".join(f"{k}={_fmt(v)}" for k, v in snapshot["metrics"].items())
+    print(f"[metrics] {values}")
+    print(
+        f"[metrics] files={snapshot['files']} cached={snapshot['cache']['hits']} "
+        f"computed={snapshot['cache']['misses']} elapsed_s={snapshot['elapsed_s']} "
+        f"snapshot={args.out_dir / 'snapshot.json'}"
+    )
     return 0
 
 
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from core.graph.diff import affected_missions, changed_paths, diff_graphs  # noqa: E402
+from core.graph.snapshot import load_graph  # noqa: E402
+from core.missions.loader import discover_missions, load_mission  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Diff two context graph snapshots and report the Mission Objects they affect."
+    )
+    parser.add_argument("old", type=Path, help="Older snapshot (.json or .ndjson)")
+    parser.add_argument("new", type=Path, help="Newer snapshot (.json or .ndjson)")
+    parser.add_argument("--missions-dir", type=Path, default=Path("missions"))
+    parser.add_argument("--json", action="store_true", help="Emit the full report as JSON")
+    args = parser.parse_args()
+
+    diff = diff_graphs(load_graph(args.old), load_graph(args.new))
+    paths = changed_paths(diff)
+
+    missions = []
+    for p in discover_missions(args.missions_dir):
+        try:
+            missions.append((p, load_mission(p)))
+        except Exception as e:
+            print(f"[graph-diff] skipping unreadable mission {p}: {e}", file=sys.stderr)
+    affected = affected_missions(paths, missions)
+
+    if args.json:
+        report = dict(diff, changed_paths=sorted(paths), affected_missions=affected)
+        print(json.dumps(report, indent=2, sort_keys=True))
+        return 0
+
+    nodes, edges = diff["nodes"], diff["edges"]
+    print(
+        "[graph-diff] "
+        f"nodes_added={len(nodes['added'])} nodes_removed={len(nodes['removed'])} "
+        f"nodes_changed={len(nodes['changed'])} "
+        f"edges_added={len(edges['added'])} edges_removed={len(edges['removed'])}"
+    )
+    for status in ("added", "removed", "changed"):
+        for n in nodes[status]:
+            print(f"node={status} kind={n.get('kind')} id={n['id']}")
+    for status in ("added", "removed"):
+        for e in edges[status]:
+            print(f"edge={status} kind={e.get('kind')} src={e['src']} dst={e['dst']}")
+
+    for m in affected:
+        print(f"mission=affected id={m['mission_id']} file={m['path']} reasons={'; '.join(m['reasons'])}")
+    if not affected:
+        print("[graph-diff] no missions affected")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,53 +1,119 @@
 from __future__ import annotations
 
 import argparse
-import ast
+import os
+import sys
+import time
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
-def _function_complexity(fn: ast.FunctionDef) -> int:
-    branch_nodes = (ast.If, ast.For, ast.While, ast.Try, ast.With, ast.BoolOp, ast.Match)
-    return sum(1 for n in ast.walk(fn) if isinstance(n, branch_nodes))
+from core.dream.clones import clone_groups  # noqa: E402
+from core.dream.hotspots import hotspots  # noqa: E402
+from core.dream.scan import ScanCache, scan  # noqa: E402
+
+
+def _hotspots(args: argparse.Namespace) -> int:
+    t0 = time.perf_counter()
+    try:
+        ranked = hotspots(args.root, rev=args.rev, since=args.since, max_commits=args.max_commits)
+    except (RuntimeError, ValueError) as e:
+        print(f"[dream] FAIL hotspots: {e}", file=sys.stderr)
+        return 1
+
+    for n, r in enumerate(ranked["functions"][: args.top], start=1):
+        print(
+            f"signal=hotspot rank={n} score={r['score']} file={os.path.join(args.root, r['file'])} "
+            f"symbol={r['symbol']} cc={r['cc']} commits={r['commits']} churn={r['churn']}"
+        )
+    for n, r in enumerate(ranked["files"][: args.top], start=1):
+        print(
+            f"signal=hotspot_file rank={n} score={r['score']} file={os.path.join(args.root, r['file'])} "
+            f"cc={r['cc']} commits={r['commits']} added={r['added']} deleted={r['deleted']}"
+        )
+    if not ranked["files"]:
+        print("[dream] no signals")
+
+    print(
+        f"[dream] hotspots commits={ranked['commits']} functions={len(ranked['functions'])} "
+        f"files={len(ranked['files'])} elapsed_s={time.perf_counter() - t0:.3f}",
+        file=sys.stderr,
+    )
+    return 0
 
 
 def main() -> int:
     parser = argparse.ArgumentParser(description="Depth 0 Dream scan (read-only entropy signals).")
     parser.add_argument("--root", type=Path, required=True)
-    parser.add_argument("--cc-threshold", type=int, default=30)
+    parser.add_argument("--cc-threshold", type=int, default=30, help="McCabe complexity that raises a signal")
     parser.add_argument("--file-lines", type=int, default=500)
+    parser.add_argument(
+        "--clone-threshold",
+        type=float,
+        default=0.8,
+        help="Fingerprint similarity (Jaccard) that makes two functions clones; 0 disables",
+    )
+    parser.add_argument(
+        "--cache",
+        type=Path,
+        default=Path(".sdac/dream-cache.pickle"),
+        help="Per-file facts keyed by stat and content hash",
+    )
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("--workers", type=int, default=None, help="Parse processes for cache misses (default: CPU count)")
+    parser.add_argument(
+        "--hotspots",
+        action="store_true",
+        help="Rank functions and files by commits x complexity from one git log instead",
+    )
+    parser.add_argument("--rev", default="HEAD", help="Hotspots: revision whose functions are ranked")
+    parser.add_argument("--since", default=None, help="Hotspots: history window, e.g. '6 months ago'")
+    parser.add_argument("--max-commits", type=int, default=None, help="Hotspots: newest N first-parent commits")
+    parser.add_argument("--top", type=int, default=20, help="Hotspots: entries to print per list")
     args = parser.parse_args()
 
-    signals: list[str] = []
+    if args.hotspots:
+        return _hotspots(args)
 
-    for path in sorted(args.root.rglob("*.py")):
-        try:
-            text = path.read_text(encoding="utf-8")
-        except UnicodeDecodeError:
-            continue
-
-        if len(text.splitlines()) > args.file_lines:
-            signals.append(f"signal=file_too_large file={path} lines={len(text.splitlines())}")
+    t0 = time.perf_counter()
+    facts_by_path, stats = scan(args.root, ScanCache(None if args.no_cache else args.cache), workers=args.workers)
 
-        try:
-            module = ast.parse(text)
-        except SyntaxError:
+    signals: list[str] = []
+    functions = 0
+    fingerprinted: list[tuple[str, str, list[int]]] = []
+    for path, facts in facts_by_path.items():
+        if facts.get("skip"):
+            continue
+        if facts["lines"] > args.file_lines:
+            signals.append(f"signal=file_too_large file={path} lines={facts['lines']}")
+        if facts.get("syntax_error"):
             signals.append(f"signal=syntax_error file={path}")
             continue
-
-        for node in module.body:
-            if isinstance(node, ast.FunctionDef):
-                cc = _function_complexity(node)
-                if cc >= args.cc_threshold:
-                    signals.append(
-                        f"signal=complexity_high file={path} symbol={node.name} cc={cc}"
-                    )
+        for name, _, cc in facts["functions"]:
+            functions += 1
+            if cc >= args.cc_threshold:
+                signals.append(f"signal=complexity_high file={path} symbol={name} cc={cc}")
+        fingerprinted.extend((path, name, fps) for name, fps in facts["fingerprints"].items())
 
     for line in sorted(signals):
         print(line)
 
-    if not signals:
+    groups = clone_groups(fingerprinted, threshold=args.clone_threshold) if args.clone_threshold > 0 else []
+    for n, group in enumerate(groups, start=1):
+        for path, name in group["members"]:
+            print(
+                f"signal=clone group={n} size={len(group['members'])} similarity={group['similarity']:.2f} "
+                f"file={path} symbol={name}"
+            )
+
+    if not signals and not groups:
         print("[dream] no signals")
 
+    print(
+        f"[dream] files={stats['files']} functions={functions} clone_groups={len(groups)} parsed={stats['parsed']} "
+        f"cached={stats['stat_hits'] + stats['hash_hits']} elapsed_s={time.perf_counter() - t0:.3f}",
+        file=sys.stderr,
+    )
     return 0
 
 
@@ -1,8 +1,13 @@
 from __future__ import annotations
 
 import argparse
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from core.inventory import build, inventory  # noqa: E402
+
 
 def _count_headings(md: Path, prefix: str = "### ") -> int:
     return sum(1 for line in md.read_text(encoding="utf-8").splitlines() if line.startswith(prefix))
@@ -13,17 +18,26 @@ def main() -> int:
     parser.add_argument("--root", type=Path, required=True)
     parser.add_argument("--max-children", type=int, default=10)
     parser.add_argument("--max-headings", type=int, default=12)
+    parser.add_argument(
+        "--inventory",
+        type=Path,
+        default=None,
+        help="Inventory manifest to reuse (default: $AOI_INVENTORY, else walk --root once)",
+    )
+    parser.add_argument("--no-gitignore", action="store_true", help="Count ignored files and directories too")
     args = parser.parse_args()
 
+    # One walk serves both checks.
+    inv = build(args.root, gitignore=False, extra_ignores=["__pycache__/"]) if args.no_gitignore else inventory(args.root, args.inventory)
     warnings = 0
 
-    for d in sorted(p for p in args.root.rglob("*") if p.is_dir()):
-        children = [c for c in d.iterdir() if c.name not in {"__pycache__", ".git"}]
-        if len(children) > args.max_children:
-            print(f"[warn] branching_factor_too_high path={d} children={len(children)}")
+    children = inv.children()
+    for d in inv.dirs():
+        if children[d.path] > args.max_children:
+            print(f"[warn] branching_factor_too_high path={args.root / d.path} children={children[d.path]}")
             warnings += 1
 
-    for md in sorted(args.root.rglob("*.md")):
+    for md in inv.paths({".md"}):
         h = _count_headings(md)
         if h > args.max_headings:
             print(f"[warn] doc_fanout_too_high file={md} headings={h}")
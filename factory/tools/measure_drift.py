@@ -8,6 +8,10 @@ import tempfile
 import shutil
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from core.runners.effector_pool import EffectorPool  # noqa: E402
+
 
 def _hash(text: str) -> str:
     return hashlib.sha256(text.encode("utf-8")).hexdigest()
@@ -25,6 +29,12 @@ def main() -> int:
         action="store_true",
         help="Run Validator against each applied candidate (temp file, no working tree writes)",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="Run attempts on N long-lived Effector workers (0 = one subprocess per attempt)",
+    )
     args = parser.parse_args()
 
     effector = "tools/stochastic_sync_public_interfaces.py"
@@ -51,22 +61,49 @@ def main() -> int:
         tmpdir = tempfile.mkdtemp(prefix="aoi_code_drift_")
         doc_path = Path(tmpdir) / args.doc.name
 
+    pooled: dict[int, dict] = {}
+    if args.workers > 0:
+        # Attempts run concurrently on private doc copies; "doc" is the logical path,
+        # so diffs match what the per-attempt subprocess mode would print.
+        doc_text = args.doc.read_text(encoding="utf-8") if args.validate else None
+        requests = [
+            {
+                "id": i,
+                "src": str(args.src),
+                "doc": str(doc_path),
+                "doc_text": doc_text,
+                "seed": args.seed + i,
+                "apply": args.validate,
+            }
+            for i in range(1, args.runs + 1)
+        ]
+        with EffectorPool(effector, size=args.workers) as pool:
+            pooled = {r["id"]: r for r in pool.map(requests)}
+
     for i in range(1, args.runs + 1):
         seed = args.seed + i
 
-        if args.validate:
-            shutil.copyfile(args.doc, doc_path)
+        if i in pooled:
+            result = pooled[i]
+            returncode, stdout = result["returncode"], result["stdout"]
+            if args.validate and returncode == 0:
+                doc_path.write_text(result["new_text"], encoding="utf-8")
+        else:
+            if args.validate:
+                shutil.copyfile(args.doc, doc_path)
 
-        cmd = cmd_base[:-1] + [str(doc_path), "--seed", str(seed)]
-        if args.validate:
-            cmd.append("--apply")
+            cmd = cmd_base[:-1] + [str(doc_path), "--seed", str(seed)]
+            if args.validate:
+                cmd.append("--apply")
+
+            p = subprocess.run(cmd, capture_output=True, text=True)
+            returncode, stdout = p.returncode, p.stdout
 
-        p = subprocess.run(cmd, capture_output=True, text=True)
-        if p.returncode != 0:
+        if returncode != 0:
             failures += 1
             continue
 
-        h = _hash(p.stdout)
+        h = _hash(stdout)
         unique.setdefault(h, i)
 
         if args.validate:
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from core.metrics import history  # noqa: E402
+
+# Without a ratchet entry, timings and error counts are better when lower.
+LOWER_IS_BETTER = ("_ms", "_s", "_errors")
+
+
+def _ratchet_spec(config: Path, metric: str) -> dict:
+    try:
+        return json.loads(config.read_text(encoding="utf-8")).get("ratchets", {}).get(metric, {})
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def _default_direction(metric: str) -> str:
+    return "down" if metric.endswith(LOWER_IS_BETTER) else "up"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Query the metric history: per-commit series, slope, first regression.")
+    parser.add_argument("metric", nargs="?", help="Metric name (omit to list recorded metrics)")
+    parser.add_argument("--history", type=Path, default=history.DEFAULT_PATH)
+    parser.add_argument("--last", type=int, default=None, help="Only the most recent N commits")
+    parser.add_argument(
+        "--direction",
+        choices=("up", "down"),
+        default=None,
+        help="Which way is better (default: from --config, else down for *_ms/*_s/*_errors, up otherwise)",
+    )
+    parser.add_argument("--tolerance", type=float, default=None)
+    parser.add_argument("--relative-tolerance", type=float, default=None)
+    parser.add_argument("--config", type=Path, default=Path("governance/ratchets.json"))
+    parser.add_argument("--rev", default="HEAD", help="Order points by this revision's history")
+    parser.add_argument(
+        "--recorded-order",
+        action="store_true",
+        help="Order points by when they were recorded instead of by commit (also used outside git)",
+    )
+    parser.add_argument("--series", action="store_true", help="Print every point")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    if not args.history.exists():
+        print(f"[trend] no history at {args.history} (run aoi metrics / aoi bench first)", file=sys.stderr)
+        return 1
+    if not args.metric:
+        for name in history.metric_names(args.history):
+            print(name)
+        return 0
+
+    order = None if args.recorded_order else history.commit_order(args.rev)
+    if order is None and not args.recorded_order:
+        print(f"[trend] cannot list commits of {args.rev}; using recorded order", file=sys.stderr)
+    points = history.series(args.history, args.metric, last=args.last, order=order)
+    if not points:
+        print(f"[trend] no samples for metric={args.metric}", file=sys.stderr)
+        return 1
+
+    spec = _ratchet_spec(args.config, args.metric)
+    direction = args.direction or spec.get("direction", _default_direction(args.metric))
+    tolerance = args.tolerance if args.tolerance is not None else float(spec.get("tolerance", 0.0))
+    relative = (
+        args.relative_tolerance
+        if args.relative_tolerance is not None
+        else float(spec.get("relative_tolerance", 0.0))
+    )
+    values = [p["value"] for p in points]
+    regression = history.first_regression(points, direction, tolerance, relative)
+    summary = {
+        "metric": args.metric,
+        "commits": len(points),
+        "first_commit": points[0]["commit"],
+        "last_commit": points[-1]["commit"],
+        "min": min(values),
+        "max": max(values),
+        "last": values[-1],
+        "slope_per_commit": round(history.slope(points), 6),
+        "direction": direction,
+        "first_regression": regression,
+    }
+
+    if args.json:
+        out = dict(summary, points=points) if args.series else summary
+        print(json.dumps(out, indent=2, sort_keys=True))
+        return 0
+    if args.series:
+        for p in points:
+            print(f"commit={p['commit'][:12]} value={p['value']:g}")
+    print(
+        f"[trend] metric={args.metric} commits={summary['commits']} first={summary['first_commit'][:12]} "
+        f"last={summary['last_commit'][:12]} min={summary['min']:g} max={summary['max']:g} "
+        f"last_value={summary['last']:g} slope_per_commit={summary['slope_per_commit']:g}"
+    )
+    if regression is None:
+        print(f"[trend] first_regression=none direction={direction}")
+    else:
+        print(
+            f"[trend] first_regression commit={regression['commit'][:12]} value={regression['value']:g} "
+            f"best_before={regression['best']:g} allowed={regression['allowed']:g} direction={direction}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
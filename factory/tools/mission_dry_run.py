@@ -2,12 +2,14 @@ from __future__ import annotations
 
 import argparse
 import json
+import sys
 from pathlib import Path
+from typing import Iterator
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
-def _estimate_tokens(text: str) -> int:
-    # Rough heuristic: ~4 chars/token for English-like text.
-    return max(1, len(text) // 4)
+from core.inventory import inventory  # noqa: E402
+from core.prep.tokens import TokenCache  # noqa: E402
 
 
 def _heading_ref(heading: str) -> str:
@@ -20,6 +22,14 @@ def main() -> int:
         description="Dry run a Mission: print slice + validators + budgets (no model call)."
     )
     parser.add_argument("--mission", type=Path, required=True)
+    parser.add_argument(
+        "--token-cache",
+        type=Path,
+        default=Path(".sdac/token-cache.json"),
+        help="Per-file token counts keyed by content hash",
+    )
+    parser.add_argument("--no-token-cache", action="store_true")
+    parser.add_argument("--top", type=int, default=20, help="Largest paths to list in the breakdown")
     args = parser.parse_args()
 
     mission = json.loads(args.mission.read_text(encoding="utf-8"))
@@ -35,13 +45,23 @@ def main() -> int:
     terrain_roots = [Path(p) for p in slice_spec.get("terrain_roots", [])]
     map_files = [Path(p) for p in slice_spec.get("map_files", [])]
 
-    slice_text = ""
-    for root in terrain_roots:
-        for p in sorted(root.rglob("*.py")):
-            slice_text += p.read_text(encoding="utf-8")
-
-    for p in map_files:
-        slice_text += p.read_text(encoding="utf-8")
+    def slice_files() -> Iterator[tuple[str, Path]]:
+        for root in terrain_roots:
+            for p in inventory(root).paths({".py"}):
+                yield str(root), p
+        for p in map_files:
+            yield "map_files", p
+
+    # Stream the slice one file at a time; nothing is concatenated.
+    cache = TokenCache(None if args.no_token_cache else args.token_cache)
+    per_path: list[tuple[int, int, Path]] = []
+    per_group: dict[str, int] = {}
+    for group, p in slice_files():
+        tokens, size = cache.count_file(p)
+        per_path.append((tokens, size, p))
+        per_group[group] = per_group.get(group, 0) + tokens
+    cache.save()
+    token_total = sum(t for t, _, _ in per_path)
 
     budgets = mission.get("budgets", {})
     validators = mission.get("validators", [])
@@ -55,7 +75,12 @@ def main() -> int:
     for root in terrain_roots:
         print(f"  - {root}/**/*.py")
 
-    print(f"[DRY RUN] token_estimate={_estimate_tokens(slice_text)}")
+    print(f"[DRY RUN] token_estimate={token_total}")
+    print(f"[DRY RUN] token_breakdown: files={len(per_path)} cache_hits={cache.hits} cache_misses={cache.misses}")
+    for group, tokens in per_group.items():
+        print(f"  - {group}: tokens={tokens}")
+    for tokens, size, p in sorted(per_path, key=lambda t: (-t[0], str(t[2])))[: args.top]:
+        print(f"    {p} tokens={tokens} bytes={size}")
 
     print("[DRY RUN] validators:")
     for v in validators:
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import argparse
+import json
+import shlex
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from core.graph.index import has_node, load_index, neighbors, query  # noqa: E402
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Query a context graph snapshot through its prebuilt indexes.")
+    parser.add_argument("--graph", type=Path, default=Path("build/context_graph.json"))
+    parser.add_argument("--index", type=Path, default=None, help="Index path (default: next to the graph)")
+    parser.add_argument("--kind", help="Node kind: file, symbol, doc_section")
+    parser.add_argument("--path-prefix", help="Only nodes whose path starts with this prefix")
+    parser.add_argument("--name", help="Exact symbol name (case-insensitive)")
+    parser.add_argument("--heading", help="Doc sections whose heading contains this text")
+    parser.add_argument("--contains", help="Substring of the node label (name, or path for files)")
+    parser.add_argument("--fuzzy", help="Rank labels by trigram similarity to this text")
+    parser.add_argument("--neighbors", metavar="NODE_ID", help="List edges around a node instead")
+    parser.add_argument("--direction", choices=["out", "in", "both"], default="both")
+    parser.add_argument("--edge-kind", help="Only follow edges of this kind (with --neighbors)")
+    parser.add_argument("--depth", type=int, default=1, help="Hops to follow (with --neighbors)")
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--json", action="store_true", help="Emit results as JSON")
+    parser.add_argument(
+        "--interactive",
+        action="store_true",
+        help="Load the index once, then answer one query per stdin line (same flags)",
+    )
+    return parser
+
+
+def _answer(index: dict, args: argparse.Namespace) -> int:
+    t0 = time.perf_counter()
+    if args.neighbors is not None:
+        if not has_node(index, args.neighbors):
+            print(f"[graph-query] node not found in graph: {args.neighbors}", file=sys.stderr)
+            return 1
+        results = neighbors(
+            index,
+            args.neighbors,
+            direction=args.direction,
+            edge_kind=args.edge_kind,
+            depth=args.depth,
+        )[: args.limit]
+    else:
+        results = query(
+            index,
+            kind=args.kind,
+            path_prefix=args.path_prefix,
+            name=args.name,
+            heading=args.heading,
+            contains=args.contains,
+            fuzzy_text=args.fuzzy,
+            limit=args.limit,
+        )
+    elapsed_ms = (time.perf_counter() - t0) * 1000
+
+    if args.json:
+        print(json.dumps(results, indent=2, sort_keys=True))
+    elif args.neighbors is not None:
+        for r in results:
+            print(f"edge={r['edge']} direction={r['direction']} depth={r['depth']} id={r['id']}")
+    else:
+        for r in results:
+            score = f" score={r['score']}" if "score" in r else ""
+            print(f"kind={r.get('kind')} id={r['id']}{score}")
+
+    print(f"[graph-query] matches={len(results)} query_ms={elapsed_ms:.2f}", file=sys.stderr)
+    return 0
+
+
+def main() -> int:
+    parser = _parser()
+    args = parser.parse_args()
+
+    if not args.graph.exists():
+        raise SystemExit(f"graph not found: {args.graph} (run `python3 -m aoi graph` first)")
+
+    t0 = time.perf_counter()
+    index = load_index(args.graph, args.index)
+    print(f"[graph-query] index_load_ms={(time.perf_counter() - t0) * 1000:.1f}", file=sys.stderr)
+
+    if not args.interactive:
+        return _answer(index, args)
+
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        try:
+            line_args = parser.parse_args(shlex.split(line))
+        except SystemExit:
+            continue  # argparse already printed the usage error
+        _answer(index, line_args)
+        sys.stdout.flush()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
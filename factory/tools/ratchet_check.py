@@ -2,12 +2,34 @@ from __future__ import annotations
 
 import argparse
 import json
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
-def _read_value(path: Path) -> float:
-    data = json.loads(path.read_text(encoding="utf-8"))
-    return float(data["value"])
+from core.metrics.importtime import top_self_increase  # noqa: E402
+
+
+def _read_pair(baseline_file: Path, current_file: Path, direction: str, compare: str) -> tuple[float, float]:
+    """(baseline, current) on the same basis.
+
+    With compare=best_sample and samples on both sides, each side is its most
+    favourable repeated sample, so one-off scheduler noise on either run does not
+    decide the check. Otherwise both sides are the recorded value (the median for
+    timings): a best sample is never compared against a median.
+    """
+
+    baseline = json.loads(baseline_file.read_text(encoding="utf-8"))
+    current = json.loads(current_file.read_text(encoding="utf-8"))
+    if compare == "best_sample" and baseline.get("samples") and current.get("samples"):
+        best = min if direction == "down" else max
+        return float(best(baseline["samples"])), float(best(current["samples"]))
+    return float(baseline["value"]), float(current["value"])
+
+
+def _allowance(spec: dict, baseline: float) -> float:
+    # Absolute tolerance doubles as a noise floor under the relative one (e.g. 20 ms or 25%).
+    return max(float(spec.get("tolerance", 0.0)), float(spec.get("relative_tolerance", 0.0)) * abs(baseline))
 
 
 def main() -> int:
@@ -21,11 +43,30 @@ def main() -> int:
 
     findings: list[dict[str, object]] = []
 
+    skipped: list[str] = []
+
     for name, spec in ratchets.items():
         direction = spec["direction"]
-        tolerance = float(spec.get("tolerance", 0.0))
-        baseline = _read_value(Path(spec["baseline_file"]))
-        current = _read_value(Path(spec["current_file"]))
+        baseline_file = Path(spec["baseline_file"])
+        current_file = Path(spec["current_file"])
+        missing = [str(p) for p in (baseline_file, current_file) if not p.exists()]
+        if missing:
+            if spec.get("optional"):
+                skipped.append(f"metric={name} missing={','.join(missing)}")
+            else:
+                findings.append(
+                    {
+                        "file_path": str(args.config),
+                        "error_code": "missing_metric",
+                        "metric": name,
+                        "missing": missing,
+                        "suggested_fix": "Collect metrics first (aoi metrics / aoi bench) or capture a baseline.",
+                    }
+                )
+            continue
+
+        baseline, current = _read_pair(baseline_file, current_file, direction, spec.get("compare", "value"))
+        tolerance = _allowance(spec, baseline)
 
         if direction == "up":
             if current < baseline - tolerance:
@@ -55,6 +96,13 @@ def main() -> int:
                         "suggested_fix": "If the increase is intended, update the baseline (human-only). Otherwise, fix the regression.",
                     }
                 )
+                # Per-module attribution (import-time metrics): name the module responsible.
+                culprit = top_self_increase(
+                    json.loads(baseline_file.read_text(encoding="utf-8")),
+                    json.loads(current_file.read_text(encoding="utf-8")),
+                )
+                if culprit is not None:
+                    findings[-1]["attribution"] = culprit
         else:
             findings.append(
                 {
@@ -66,6 +114,10 @@ def main() -> int:
                 }
             )
 
+    if not args.json:
+        for s in skipped:
+            print(f"[ratchet] SKIP optional {s}")
+
     if findings:
         if args.json:
             print(json.dumps(findings, indent=2, sort_keys=True))
@@ -81,6 +133,12 @@ def main() -> int:
             print(
                 f"[ratchet] FAIL error_code={code} metric={metric} direction={direction} baseline={baseline} current={current} tol={tol}"
             )
+            culprit = f.get("attribution")
+            if culprit:
+                print(
+                    f"[ratchet]   top_self_increase module={culprit['module']} delta_ms={culprit['delta_ms']} "
+                    f"baseline_self_ms={culprit['baseline_self_ms']} current_self_ms={culprit['current_self_ms']}"
+                )
         return 1
 
     if args.json:
@@ -21,6 +21,9 @@ def main() -> int:
     for name, spec in ratchets.items():
         src = Path(spec["current_file"])
         dst = Path(spec["baseline_file"])
+        if not src.exists() and spec.get("optional"):
+            print(f"[ratchet] baseline_skipped metric={name} missing={src}")
+            continue
         dst.parent.mkdir(parents=True, exist_ok=True)
         shutil.copyfile(src, dst)
         print(f"[ratchet] baseline_updated metric={name} file={dst}")
@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import IO, Iterator
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from core.metrics.bench import percentile  # noqa: E402
+from core.prep.render import (  # noqa: E402
+    DEFAULT_VOLATILE_FIELDS,
+    CompiledTemplate,
+    compile_template,
+    doc_sync_variables,
+    render,
+    stable_first,
+)
+
+# A context's own ``template_path`` must point in here; contexts are data and may
+# not name arbitrary files to read.
+TEMPLATE_DIR = Path(__file__).resolve().parents[1] / "templates"
+
+# Per-process template cache: each worker reads and compiles a template once, no
+# matter how many contexts reference it.
+_TEMPLATES: dict[str, CompiledTemplate] = {}
+_DEFAULTS = {"full": "", "delta": ""}
+_VOLATILE: frozenset[str] | None = None
+
+
+def _init_worker(
+    defaults: dict[str, str], preloaded: dict[str, CompiledTemplate], volatile: frozenset[str] | None
+) -> None:
+    global _VOLATILE
+    _DEFAULTS.update(defaults)
+    _VOLATILE = volatile
+    _TEMPLATES.update(preloaded)
+
+
+def _load_template(path: str, volatile: frozenset[str] | None) -> CompiledTemplate:
+    text = Path(path).read_text(encoding="utf-8")
+    return compile_template(stable_first(text, volatile) if volatile is not None else text)
+
+
+def _template(path: str) -> CompiledTemplate:
+    compiled = _TEMPLATES.get(path)
+    if compiled is None:
+        compiled = _load_template(path, _VOLATILE)
+        _TEMPLATES[path] = compiled
+    return compiled
+
+
+def _template_path(context: dict) -> str:
+    """The context's ``template_path`` (only under TEMPLATE_DIR), else the default for its mode."""
+
+    own = context.get("template_path")
+    if not own:
+        return _DEFAULTS["delta" if context.get("mode") == "delta" else "full"]
+    if not Path(own).resolve().is_relative_to(TEMPLATE_DIR):
+        raise ValueError(f"template_path must be under {TEMPLATE_DIR}: {own}")
+    return own
+
+
+def _render_one(index: int, line: str) -> dict:
+    t0 = time.perf_counter()
+    try:
+        context = json.loads(line)
+        template_path = _template_path(context)
+        rendered = render(_template(template_path), doc_sync_variables(context))
+        record: dict = {
+            "index": index,
+            "task_id": context.get("task_id", ""),
+            "target_file": context.get("target_file", ""),
+            "template": template_path,
+            "request": rendered.rstrip() + "\n",
+        }
+    except Exception as e:  # reported per item; one bad line must not sink the batch
+        record = {"index": index, "error": f"{type(e).__name__}: {e}"}
+    record["latency_ms"] = round((time.perf_counter() - t0) * 1000, 3)
+    return record
+
+
+def _render_chunk(chunk: list[tuple[int, str]]) -> list[dict]:
+    return [_render_one(i, line) for i, line in chunk]
+
+
+def _chunks(lines: IO[str], size: int) -> Iterator[list[tuple[int, str]]]:
+    chunk: list[tuple[int, str]] = []
+    index = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        chunk.append((index, line))
+        index += 1
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Render many doc-sync requests: JSONL contexts in, JSONL requests out."
+    )
+    parser.add_argument("--contexts", default="-", help="JSONL context objects ('-' for stdin)")
+    parser.add_argument(
+        "--template",
+        type=Path,
+        default=Path("factory/templates/doc_sync_diff_request.txt"),
+        help="Template for full-mode contexts (a context's 'template_path' under factory/templates/ overrides it)",
+    )
+    parser.add_argument(
+        "--delta-template",
+        type=Path,
+        default=Path("factory/templates/doc_sync_delta_request.txt"),
+        help="Template for contexts built with --mode delta",
+    )
+    parser.add_argument("--out", default="-", help="JSONL output path ('-' for stdout)")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes (0 renders in this process)",
+    )
+    parser.add_argument("--chunk-size", type=int, default=256, help="Contexts per worker task")
+    parser.add_argument(
+        "--layout",
+        choices=["template", "stable-first"],
+        default="template",
+        help="stable-first: static template text first, volatile fields last",
+    )
+    parser.add_argument(
+        "--volatile",
+        default=",".join(sorted(DEFAULT_VOLATILE_FIELDS)),
+        help="Comma-separated fields treated as volatile by --layout stable-first",
+    )
+    args = parser.parse_args()
+
+    volatile = None
+    if args.layout == "stable-first":
+        volatile = frozenset(f.strip() for f in args.volatile.split(",") if f.strip())
+    defaults = {"full": str(args.template), "delta": str(args.delta_template)}
+    preloaded = {path: _load_template(path, volatile) for path in set(defaults.values())}
+
+    src = sys.stdin if args.contexts == "-" else open(args.contexts, encoding="utf-8")
+    dst = sys.stdout if args.out == "-" else open(args.out, "w", encoding="utf-8")
+
+    latencies: list[float] = []
+    failed = 0
+
+    def write(records: list[dict]) -> None:
+        nonlocal failed
+        for r in records:
+            latencies.append(r["latency_ms"])
+            if "error" in r:
+                failed += 1
+            dst.write(json.dumps(r, sort_keys=True) + "\n")
+
+    t0 = time.perf_counter()
+    try:
+        if args.workers <= 0:
+            _init_worker(defaults, preloaded, volatile)
+            for chunk in _chunks(src, args.chunk_size):
+                write(_render_chunk(chunk))
+        else:
+            # Bounded window of in-flight chunks: input is streamed, never slurped, and
+            # output keeps input order.
+            window = args.workers * 4
+            pending: deque[Future] = deque()
+            with ProcessPoolExecutor(
+                max_workers=args.workers,
+                initializer=_init_worker,
+                initargs=(defaults, preloaded, volatile),
+            ) as pool:
+                for chunk in _chunks(src, args.chunk_size):
+                    pending.append(pool.submit(_render_chunk, chunk))
+                    if len(pending) >= window:
+                        write(pending.popleft().result())
+                while pending:
+                    write(pending.popleft().result())
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if dst is not sys.stdout:
+            dst.close()
+    wall = time.perf_counter() - t0
+
+    latencies.sort()
+    n = len(latencies)
+    print(
+        f"[batch] items={n} failed={failed} workers={args.workers} wall_s={wall:.3f} "
+        f"throughput={n / wall if wall else 0.0:.1f}/s "
+        f"latency_ms p50={percentile(latencies, 0.50):.3f} p95={percentile(latencies, 0.95):.3f} "
+        f"p99={percentile(latencies, 0.99):.3f} max={latencies[-1] if latencies else 0.0:.3f}",
+        file=sys.stderr,
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,28 +2,52 @@ from __future__ import annotations
 
 import argparse
 import json
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from core.prep.render import (  # noqa: E402
+    DEFAULT_VOLATILE_FIELDS,
+    compile_template,
+    doc_sync_variables,
+    render,
+    stable_first,
+)
+
 
 def main() -> int:
     parser = argparse.ArgumentParser(description="Render a diff-only request from template + context.")
     parser.add_argument("--context", type=Path, required=True, help="Context JSON")
     parser.add_argument("--template", type=Path, required=True, help="Template text")
+    parser.add_argument(
+        "--delta-template",
+        type=Path,
+        default=None,
+        help="Template to use instead when the context was built with --mode delta",
+    )
+    parser.add_argument(
+        "--layout",
+        choices=["template", "stable-first"],
+        default="template",
+        help="stable-first: move paragraphs with volatile fields after the static text (prefix-cache friendly)",
+    )
+    parser.add_argument(
+        "--volatile",
+        default=",".join(sorted(DEFAULT_VOLATILE_FIELDS)),
+        help="Comma-separated fields treated as volatile by --layout stable-first",
+    )
     args = parser.parse_args()
 
     context = json.loads(args.context.read_text(encoding="utf-8"))
-    template = args.template.read_text(encoding="utf-8")
-
-    signatures = context.get("extracted_signatures", [])
-    signatures_block = "\n".join(f"- `{s}`" for s in signatures)
-
-    rendered = template.format(
-        task_id=context.get("task_id", ""),
-        target_file=context.get("target_file", ""),
-        allowed_heading=context.get("allowed_heading", ""),
-        signatures_block=signatures_block,
-        current_block=context.get("current_block", "").rstrip(),
-    )
+    template_path = args.template
+    if context.get("mode") == "delta" and args.delta_template is not None:
+        template_path = args.delta_template
+    template = template_path.read_text(encoding="utf-8")
+    if args.layout == "stable-first":
+        template = stable_first(template, {f.strip() for f in args.volatile.split(",") if f.strip()})
+
+    rendered = render(compile_template(template), doc_sync_variables(context))
 
     print(rendered.rstrip() + "\n")
     return 0
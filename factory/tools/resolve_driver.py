@@ -2,38 +2,74 @@ from __future__ import annotations
 
 import argparse
 import json
+import sys
+import time
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
-def _detect_language(target: Path) -> str:
-    path = target
-    if path.is_file():
-        path = path.parent
+from core.drivers import MarkerIndex, load_registry, resolve  # noqa: E402
 
-    for parent in [path] + list(path.parents):
-        if (parent / "pyproject.toml").exists() or (parent / "requirements.txt").exists():
-            return "python"
-        if (parent / "package.json").exists():
-            return "javascript"
-    return "python"  # conservative default for this demo repo
+
+def _targets(source: str):
+    stream = sys.stdin if source == "-" else open(source, encoding="utf-8")
+    try:
+        for line in stream:
+            target = line.strip()
+            if target and not target.startswith("#"):
+                yield target
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def _batch(args: argparse.Namespace, compiled: dict, index: MarkerIndex) -> int:
+    t0 = time.perf_counter()
+    resolved = failed = 0
+    out = sys.stdout
+    try:
+        for target in _targets(args.batch):
+            record = resolve(compiled, index, args.action, target)
+            if "error" in record:
+                failed += 1
+            else:
+                resolved += 1
+            out.write(json.dumps(record) + "\n")
+    except OSError as e:
+        print(f"[driver] FAIL {e}", file=sys.stderr)
+        return 1
+    out.flush()
+    print(
+        f"[driver] targets={resolved + failed} resolved={resolved} failed={failed} "
+        f"dirs_probed={index.probes} elapsed_s={time.perf_counter() - t0:.3f}",
+        file=sys.stderr,
+    )
+    return 1 if failed else 0
 
 
 def main() -> int:
     parser = argparse.ArgumentParser(description="Resolve an action to a concrete command via deterministic identity.")
     parser.add_argument("--registry", type=Path, default=Path("drivers/registry.json"))
     parser.add_argument("--action", default="run_tests")
-    parser.add_argument("--target", type=Path, required=True)
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--target", type=Path)
+    target.add_argument(
+        "--batch",
+        metavar="FILE",
+        help="Read one target per line from FILE ('-' for stdin) and stream JSONL records",
+    )
     args = parser.parse_args()
 
-    registry = json.loads(args.registry.read_text(encoding="utf-8"))
-    language = _detect_language(args.target)
-
-    for rule in registry.get(args.action, []):
-        if rule.get("match", {}).get("language") == language:
-            print(json.dumps({"action": args.action, "language": language, "cmd": rule.get("cmd")}, indent=2))
-            return 0
+    compiled = load_registry(args.registry)
+    index = MarkerIndex()
+    if args.batch is not None:
+        return _batch(args, compiled, index)
 
-    raise SystemExit(f"no driver for action={args.action} language={language}")
+    record = resolve(compiled, index, args.action, args.target)
+    if "error" in record:
+        raise SystemExit(record["error"])
+    print(json.dumps({"action": record["action"], "language": record["language"], "cmd": record["cmd"]}, indent=2))
+    return 0
 
 
 if __name__ == "__main__":
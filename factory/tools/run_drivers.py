@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from core.drivers import MarkerIndex, load_registry, resolve  # noqa: E402
+from core.runners.validators import HARD_FAILURES, critical_path, run_validators, summarize  # noqa: E402
+
+DEFAULT_SERVICES = Path("examples/polyglot/services")
+
+
+def _print_result(r: dict) -> None:
+    print(
+        f"driver={r['name']} status={r['status']} returncode={r['returncode']} "
+        f"started_s={r['started_s']} duration_s={r['duration_s']} cmd={r['cmd']!r}",
+        flush=True,
+    )
+    if r["status"] in HARD_FAILURES:
+        tail = (r["stdout"] + r["stderr"]).strip()[-500:]
+        if tail:
+            print("  " + tail.replace("\n", "\n  "), flush=True)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Resolve a driver per service and run them concurrently (per-job timeouts, streamed results)."
+    )
+    parser.add_argument(
+        "services",
+        nargs="*",
+        type=Path,
+        help=f"Service directories (default: every directory under {DEFAULT_SERVICES})",
+    )
+    parser.add_argument("--registry", type=Path, default=Path("drivers/registry.json"))
+    parser.add_argument("--action", default="run_tests")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=min(32, (os.cpu_count() or 1) + 4),
+        help="Drivers run at once (drivers mostly wait on subprocesses)",
+    )
+    parser.add_argument("--timeout", type=float, default=600.0, help="Per-driver timeout in seconds")
+    parser.add_argument("--json", action="store_true", help="Emit results (with captured output) as JSON")
+    args = parser.parse_args()
+
+    services = args.services or sorted(p for p in DEFAULT_SERVICES.iterdir() if p.is_dir())
+    if not services:
+        print("[drivers] no services to run")
+        return 0
+
+    compiled = load_registry(args.registry)
+    index = MarkerIndex()
+    jobs: list[dict] = []
+    unresolved: list[dict] = []
+    for service in services:
+        record = resolve(compiled, index, args.action, service)
+        if "error" in record:
+            unresolved.append(
+                {
+                    "name": str(service),
+                    "cmd": "",
+                    "required": True,
+                    "status": "error",
+                    "returncode": None,
+                    "started_s": 0.0,
+                    "duration_s": 0.0,
+                    "stdout": "",
+                    "stderr": record["error"],
+                }
+            )
+        else:
+            jobs.append({"name": str(service), "cmd": record["cmd"], "cwd": str(service), "language": record["language"]})
+
+    stream = None if args.json else _print_result
+    for r in unresolved:
+        if stream is not None:
+            stream(r)
+
+    t0 = time.perf_counter()
+    results = run_validators(jobs, timeout_s=args.timeout, jobs=max(1, args.jobs), on_result=stream)
+    for job, r in zip(jobs, results):
+        r["language"] = job["language"]
+    results = unresolved + results
+    summary = summarize(results, time.perf_counter() - t0)
+    summary["critical_path"], summary["critical_path_s"] = critical_path(results)
+
+    if args.json:
+        print(json.dumps({"summary": summary, "results": results}, indent=2, sort_keys=True))
+    else:
+        counts = "".join(f" {k}={v}" for k, v in sorted(summary["counts"].items()))
+        print(
+            f"[drivers] action={args.action} services={summary['validators']}{counts} jobs={max(1, args.jobs)} "
+            f"wall_s={summary['wall_s']} serial_s={summary['serial_s']} slowest={summary['slowest']}"
+        )
+        print(
+            f"[drivers] critical_path={' -> '.join(summary['critical_path'])} "
+            f"critical_path_s={summary['critical_path_s']}"
+        )
+        print(f"[drivers] {'PASS' if summary['ok'] else 'FAIL'}")
+    return 0 if summary["ok"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shlex
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from core.missions.loader import MISSION_SUFFIXES, discover_missions, load_mission  # noqa: E402
+from core.missions.scheduler import Snapshot, components, protected_violations, write_set  # noqa: E402
+from core.runners.validators import HARD_FAILURES, run_validators  # noqa: E402
+
+
+def _run_cmd(cmd: str, timeout: float | None, cwd: Path | None = None) -> tuple[int | None, str]:
+    try:
+        p = subprocess.run(shlex.split(cmd), capture_output=True, text=True, timeout=timeout, cwd=cwd)
+    except subprocess.TimeoutExpired:
+        return None, f"timed out after {timeout}s"
+    except OSError as e:
+        return 127, str(e)
+    return p.returncode, (p.stdout + p.stderr).strip()
+
+
+def run_mission(path: Path, mission: dict, others: list[str] | None = None, root: Path = Path(".")) -> dict:
+    """Effector -> budget/protection checks -> validators; roll back on failure.
+
+    ``others`` are the write sets of missions that may run at the same time;
+    any other change outside this mission's write set fails it.
+    """
+
+    t0 = time.perf_counter()
+    budgets = mission.get("budgets") or {}
+    result: dict = {
+        "mission_id": str(mission.get("mission_id", path.stem)),
+        "path": str(path),
+        "files_changed": 0,
+        "lines_changed": 0,
+    }
+    snapshot = Snapshot(
+        write_set(mission),
+        root,
+        guard_tree=True,
+        others=others,
+        protected=list((mission.get("scope") or {}).get("protected_paths") or []),
+    )
+
+    def finish(status: str, detail: str = "") -> dict:
+        if status != "passed":
+            left = snapshot.restore()
+            if left:
+                result["not_restored"] = left
+        result["status"] = status
+        if detail:
+            result["detail"] = detail
+        result["duration_s"] = round(time.perf_counter() - t0, 4)
+        return result
+
+    effector_cmd = (mission.get("effector") or {}).get("cmd")
+    if effector_cmd:
+        rc, output = _run_cmd(effector_cmd, budgets.get("max_wall_seconds"), cwd=root)
+        if rc != 0:
+            return finish("effector_failed", output[-500:])
+
+    changed, lines = snapshot.changes()
+    stray = snapshot.outside_changes()
+    result["files_changed"] = len(changed) + len(stray)
+    result["lines_changed"] = lines
+    protected = protected_violations(changed + stray, mission)
+    if protected:
+        return finish("protected_path_violation", ", ".join(protected))
+    if stray:
+        return finish("out_of_scope_write", ", ".join(stray))
+    max_files = budgets.get("max_files_changed")
+    if max_files is not None and len(changed) > max_files:
+        return finish("budget_exceeded", f"files_changed={len(changed)} > max_files_changed={max_files}")
+    max_lines = budgets.get("max_lines_changed")
+    if max_lines is not None and lines > max_lines:
+        return finish("budget_exceeded", f"lines_changed={lines} > max_lines_changed={max_lines}")
+
+    validations = run_validators(
+        [dict(v, cwd=v.get("cwd", str(root))) for v in mission.get("validators") or []],
+        timeout_s=budgets.get("max_wall_seconds"),
+        fail_fast=True,
+    )
+    result["validators"] = [
+        {k: v[k] for k in ("name", "status", "started_s", "duration_s")} for v in validations
+    ]
+    for v in validations:
+        if v["required"] and v["status"] in HARD_FAILURES:
+            output = (v["stdout"] + v["stderr"]).strip()
+            return finish("validator_failed", f"{v['name']} ({v['status']}): {output[-500:]}")
+
+    return finish("passed")
+
+
+def _collect(paths: list[Path]) -> list[Path]:
+    out: list[Path] = []
+    for p in paths:
+        if p.is_dir():
+            out.extend(discover_missions(p))
+        elif p.suffix in MISSION_SUFFIXES:
+            out.append(p)
+    return out
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Run many Mission Objects: disjoint write sets in parallel, overlapping ones in sequence."
+    )
+    parser.add_argument(
+        "missions",
+        nargs="*",
+        type=Path,
+        help="Mission files or directories (default: top-level missions/*.json|yaml)",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=min(32, (os.cpu_count() or 1) + 4),
+        help="Conflict groups run at once (missions mostly wait on subprocesses)",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Print the schedule without running")
+    parser.add_argument("--json", action="store_true", help="Emit the report as JSON")
+    args = parser.parse_args()
+
+    if args.missions:
+        paths = _collect(args.missions)
+    else:
+        paths = sorted(p for p in Path("missions").glob("*") if p.is_file() and p.suffix in MISSION_SUFFIXES)
+
+    loaded: list[tuple[Path, dict]] = []
+    for p in paths:
+        try:
+            loaded.append((p, load_mission(p)))
+        except Exception as e:
+            print(f"[missions] FAIL {p}: {e}", file=sys.stderr)
+            return 1
+    if not loaded:
+        print("[missions] no missions to run")
+        return 0
+
+    groups = components([m for _, m in loaded])
+    if not args.json or args.dry_run:
+        for gi, group in enumerate(groups, start=1):
+            ids = ",".join(str(loaded[i][1].get("mission_id", loaded[i][0].stem)) for i in group)
+            print(f"[missions] group={gi} size={len(group)} order={ids}")
+    if args.dry_run:
+        return 0
+
+    write_sets = [write_set(m) for _, m in loaded]
+
+    def run_group(group: list[int]) -> list[dict]:
+        # Missions in a group touch overlapping files: strictly one after another.
+        members = set(group)
+        others = [p for j, ws in enumerate(write_sets) if j not in members for p in ws]
+        return [run_mission(*loaded[i], others=others) for i in group]
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+        group_results = list(pool.map(run_group, groups))
+    wall = time.perf_counter() - t0
+
+    results = [r for rs in group_results for r in rs]
+    group_times = [sum(r["duration_s"] for r in rs) for rs in group_results]
+    critical = max(range(len(groups)), key=lambda g: group_times[g])
+    failed = [r for r in results if r["status"] != "passed"]
+    summary = {
+        "missions": len(results),
+        "passed": len(results) - len(failed),
+        "failed": len(failed),
+        "groups": len(groups),
+        "wall_s": round(wall, 4),
+        "throughput_per_s": round(len(results) / wall, 2) if wall else 0.0,
+        "serial_s": round(sum(group_times), 4),
+        "critical_path": [r["mission_id"] for r in group_results[critical]],
+        "critical_path_s": round(group_times[critical], 4),
+    }
+
+    if args.json:
+        print(json.dumps({"summary": summary, "results": results}, indent=2, sort_keys=True))
+    else:
+        for r in results:
+            line = (
+                f"mission={r['mission_id']} status={r['status']} files_changed={r['files_changed']} "
+                f"lines_changed={r['lines_changed']} duration_s={r['duration_s']}"
+            )
+            line += f" detail={r['detail']!r}" if "detail" in r else ""
+            line += f" not_restored={','.join(r['not_restored'])}" if "not_restored" in r else ""
+            print(line)
+        print(
+            f"[missions] ran={summary['missions']} passed={summary['passed']} failed={summary['failed']} "
+            f"groups={summary['groups']} wall_s={summary['wall_s']} serial_s={summary['serial_s']} "
+            f"throughput={summary['throughput_per_s']}/s"
+        )
+        print(
+            f"[missions] critical_path={' -> '.join(summary['critical_path'])} "
+            f"critical_path_s={summary['critical_path_s']}"
+        )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
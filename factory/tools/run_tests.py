@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from core.metrics import history  # noqa: E402
+from core.metrics.coverage import LineCoverage  # noqa: E402
+from core.runners.sharded_tests import DEFAULT_TIMINGS, TimingStore, run_sharded, was_successful  # noqa: E402
+
+
+def _run_suite(start_dir: str, verbosity: int) -> bool:
+    suite = unittest.defaultTestLoader.discover(start_dir)
+    result = unittest.TextTestRunner(verbosity=verbosity).run(suite)
+    return result.wasSuccessful()
+
+
+def _no_tests(merged: dict) -> bool:
+    # unittest reports "NO TESTS RAN" (and exits 5) from Python 3.12 on; older versions say OK.
+    return sys.version_info >= (3, 12) and merged["run"] == 0 and not merged["skipped"]
+
+
+def _report(merged: dict) -> None:
+    # The same layout as unittest.TextTestRunner, for the merged shards.
+    out = sys.stderr
+    out.write("\n")
+    for flavour, items in (("ERROR", merged["errors"]), ("FAIL", merged["failures"])):
+        for desc, tb in items:
+            out.write("=" * 70 + f"\n{flavour}: {desc}\n" + "-" * 70 + f"\n{tb}\n")
+    out.write("-" * 70 + f"\nRan {merged['run']} test{'s' if merged['run'] != 1 else ''} in {merged['wall_s']:.3f}s\n\n")
+    infos = []
+    if merged["failures"]:
+        infos.append(f"failures={len(merged['failures'])}")
+    if merged["errors"]:
+        infos.append(f"errors={len(merged['errors'])}")
+    if merged["skipped"]:
+        infos.append(f"skipped={merged['skipped']}")
+    if merged["expected_failures"]:
+        infos.append(f"expected failures={merged['expected_failures']}")
+    if merged["unexpected_successes"]:
+        infos.append(f"unexpected successes={len(merged['unexpected_successes'])}")
+    status = "OK" if was_successful(merged) else "FAILED"
+    if _no_tests(merged):
+        status = "NO TESTS RAN"
+    out.write(status + (f" ({', '.join(infos)})" if infos else "") + "\n")
+
+
+def _run_parallel(args: argparse.Namespace, verbosity: int) -> int:
+    timings = TimingStore(None if args.no_timings else args.timings)
+    jobs = max(1, args.jobs or os.cpu_count() or 1)
+    merged = run_sharded(
+        args.start_dir,
+        jobs,
+        timings,
+        verbosity=verbosity,
+        on_shard=lambda r: (sys.stderr.write(r["output"]), sys.stderr.flush()),
+    )
+    _report(merged)
+    print(
+        f"[test] modules={merged['modules']} shards={merged['shards']} jobs={jobs} "
+        f"predicted_s={merged['predicted_s']} slowest_shard_s={merged['slowest_shard_s']} "
+        f"serial_s={merged['serial_s']} wall_s={merged['wall_s']}",
+        file=sys.stderr,
+    )
+    # unittest's exit codes: 1 on failure; 5 when nothing ran (3.12+ only, as there).
+    if _no_tests(merged):
+        return 5
+    return 0 if was_successful(merged) else 1
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run the unit tests (stdlib unittest), optionally measuring line coverage.")
+    parser.add_argument("--start-dir", default="tests")
+    parser.add_argument("--coverage", action="store_true", help="Measure line coverage of --source")
+    parser.add_argument(
+        "--source",
+        action="append",
+        type=Path,
+        default=None,
+        help="Package/dir to measure (repeatable; default: core, product/src)",
+    )
+    parser.add_argument("--out-dir", type=Path, default=Path(".metrics/current"))
+    parser.add_argument("--history", type=Path, default=history.DEFAULT_PATH, help="Append-only metric history (SQLite)")
+    parser.add_argument("--no-history", action="store_true")
+    parser.add_argument("--top", type=int, default=5, help="Least-covered files to list")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Worker processes; test modules are sharded longest-first by recorded durations (default: CPU count)",
+    )
+    parser.add_argument(
+        "--timings",
+        type=Path,
+        default=DEFAULT_TIMINGS,
+        help="Per-test durations from the last run, used to balance shards",
+    )
+    parser.add_argument("--no-timings", action="store_true")
+    parser.add_argument("-q", "--quiet", action="store_true")
+    args = parser.parse_args()
+
+    verbosity = 1 if args.quiet else 2
+    if not args.coverage:
+        return _run_parallel(args, verbosity)
+
+    # Coverage is collected in this process, so the suite runs serially here.
+    sources = args.source or [Path("core"), Path("product/src")]
+    cov = LineCoverage(sources)
+    t0 = time.perf_counter()
+    # Started before discovery so module-level lines run at import time are counted.
+    cov.start()
+    try:
+        ok = _run_suite(args.start_dir, verbosity)
+    finally:
+        cov.stop()
+    elapsed = time.perf_counter() - t0
+
+    report = cov.report()
+    args.out_dir.mkdir(parents=True, exist_ok=True)
+    (args.out_dir / "coverage.json").write_text(json.dumps(report, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    (args.out_dir / "line_coverage.json").write_text(
+        json.dumps(
+            {
+                "value": report["line_coverage"],
+                "covered": report["covered"],
+                "lines": report["lines"],
+                "backend": report["backend"],
+            },
+            indent=2,
+            sort_keys=True,
+        )
+        + "\n",
+        encoding="utf-8",
+    )
+
+    if not args.no_history:
+        if history.record(args.history, {"line_coverage": report["line_coverage"]}, source="coverage") is None:
+            print("[coverage] history not recorded: uncommitted changes", file=sys.stderr)
+
+    print(
+        f"[coverage] backend={report['backend']} line_coverage={report['line_coverage']}% "
+        f"covered={report['covered']}/{report['lines']} files={len(report['files'])} elapsed_s={elapsed:.3f}",
+        file=sys.stderr,
+    )
+    least = sorted(
+        (f for f in report["files"].items() if f[1]["lines"]),
+        key=lambda kv: kv[1]["covered"] / kv[1]["lines"],
+    )[: args.top]
+    for rel, f in least:
+        print(f"  {100.0 * f['covered'] / f['lines']:.1f}% {f['covered']}/{f['lines']} {rel}", file=sys.stderr)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
 import argparse
-import json
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from core.graph.snapshot import find_neighborhood  # noqa: E402
+
 
 def _read(path: Path) -> str:
     return path.read_text(encoding="utf-8").rstrip() + "\n"
@@ -11,21 +15,20 @@ def _read(path: Path) -> str:
 
 def main() -> int:
     parser = argparse.ArgumentParser(description="Emit a tiny slice packet from a context graph snapshot (demo).")
-    parser.add_argument("--graph", type=Path, required=True)
+    parser.add_argument("--graph", type=Path, required=True, help="Snapshot (.json or streamed .ndjson)")
     parser.add_argument("--anchor", required=True, help="Node id, e.g. path/to/file.py:test_name")
     parser.add_argument("--out", type=Path, required=True)
     args = parser.parse_args()
 
-    graph = json.loads(args.graph.read_text(encoding="utf-8"))
-    nodes = {n["id"]: n for n in graph.get("nodes", [])}
-
-    if args.anchor not in nodes:
+    # NDJSON snapshots are read lazily and only up to the anchor's neighborhood.
+    neighborhood = find_neighborhood(args.graph, args.anchor)
+    if neighborhood is None:
         raise SystemExit(f"anchor not found in graph: {args.anchor}")
 
     anchor_id = args.anchor
     anchor_path = Path(anchor_id.split(":", 1)[0])
 
-    root = Path(graph.get("root", "."))
+    root = Path(neighborhood["root"])
 
     map_paths: list[Path] = []
     terrain_paths: list[Path] = []
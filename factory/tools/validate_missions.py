@@ -1,123 +1,14 @@
 from __future__ import annotations
 
 import argparse
-import json
-import re
 import sys
+import time
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
-def _parse_scalar(text: str) -> object:
-    t = text.strip()
-    if t.startswith('"') and t.endswith('"') and len(t) >= 2:
-        return t[1:-1]
-    if t.startswith("'") and t.endswith("'") and len(t) >= 2:
-        return t[1:-1]
-    if t.lower() in {"true", "false"}:
-        return t.lower() == "true"
-    if re.fullmatch(r"-?\d+", t):
-        return int(t)
-    if re.fullmatch(r"-?\d+\.\d+", t):
-        return float(t)
-    return t
-
-
-def _yaml_minimal_load(text: str) -> object:
-    lines = []
-    for raw in text.splitlines():
-        if not raw.strip():
-            continue
-        if raw.lstrip().startswith("#"):
-            continue
-        lines.append(raw.rstrip("\n"))
-
-    def parse_block(i: int, indent: int) -> tuple[object, int]:
-        # Find the first line at this indent to decide list vs dict.
-        j = i
-        while j < len(lines):
-            if len(lines[j]) - len(lines[j].lstrip(" ")) < indent:
-                return {}, j
-            if lines[j].strip():
-                break
-            j += 1
-        if j >= len(lines):
-            return {}, j
-
-        is_list = lines[j].startswith(" " * indent + "- ")
-        if is_list:
-            out: list[object] = []
-            while j < len(lines):
-                cur_indent = len(lines[j]) - len(lines[j].lstrip(" "))
-                if cur_indent < indent:
-                    break
-                if not lines[j].startswith(" " * indent + "- "):
-                    break
-                item_text = lines[j][indent + 2 :].strip()
-                j += 1
-                if item_text == "":
-                    item, j = parse_block(j, indent + 2)
-                    out.append(item)
-                    continue
-                if ":" in item_text and not item_text.startswith(("'", '"')):
-                    k, v = item_text.split(":", 1)
-                    k = k.strip()
-                    v = v.strip()
-                    if v == "":
-                        nested, j = parse_block(j, indent + 4)
-                        out.append({k: nested})
-                    else:
-                        out.append({k: _parse_scalar(v)})
-                    continue
-                out.append(_parse_scalar(item_text))
-            return out, j
-
-        out_dict: dict[str, object] = {}
-        while j < len(lines):
-            cur_indent = len(lines[j]) - len(lines[j].lstrip(" "))
-            if cur_indent < indent:
-                break
-            if cur_indent != indent:
-                raise ValueError(f"unexpected indentation: {lines[j]!r}")
-
-            line = lines[j].strip()
-            if ":" not in line:
-                raise ValueError(f"expected key: value, got: {line!r}")
-            key, rest = line.split(":", 1)
-            key = key.strip()
-            rest = rest.strip()
-            j += 1
-
-            if rest == "":
-                val, j = parse_block(j, indent + 2)
-                out_dict[key] = val
-            else:
-                out_dict[key] = _parse_scalar(rest)
-        return out_dict, j
-
-    obj, _ = parse_block(0, 0)
-    return obj
-
-
-def _load_mission(path: Path) -> dict[str, object]:
-    if path.suffix in {".json"}:
-        return json.loads(path.read_text(encoding="utf-8"))
-
-    if path.suffix in {".yaml", ".yml"}:
-        try:
-            import yaml  # type: ignore
-        except Exception:  # pragma: no cover
-            yaml = None
-
-        if yaml is not None:
-            loaded = yaml.safe_load(path.read_text(encoding="utf-8"))
-        else:
-            loaded = _yaml_minimal_load(path.read_text(encoding="utf-8"))
-
-        if not isinstance(loaded, dict):
-            raise ValueError("mission YAML must be a mapping at root")
-        return loaded
-
-    raise ValueError(f"unsupported mission format: {path}")
+from core.inventory import inventory  # noqa: E402
+from core.missions.schema import MissionCache, load_schema, validate_files  # noqa: E402
 
 
 def _require_str(obj: dict[str, object], key: str, where: str) -> str:
@@ -138,6 +29,14 @@ def main() -> int:
     parser = argparse.ArgumentParser(description="Validate Mission Object templates (stdlib-only).")
     parser.add_argument("--root", type=Path, default=Path("missions/templates"))
     parser.add_argument("--schema", type=Path, default=Path("missions/schema/mission.schema.json"))
+    parser.add_argument(
+        "--cache",
+        type=Path,
+        default=Path(".sdac/mission-cache.json"),
+        help="Parsed missions and schema errors keyed by content hash",
+    )
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("--workers", type=int, default=None, help="Parse/validate processes (default: CPU count)")
     args = parser.parse_args()
 
     mission_dir = args.root.parent if args.root.name == "templates" else Path("missions")
@@ -147,21 +46,36 @@ def main() -> int:
         for p in mission_dir.glob("*.json")
         if p.is_file() and p.name != "mission.schema.json"
     )
-    paths.extend(
-        p for p in args.root.rglob("*") if p.is_file() and p.suffix in {".json", ".yaml", ".yml"}
-    )
+    paths.extend(inventory(args.root).paths({".json", ".yaml", ".yml"}))
     paths = sorted(set(paths))
     if not paths:
         print(f"[missions] no templates found under {args.root}")
         return 0
 
+    t0 = time.perf_counter()
+    try:
+        schema, schema_hash = load_schema(args.schema)
+    except (OSError, ValueError) as e:
+        print(f"[missions] FAIL {args.schema}: {e}", file=sys.stderr)
+        return 1
+    cache = MissionCache(None if args.no_cache else args.cache, schema_hash)
+    try:
+        checked = validate_files(paths, schema, cache, workers=args.workers)
+    except ValueError as e:  # schema uses keywords the stdlib validator does not implement
+        print(f"[missions] FAIL {args.schema}: {e}", file=sys.stderr)
+        return 1
+    cache.save()
+
     errors: list[str] = []
     seen_ids: dict[str, Path] = {}
 
-    for p in paths:
+    for p, entry in zip(paths, checked):
         where = str(p)
+        if entry["errors"]:
+            errors.extend(f"{where}: {e}" for e in entry["errors"])
+            continue
         try:
-            mission = _load_mission(p)
+            mission = entry["mission"]
             mid = _require_str(mission, "mission_id", where)
             _require_str(mission, "goal", where)
             scope = _require_dict(mission, "scope", where)
@@ -189,7 +103,10 @@ def main() -> int:
             print(f"[missions] FAIL {e}", file=sys.stderr)
         return 1
 
-    print(f"[missions] PASS templates={len(paths)} schema={args.schema}")
+    print(
+        f"[missions] PASS templates={len(paths)} schema={args.schema} cached={cache.hits} "
+        f"parsed={cache.misses} wall_s={time.perf_counter() - t0:.3f}"
+    )
     return 0
 
 
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from core.missions.loader import load_mission  # noqa: E402
+from core.runners.validators import HARD_FAILURES, run_validators, summarize  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Run a Mission's validators concurrently (per-command timeouts, optional fail-fast)."
+    )
+    parser.add_argument("mission", nargs="?", type=Path, default=Path("missions/update_public_interfaces.json"))
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=None,
+        help="Per-validator timeout in seconds (default: validator timeout_s, else budgets.max_wall_seconds)",
+    )
+    parser.add_argument("--fail-fast", action="store_true", help="Kill the rest after the first hard failure")
+    parser.add_argument("--jobs", type=int, default=None, help="Validators run at once (default: all)")
+    parser.add_argument("--json", action="store_true", help="Emit results (with captured output) as JSON")
+    args = parser.parse_args()
+
+    try:
+        mission = load_mission(args.mission)
+    except Exception as e:
+        print(f"[verify] FAIL {args.mission}: {e}", file=sys.stderr)
+        return 1
+
+    validators = mission.get("validators") or []
+    timeout = args.timeout
+    if timeout is None:
+        timeout = (mission.get("budgets") or {}).get("max_wall_seconds")
+
+    t0 = time.perf_counter()
+    results = run_validators(validators, timeout_s=timeout, fail_fast=args.fail_fast, jobs=args.jobs)
+    summary = summarize(results, time.perf_counter() - t0)
+    summary["mission_id"] = str(mission.get("mission_id", args.mission.stem))
+
+    if args.json:
+        print(json.dumps({"summary": summary, "results": results}, indent=2, sort_keys=True))
+    else:
+        for r in results:
+            print(
+                f"validator={r['name']} status={r['status']} returncode={r['returncode']} "
+                f"started_s={r['started_s']} duration_s={r['duration_s']}"
+            )
+            if r["status"] in HARD_FAILURES:
+                tail = (r["stdout"] + r["stderr"]).strip()[-500:]
+                if tail:
+                    print("  " + tail.replace("\n", "\n  "))
+        counts = "".join(f" {k}={v}" for k, v in sorted(summary["counts"].items()))
+        print(
+            f"[verify] mission={summary['mission_id']} validators={summary['validators']}{counts} "
+            f"wall_s={summary['wall_s']} serial_s={summary['serial_s']} slowest={summary['slowest']}"
+        )
+        print(f"[verify] {'PASS' if summary['ok'] else 'FAIL'}")
+    return 0 if summary["ok"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,90 @@
+import argparse
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import aoi.__main__ as cli  # noqa: E402
+
+# Positional arguments a subcommand cannot default.
+REQUIRED = {("graph", "diff"): ["old.json", "new.json"]}
+
+
+def _commands(parser: argparse.ArgumentParser, prefix: tuple[str, ...] = ()):
+    """Every leaf subcommand path, e.g. ("missions", "run")."""
+
+    subparsers = [a for a in parser._actions if isinstance(a, argparse._SubParsersAction)]
+    if prefix and (not subparsers or not subparsers[0].required):
+        yield prefix  # runnable on its own (e.g. ``aoi graph`` builds a snapshot)
+    for action in subparsers:
+        for name, child in action.choices.items():
+            yield from _commands(child, prefix + (name,))
+
+
+class TestCli(unittest.TestCase):
+    def test_every_subcommand_dispatches_to_an_existing_tool(self) -> None:
+        commands = list(_commands(cli.build_parser()))
+        self.assertIn(("dream-scan",), commands)
+        self.assertIn(("missions", "verify"), commands)
+        for command in commands:
+            calls: list[tuple[str, list[str]]] = []
+
+            def fake_run(script_rel: str, argv: list[str]) -> int:
+                calls.append((script_rel, argv))
+                return 0
+
+            with self.subTest(command=" ".join(command)), mock.patch.object(cli, "_run", fake_run), mock.patch.object(
+                Path, "mkdir"
+            ):
+                self.assertEqual(cli.main([*command, *REQUIRED.get(command, [])]), 0)
+                self.assertTrue(calls)
+                for script_rel, argv in calls:
+                    self.assertTrue((ROOT / script_rel).exists(), script_rel)
+                    self.assertTrue(all(isinstance(a, str) for a in argv), argv)
+
+    def test_dream_scan_forwards_hotspot_flags(self) -> None:
+        calls: list[list[str]] = []
+        with mock.patch.object(cli, "_run", lambda script, argv: calls.append(argv) or 0):
+            cli.main(["dream-scan", "--hotspots", "--rev", "HEAD~3", "--since", "1 week ago"])
+        self.assertIn("--rev", calls[0])
+        self.assertEqual(calls[0][calls[0].index("--rev") + 1], "HEAD~3")
+        self.assertIn("--since", calls[0])
+
+    def test_request_commands_forward_layout_flags(self) -> None:
+        calls: list[list[str]] = []
+        with mock.patch.object(cli, "_run", lambda script, argv: calls.append(argv) or 0):
+            cli.main(["request-batch", "--layout", "stable-first", "--volatile", "task_id"])
+            with mock.patch.object(Path, "mkdir"):
+                cli.main(["request", "--layout", "stable-first", "--volatile", "task_id"])
+        for argv in (calls[0], calls[-1]):
+            self.assertEqual(argv[argv.index("--layout") + 1], "stable-first")
+            self.assertEqual(argv[argv.index("--volatile") + 1], "task_id")
+
+    def test_metrics_trend_forwards_ratchet_flags(self) -> None:
+        calls: list[list[str]] = []
+        with mock.patch.object(cli, "_run", lambda script, argv: calls.append(argv) or 0):
+            cli.main(["metrics", "trend", "x_ms", "--tolerance", "2", "--relative-tolerance", "0.1", "--config", "r.json"])
+        argv = calls[0]
+        for flag, value in [("--tolerance", "2.0"), ("--relative-tolerance", "0.1"), ("--config", "r.json")]:
+            self.assertEqual(argv[argv.index(flag) + 1], value)
+
+    def test_graph_query_forwards_index(self) -> None:
+        calls: list[list[str]] = []
+        with mock.patch.object(cli, "_run", lambda script, argv: calls.append(argv) or 0):
+            cli.main(["graph", "query", "--index", "idx.pickle", "--kind", "file"])
+        self.assertEqual(calls[0][calls[0].index("--index") + 1], "idx.pickle")
+
+    def test_ratchet_check_records_history_only_on_request(self) -> None:
+        calls: list[list[str]] = []
+        with mock.patch.object(cli, "_run", lambda script, argv: calls.append(argv) or 0):
+            cli.main(["ratchet-check"])
+            cli.main(["ratchet-check", "--record-history"])
+        self.assertIn("--no-history", calls[0])
+        self.assertNotIn("--no-history", calls[2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+import json
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from core.graph import snapshot  # noqa: E402
+from core.graph.diff import diff_graphs  # noqa: E402
+from core.graph.git_objects import CatFile  # noqa: E402
+
+TOOLS = ROOT / "factory/tools"
+
+
+def _write(root: Path, files: dict[str, str]) -> None:
+    for rel, text in files.items():
+        (root / rel).parent.mkdir(parents=True, exist_ok=True)
+        (root / rel).write_text(text, encoding="utf-8")
+
+
+def _build(root: Path, out: Path, *extra: str, cwd: Path | None = None) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, str(TOOLS / "build_context_graph.py"), "--root", str(root), "--out", str(out), *extra],
+        capture_output=True,
+        text=True,
+        cwd=cwd,
+    )
+
+
+def _git(repo: Path, *args: str) -> None:
+    subprocess.run(["git", "-c", "user.name=t", "-c", "user.email=t@t", "-C", str(repo), *args], check=True, capture_output=True)
+
+
+class TestContextGraph(unittest.TestCase):
+    def test_gitignored_files_are_not_graphed(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp) / "repo"
+            _write(
+                root,
+                {
+                    ".gitignore": "build/\n",
+                    "src/calc.py": "def tax(x):\n    return x\n",
+                    "build/lib/calc.py": "def tax(x):\n    return x\n",
+                    "docs/a.md": "# A\n",
+                },
+            )
+            out = Path(tmp) / "graph.json"
+            proc = _build(root, out, "--no-index")
+            self.assertEqual(proc.returncode, 0, proc.stderr)
+            files = sorted(n["id"] for n in json.loads(out.read_text())["nodes"] if n["kind"] == "file")
+            self.assertEqual(files, [str(root / "docs/a.md"), str(root / "src/calc.py")])
+
+    def test_ndjson_snapshot_streams_and_slices_lazily(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp) / "repo"
+            files = {"src/a_first.py": "def anchor(x):\n    return x\n\n\ndef other():\n    pass\n"}
+            files.update({f"src/m{i:02d}.py": f"import os\n\n\ndef f{i}():\n    pass\n" for i in range(30)})
+            files["docs/rules.md"] = "# Rules\n\n## Tax\n"
+            _write(root, files)
+
+            json_out, nd_out = Path(tmp) / "graph.json", Path(tmp) / "graph.ndjson"
+            for out in (json_out, nd_out):
+                proc = _build(root, out, "--no-index")
+                self.assertEqual(proc.returncode, 0, proc.stderr)
+            self.assertTrue(snapshot.is_ndjson(nd_out))
+            lines = nd_out.read_text(encoding="utf-8").splitlines()
+            self.assertEqual(json.loads(lines[0])["graph"]["format"], "ndjson")
+            self.assertEqual(snapshot.load_graph(nd_out), json.loads(json_out.read_text(encoding="utf-8")))
+            end = json.loads(lines[-1])["end"]
+            graph = snapshot.load_graph(nd_out)
+            self.assertEqual((end["nodes"], end["edges"]), (len(graph["nodes"]), len(graph["edges"])))
+
+            anchor = f"{root / 'src/a_first.py'}:anchor"
+            read: list[str] = []
+            real = snapshot.iter_ndjson
+
+            def counting(path: Path):
+                for kind, payload in real(path):
+                    read.append(kind)
+                    yield kind, payload
+
+            with mock.patch.object(snapshot, "iter_ndjson", counting):
+                found = snapshot.find_neighborhood(nd_out, anchor)
+            self.assertEqual(found["node"]["name"], "anchor")
+            self.assertEqual([e["kind"] for e in found["edges"]], ["contains"])
+            # docs/rules.md (file + 2 sections), src/a_first.py (file + 2 symbols), then
+            # the next file node ends the anchor's group and reading stops there.
+            self.assertEqual(read.count("node"), 7)
+            self.assertLess(len(read), len(lines) // 10)
+            self.assertEqual(found, snapshot.find_neighborhood(json_out, anchor))
+            self.assertIsNone(snapshot.find_neighborhood(nd_out, "missing"))
+
+            packet = Path(tmp) / "slice.md"
+            proc = subprocess.run(
+                [sys.executable, str(TOOLS / "slice_context_graph.py"), "--graph", str(nd_out), "--anchor", anchor, "--out", str(packet)],
+                capture_output=True,
+                text=True,
+            )
+            self.assertEqual(proc.returncode, 0, proc.stderr)
+            self.assertIn("def anchor(x):", packet.read_text(encoding="utf-8"))
+
+    def test_rev_snapshots_match_the_working_tree(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            repo = Path(tmp) / "repo"
+            _write(repo, {"src/calc.py": "def tax(x):\n    return x\n", "docs/a.md": "# A\n", "src/data.txt": "x\n"})
+            _git(repo, "init", "-q")
+            _git(repo, "add", ".")
+            _git(repo, "commit", "-q", "-m", "one")
+            _write(repo, {"src/calc.py": "def tax(x):\n    return 2 * x\n\n\ndef rate():\n    pass\n"})
+            _git(repo, "commit", "-q", "-am", "two")
+
+            out, cache = Path(tmp) / "graph-{rev}.json", Path(tmp) / "blobs.pickle"
+            args = ("--rev", "HEAD~1", "--rev", "HEAD", "--blob-cache", str(cache), "--no-index")
+            proc = _build(Path("src"), out, *args, cwd=repo)
+            self.assertEqual(proc.returncode, 0, proc.stderr)
+            self.assertIn("revs=2 blobs_parsed=2 blob_cache_hits=0", proc.stdout)
+            proc = _build(Path("src"), out, *args, cwd=repo)
+            self.assertIn("blobs_parsed=0 blob_cache_hits=2", proc.stdout)
+
+            work = Path(tmp) / "work.json"
+            self.assertEqual(_build(Path("src"), work, "--no-index", cwd=repo).returncode, 0)
+            load = lambda p: json.loads(p.read_text(encoding="utf-8"))  # noqa: E731
+            head, old, tree = load(Path(tmp) / "graph-HEAD.json"), load(Path(tmp) / "graph-HEAD~1.json"), load(work)
+            self.assertEqual(head, tree)
+            diff = diff_graphs(old, tree)
+            self.assertEqual([n["id"] for n in diff["nodes"]["added"]], ["src/calc.py:rate"])
+            self.assertEqual([n["id"] for n in diff["nodes"]["changed"]], ["src/calc.py", "src/calc.py:tax"])
+
+            # Tree listings are memoized per suffix set, not just per tree.
+            with CatFile(cwd=str(repo)) as cat:
+                self.assertEqual([p for p, _ in cat.tree_blobs("HEAD", ".", {".py"})], ["src/calc.py"])
+                self.assertEqual([p for p, _ in cat.tree_blobs("HEAD", ".", {".md"})], ["docs/a.md"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import importlib
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from core.metrics.coverage import LineCoverage  # noqa: E402
+
+SOURCE = """\
+def used(x):
+    if x:
+        return 1
+    return 2
+
+
+def unused():
+    return 3
+
+
+for _ in range(3):
+    used(True)
+"""
+
+
+class TestLineCoverage(unittest.TestCase):
+    def test_records_hits_across_threads(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            pkg = Path(tmp) / "covpkg"
+            pkg.mkdir()
+            (pkg / "__init__.py").write_text("", encoding="utf-8")
+            (pkg / "mod.py").write_text(SOURCE, encoding="utf-8")
+            (pkg / "never.py").write_text("x = 1\n", encoding="utf-8")
+            sys.path.insert(0, tmp)
+            try:
+                cov = LineCoverage([pkg])
+                cov.start()
+                try:
+                    mod = importlib.import_module("covpkg.mod")
+                    t = threading.Thread(target=mod.used, args=(False,))
+                    t.start()
+                    t.join()
+                finally:
+                    cov.stop()
+                report = cov.report(Path(tmp))
+            finally:
+                sys.path.remove(tmp)
+                for name in ("covpkg.mod", "covpkg"):
+                    sys.modules.pop(name, None)
+
+        self.assertEqual(report["files"]["covpkg/mod.py"]["missing"], [8])
+        self.assertEqual(report["files"]["covpkg/never.py"]["covered"], 0)
+        self.assertEqual((report["covered"], report["lines"]), (7, 9))
+        self.assertEqual(report["line_coverage"], 77.78)
+
+
+if __name__ == "__main__":
+    unittest.main()
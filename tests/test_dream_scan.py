@@ -0,0 +1,175 @@
+import ast
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from core.dream.clones import clone_groups, fingerprints  # noqa: E402
+from core.dream.hotspots import hotspots  # noqa: E402
+from core.dream.scan import ScanCache, scan  # noqa: E402
+
+SOURCE = """\
+def flat(x):
+    return x
+
+
+def branchy(items, flag):
+    if flag and items or not items:
+        return [i for i in items if i]
+    for i in items:
+        try:
+            pass
+        except ValueError:
+            continue
+    return 1 if flag else 2
+
+
+class Service:
+    def method(self, x):
+        while x:
+            x -= 1
+
+        def inner(y):
+            if y:
+                return y
+            return 0
+
+        return inner(x)
+
+    async def fetch(self, kind):
+        match kind:
+            case "a":
+                return 1
+            case _:
+                return 2
+"""
+
+
+class TestDreamScan(unittest.TestCase):
+    def test_mccabe_per_function_and_cache(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp) / "src"
+            root.mkdir()
+            (root / "a.py").write_text(SOURCE)
+            (root / "copy.py").write_text(SOURCE)
+            (root / "broken.py").write_text("def f(:\n")
+            cache_path = Path(tmp) / "cache.pickle"
+
+            results, stats = scan(root, ScanCache(cache_path), workers=1)
+            self.assertEqual(stats, {"files": 3, "stat_hits": 0, "hash_hits": 0, "parsed": 2})
+            by_name = {name: cc for name, _, cc in results[str(root / "a.py")]["functions"]}
+            # branchy: if + 2 bool operands + comprehension(for, if) + for + except + ifexp
+            self.assertEqual(
+                by_name,
+                {"flat": 1, "branchy": 9, "Service.method": 2, "Service.method.inner": 2, "Service.fetch": 3},
+            )
+            self.assertTrue(results[str(root / "broken.py")]["syntax_error"])
+
+            _, stats = scan(root, ScanCache(cache_path), workers=1)
+            self.assertEqual(stats["stat_hits"], 3)
+
+            st = os.stat(root / "a.py")
+            os.utime(root / "a.py", ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+            (root / "broken.py").unlink()
+            _, stats = scan(root, ScanCache(cache_path), workers=1)
+            self.assertEqual(stats, {"files": 2, "stat_hits": 1, "hash_hits": 1, "parsed": 0})
+
+    def test_cache_is_shared_across_roots_and_bounded(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            roots = [Path(tmp) / name for name in ("one", "two")]
+            for i, root in enumerate(roots):
+                root.mkdir()
+                (root / "a.py").write_text(f"def f():\n    return {i}\n")
+            cache_path = Path(tmp) / "cache.pickle"
+            for root in roots:
+                scan(root, ScanCache(cache_path), workers=1)
+            _, stats = scan(roots[0], ScanCache(cache_path), workers=1)
+            self.assertEqual(stats["stat_hits"], 1)
+
+            class Bounded(ScanCache):
+                MAX_PATHS = 1
+
+            scan(roots[1], Bounded(cache_path), workers=1)
+            self.assertEqual(list(ScanCache(cache_path).stats), [str(roots[1] / "a.py")])
+
+    def test_clone_groups_ignore_names_and_closures(self) -> None:
+        original = """
+def public_functions(src_root):
+    \"\"\"Docstrings do not count.\"\"\"
+    out = []
+    for path in sorted(src_root.rglob("*.py")):
+        for line in path.read_text(encoding="utf-8").splitlines():
+            match = DEF_RE.match(line)
+            if not match or match.group("name").startswith("_"):
+                continue
+            args = [a.strip() for a in match.group("args").split(",") if a.strip()]
+            out.append((match.group("name"), args))
+    return out
+"""
+        renamed = (
+            original.replace("public_functions", "extract")
+            .replace("out", "found")
+            .replace("path", "p")
+            .replace('"*.py"', '"*.pyi"')
+            .replace("    return found", "    found.sort()\n    return found")
+        )
+        wrapper = "def outer():\n" + "\n".join("    " + line for line in original.splitlines()) + "\n    return public_functions\n"
+        unrelated = "def other(n):\n" + "".join(f"    while n > {i}:\n        n = n // 2 + {i}\n" for i in range(8)) + "    return n\n"
+
+        corpus = []
+        for path, text in (("a.py", original), ("b.py", renamed), ("c.py", wrapper), ("d.py", unrelated)):
+            corpus.extend((path, name, fps) for name, fps in fingerprints(ast.parse(text)).items())
+        self.assertEqual({name for _, name, _ in corpus}, {"public_functions", "extract", "outer.public_functions", "other"})
+
+        groups = clone_groups(corpus, threshold=0.8)
+        self.assertEqual(len(groups), 1)
+        self.assertEqual(
+            groups[0]["members"],
+            [("a.py", "public_functions"), ("b.py", "extract"), ("c.py", "outer.public_functions")],
+        )
+        self.assertGreaterEqual(groups[0]["similarity"], 0.8)
+        self.assertLess(groups[0]["similarity"], 1.0)
+
+    def test_hotspots_follow_line_moves_and_renames(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+
+            def commit(files: dict[str, str], message: str) -> None:
+                for name, text in files.items():
+                    (root / name).write_text(text)
+                subprocess.run(["git", "add", "-A"], cwd=root, check=True)
+                subprocess.run(
+                    ["git", "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-qm", message],
+                    cwd=root,
+                    check=True,
+                )
+
+            subprocess.run(["git", "init", "-q"], cwd=root, check=True)
+            f_body = "def f(x):\n    if x:\n        return {}\n    return 0\n"
+            g_body = "\n\ndef g(y):\n    return y + {}\n"
+            commit({"a.py": f_body.format(1) + g_body.format(1)}, "create")
+            commit({"a.py": "import os\nimport sys\n\n\n" + f_body.format(1) + g_body.format(2)}, "shift f, edit g")
+            commit({"a.py": "import os\nimport sys\n\n\n" + f_body.format(2) + g_body.format(2)}, "edit f")
+            subprocess.run(["git", "mv", "a.py", "b.py"], cwd=root, check=True)
+            commit({}, "rename")
+            commit({"b.py": "import os\nimport sys\n\n\n" + f_body.format(3) + g_body.format(2)}, "edit f again")
+
+            ranked = hotspots(root)
+            self.assertEqual(ranked["commits"], 5)
+            by_name = {r["symbol"]: r for r in ranked["functions"]}
+            self.assertEqual((by_name["f"]["commits"], by_name["f"]["cc"], by_name["f"]["score"]), (3, 2, 6))
+            self.assertEqual((by_name["g"]["commits"], by_name["g"]["score"]), (2, 2))
+            self.assertEqual([r["symbol"] for r in ranked["functions"]], ["f", "g"])
+            self.assertEqual(
+                {k: ranked["files"][0][k] for k in ("file", "commits", "added", "deleted")},
+                {"file": "b.py", "commits": 4, "added": 15, "deleted": 3},
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
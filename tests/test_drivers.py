@@ -0,0 +1,115 @@
+import json
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from core.drivers import MarkerIndex, compile_registry, resolve  # noqa: E402
+
+REGISTRY = {
+    "run_tests": [
+        {"match": {"language": "python"}, "cmd": ["pytest"]},
+        {"match": {"language": "python"}, "cmd": ["shadowed"]},
+        {"match": {"language": "javascript"}, "cmd": ["npm", "test"]},
+    ],
+    "lint": [{"match": {"language": "python"}, "cmd": ["ruff"]}],
+}
+
+
+class TestDriverResolution(unittest.TestCase):
+    def test_nearest_marker_wins_and_directories_are_probed_once(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            repo = Path(tmp)
+            for rel in ["pyproject.toml", "web/package.json", "web/src/app.js", "api/src/pkg/mod.py"]:
+                (repo / rel).parent.mkdir(parents=True, exist_ok=True)
+                (repo / rel).write_text("")
+            (repo / "web/requirements.txt").write_text("")  # python markers beat package.json
+
+            index = MarkerIndex()
+            self.assertEqual(index.language(repo / "api/src/pkg/mod.py"), "python")
+            probes = index.probes
+            self.assertEqual(probes, 4)  # pkg, src, api, repo
+            self.assertEqual(index.language(repo / "api/src"), "python")
+            self.assertEqual(index.language(repo / "api/src/pkg"), "python")
+            self.assertEqual(index.probes, probes)
+            self.assertEqual(index.language(repo / "web/src/app.js"), "python")
+            self.assertEqual(index.probes, probes + 2)
+
+            (repo / "web/requirements.txt").unlink()
+            self.assertEqual(MarkerIndex().language(repo / "web/src/app.js"), "javascript")
+
+    def test_compiled_registry_and_batch_jsonl(self) -> None:
+        compiled = compile_registry(REGISTRY)
+        self.assertEqual(compiled[("run_tests", "python")], ["pytest"])
+        self.assertNotIn(("lint", "javascript"), compiled)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            repo = Path(tmp)
+            (repo / "svc").mkdir()
+            (repo / "svc/package.json").write_text("")
+            record = resolve(compiled, MarkerIndex(), "lint", repo / "svc")
+            self.assertEqual(record["language"], "javascript")
+            self.assertIn("no driver", record["error"])
+
+            registry = repo / "registry.json"
+            registry.write_text(json.dumps(REGISTRY))
+            proc = subprocess.run(
+                [sys.executable, str(ROOT / "factory/tools/resolve_driver.py"), "--registry", str(registry), "--batch", "-"],
+                input=f"{repo / 'svc'}\n\n{repo / 'svc/package.json'}\n",
+                capture_output=True,
+                text=True,
+            )
+            self.assertEqual(proc.returncode, 0, proc.stderr)
+            records = [json.loads(line) for line in proc.stdout.splitlines()]
+            self.assertEqual([r["cmd"] for r in records], [["npm", "test"], ["npm", "test"]])
+            self.assertIn("targets=2 resolved=2 failed=0", proc.stderr)
+
+    def test_run_drivers_in_parallel_with_timeouts(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            repo = Path(tmp)
+            for name, marker in [("a", "pyproject.toml"), ("b", "pyproject.toml"), ("hang", "package.json")]:
+                (repo / name).mkdir()
+                (repo / name / marker).write_text("")
+            registry = repo / "registry.json"
+            registry.write_text(
+                json.dumps(
+                    {
+                        "run_tests": [
+                            {"match": {"language": "python"}, "cmd": [sys.executable, "-c", "import time; time.sleep(0.5)"]},
+                            {"match": {"language": "javascript"}, "cmd": [sys.executable, "-c", "import time; time.sleep(30)"]},
+                        ]
+                    }
+                )
+            )
+            proc = subprocess.run(
+                [
+                    sys.executable,
+                    str(ROOT / "factory/tools/run_drivers.py"),
+                    *(str(repo / name) for name in ("a", "b", "hang")),
+                    "--registry",
+                    str(registry),
+                    "--jobs",
+                    "3",
+                    "--timeout",
+                    "1",
+                    "--json",
+                ],
+                capture_output=True,
+                text=True,
+                timeout=20,
+            )
+            self.assertEqual(proc.returncode, 1, proc.stderr)
+            report = json.loads(proc.stdout)
+            status = {Path(r["name"]).name: r["status"] for r in report["results"]}
+            self.assertEqual(status, {"a": "passed", "b": "passed", "hang": "timeout"})
+            summary = report["summary"]
+            self.assertLess(summary["wall_s"], summary["serial_s"])
+            self.assertEqual([Path(n).name for n in summary["critical_path"]], ["hang"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from core.runners.effector_pool import EffectorPool, WorkerError, WorkerTimeout, run_subprocess  # noqa: E402
+
+EFFECTOR = str(ROOT / "tools/stochastic_sync_public_interfaces.py")
+SRC = str(ROOT / "product/src")
+DOC_TEXT = "# A\n\n## Public Interfaces\n\n- (generated)\n\n## Notes\n"
+
+# Hangs on --seed 99, answers otherwise.
+SLOW_EFFECTOR = """
+import sys, time
+
+def main():
+    if sys.argv[sys.argv.index("--seed") + 1] == "99":
+        time.sleep(60)
+    print("ok")
+    return 0
+"""
+
+
+class TestEffectorPool(unittest.TestCase):
+    def test_worker_results_match_per_attempt_subprocess(self) -> None:
+        requests = [
+            {"id": seed, "src": SRC, "doc": "docs/arch.md", "doc_text": DOC_TEXT, "seed": seed, "apply": True}
+            for seed in (1, 2, 3)
+        ]
+        with EffectorPool(EFFECTOR, size=2) as pool:
+            self.assertEqual(pool.mode, "worker")
+            pooled = pool.map(requests)
+
+        for request, result in zip(requests, pooled):
+            expected = run_subprocess(EFFECTOR, request)
+            self.assertEqual(result["id"], request["id"])
+            self.assertEqual(result["returncode"], 0, result["stderr"])
+            self.assertEqual(result["stdout"], expected["stdout"])
+            self.assertEqual(result["new_text"], expected["new_text"])
+            self.assertIn("--- docs/arch.md", result["stdout"])
+
+    def test_hung_and_dead_workers_are_never_requeued(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            effector = Path(tmp) / "slow.py"
+            effector.write_text(SLOW_EFFECTOR, encoding="utf-8")
+            request = {"src": tmp, "doc": "d.md", "doc_text": "", "seed": 1}
+
+            with EffectorPool(str(effector), size=1, fallback=False, timeout=1.0) as pool:
+                with self.assertRaises(WorkerTimeout):
+                    pool.run(dict(request, seed=99))
+                # The hung worker was killed and replaced.
+                self.assertEqual(pool.run(request)["stdout"], "ok\n")
+                self.assertEqual(len(pool._all), 1)
+
+                # A worker that dies and cannot be replaced leaves the pool instead of the idle queue.
+                effector.write_text("raise SystemExit(3)\n", encoding="utf-8")
+                pool._all[0]._proc.kill()
+                with self.assertRaises(WorkerError):
+                    pool.run(request)
+                self.assertEqual(pool._all, [])
+                with self.assertRaisesRegex(WorkerError, "no workers left"):
+                    pool.run(request)
+
+    def test_unloadable_effector_falls_back_to_subprocess(self) -> None:
+        with EffectorPool(str(ROOT / "README.md"), size=1) as pool:
+            self.assertEqual(pool.mode, "subprocess")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import sys
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from core.graph.diff import affected_missions, changed_paths, diff_graphs  # noqa: E402
+
+OLD = {
+    "nodes": [
+        {"id": "product/src/calc.py", "kind": "file", "path": "product/src/calc.py", "content_hash": "a"},
+        {"id": "product/src/calc.py:tax", "kind": "symbol", "path": "product/src/calc.py", "content_hash": "b"},
+        {"id": "docs/old.md", "kind": "file", "path": "docs/old.md", "content_hash": "c"},
+    ],
+    "edges": [{"src": "product/src/calc.py", "dst": "product/src/calc.py:tax", "kind": "contains"}],
+}
+
+NEW = {
+    "nodes": [
+        {"id": "product/src/calc.py", "kind": "file", "path": "product/src/calc.py", "content_hash": "a2"},
+        {"id": "product/src/calc.py:tax", "kind": "symbol", "path": "product/src/calc.py", "content_hash": "b"},
+        {"id": "product/src/calc.py:rate", "kind": "symbol", "path": "product/src/calc.py", "content_hash": "d"},
+    ],
+    "edges": [
+        {"src": "product/src/calc.py", "dst": "product/src/calc.py:tax", "kind": "contains"},
+        {"src": "product/src/calc.py", "dst": "product/src/calc.py:rate", "kind": "contains"},
+    ],
+}
+
+
+class TestGraphDiff(unittest.TestCase):
+    def test_nodes_and_edges_by_status(self) -> None:
+        diff = diff_graphs(OLD, NEW)
+        ids = {status: [n["id"] for n in nodes] for status, nodes in diff["nodes"].items()}
+        self.assertEqual(
+            ids,
+            {
+                "added": ["product/src/calc.py:rate"],
+                "removed": ["docs/old.md"],
+                "changed": ["product/src/calc.py"],
+            },
+        )
+        self.assertEqual([e["dst"] for e in diff["edges"]["added"]], ["product/src/calc.py:rate"])
+        self.assertEqual(diff["edges"]["removed"], [])
+
+    def test_affected_missions_match_roots_and_files(self) -> None:
+        paths = changed_paths(diff_graphs(OLD, NEW))
+        missions = [
+            (Path("a.json"), {"mission_id": "terrain", "slice": {"terrain_roots": ["product/src"]}}),
+            (Path("b.json"), {"mission_id": "doc", "scope": {"target_file": "docs/old.md"}}),
+            (Path("c.json"), {"mission_id": "other", "slice": {"map_files": ["README.md"]}}),
+        ]
+        self.assertEqual(
+            [m["mission_id"] for m in affected_missions(paths, missions)],
+            ["terrain", "doc"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
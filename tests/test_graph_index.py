@@ -0,0 +1,75 @@
+import sys
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from core.graph.index import build_index, index_path_for, neighbors, query  # noqa: E402
+
+GRAPH = {
+    "root": "svc",
+    "nodes": [
+        {"id": "svc/docs/rules.md", "kind": "file", "path": "svc/docs/rules.md"},
+        {"id": "svc/docs/rules.md#Income Tax", "kind": "doc_section", "path": "svc/docs/rules.md", "name": "Income Tax"},
+        {"id": "svc/src/tax.py", "kind": "file", "path": "svc/src/tax.py"},
+        {"id": "svc/src/tax.py:calculate_income_tax", "kind": "symbol", "path": "svc/src/tax.py", "name": "calculate_income_tax"},
+        {"id": "svc/tests/test_tax.py", "kind": "file", "path": "svc/tests/test_tax.py"},
+    ],
+    "edges": [
+        {"src": "svc/docs/rules.md", "dst": "svc/docs/rules.md#Income Tax", "kind": "contains"},
+        {"src": "svc/src/tax.py", "dst": "svc/src/tax.py:calculate_income_tax", "kind": "contains"},
+        {"src": "svc/tests/test_tax.py", "dst": "tax", "kind": "imports"},
+    ],
+}
+
+
+class TestGraphIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        self.index = build_index(GRAPH)
+
+    def test_index_path_keeps_the_full_graph_name(self) -> None:
+        self.assertEqual(index_path_for(Path("build/graph.json")), Path("build/graph.json.index.pickle"))
+        self.assertNotEqual(index_path_for(Path("g.json")), index_path_for(Path("g.ndjson")))
+        self.assertEqual(index_path_for(Path("graph-v1.2.json")).name, "graph-v1.2.json.index.pickle")
+
+    def ids(self, results: list[dict]) -> list[str]:
+        return [r["id"] for r in results]
+
+    def test_kind_and_path_prefix(self) -> None:
+        self.assertEqual(
+            self.ids(query(self.index, kind="file", path_prefix="svc/src")),
+            ["svc/src/tax.py"],
+        )
+
+    def test_name_is_exact_and_symbol_only(self) -> None:
+        self.assertEqual(
+            self.ids(query(self.index, name="CALCULATE_INCOME_TAX")),
+            ["svc/src/tax.py:calculate_income_tax"],
+        )
+        self.assertEqual(query(self.index, name="calculate"), [])
+
+    def test_heading_and_substring_use_trigrams(self) -> None:
+        self.assertEqual(
+            self.ids(query(self.index, heading="income")),
+            ["svc/docs/rules.md#Income Tax"],
+        )
+        self.assertEqual(
+            self.ids(query(self.index, contains="income_t")),
+            ["svc/src/tax.py:calculate_income_tax"],
+        )
+
+    def test_fuzzy_ranks_closest_label_first(self) -> None:
+        results = query(self.index, fuzzy_text="calculate incme tax")
+        self.assertEqual(results[0]["id"], "svc/src/tax.py:calculate_income_tax")
+        self.assertIn("score", results[0])
+
+    def test_neighbors_include_non_node_endpoints(self) -> None:
+        found = neighbors(self.index, "svc/tests/test_tax.py", direction="out")
+        self.assertEqual([(n["id"], n["kind"], n["edge"]) for n in found], [("tax", None, "imports")])
+        back = neighbors(self.index, "svc/src/tax.py:calculate_income_tax", direction="in")
+        self.assertEqual(self.ids(back), ["svc/src/tax.py"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,37 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from core.metrics.importtime import measure_entry, parse_importtime, top_self_increase  # noqa: E402
+
+
+class TestImportTime(unittest.TestCase):
+    def test_parse(self) -> None:
+        stderr = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       273 |        273 |       _json\n"
+            "import time:       377 |      11109 | json\n"
+            "Traceback: unrelated\n"
+        )
+        self.assertEqual(parse_importtime(stderr), {"_json": (273, 273), "json": (377, 11109)})
+
+    def test_attributes_regression_to_module(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            (Path(tmp) / "entry_mod.py").write_text("import slow_dep\n", encoding="utf-8")
+            (Path(tmp) / "slow_dep.py").write_text("import time\ntime.sleep(0.1)\n", encoding="utf-8")
+            current = measure_entry("entry_mod", tmp, runs=1, warmup=0)
+
+        self.assertGreaterEqual(current["value"], 100.0)
+        self.assertIn("slow_dep", current["self_ms"])
+        baseline = {"self_ms": {"entry_mod": current["self_ms"]["entry_mod"]}}
+        culprit = top_self_increase(baseline, current)
+        self.assertEqual(culprit["module"], "slow_dep")
+        self.assertIsNone(top_self_increase(current, current))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from core.inventory import build, inventory, load  # noqa: E402
+
+
+class TestInventory(unittest.TestCase):
+    def test_gitignore_rules_and_manifest(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            repo = Path(tmp)
+            (repo / ".git").mkdir()
+            (repo / ".gitignore").write_text("# comment\n*.log\n!keep.log\n/build/\nnode_modules/\ndocs/**/draft*\n")
+            files = [
+                "a.py",
+                "a/b.py",
+                "run.log",
+                "keep.log",
+                "build/out.py",
+                "src/build/kept.py",
+                "src/node_modules/x.js",
+                "src/pkg/.gitignore",
+                "src/pkg/gen.py",
+                "src/pkg/mod.py",
+                "docs/x/y/draft1.md",
+                "docs/x/final.md",
+            ]
+            for rel in files:
+                (repo / rel).parent.mkdir(parents=True, exist_ok=True)
+                (repo / rel).write_text("x\n")
+            (repo / "src/pkg/.gitignore").write_text("gen.py\n")
+
+            inv = build(repo)
+            self.assertEqual(
+                [e.path for e in inv.files()],
+                [".gitignore", "a/b.py", "a.py", "docs/x/final.md", "keep.log", "src/build/kept.py", "src/pkg/.gitignore", "src/pkg/mod.py"],
+            )
+            self.assertNotIn(".git", [e.path for e in inv.dirs()])
+            self.assertEqual(inv.children()["src"], 2)
+
+            # Ignore files above the walked root still apply.
+            self.assertEqual([p.name for p in build(repo / "src").paths({".py"})], ["kept.py", "mod.py"])
+
+            manifest = repo / ".sdac/inventory.json"
+            inv.save(manifest)
+            self.assertIsNotNone(load(manifest))
+            sub = inventory(repo / "src", manifest)
+            self.assertEqual([e.path for e in sub.files({".py"})], ["build/kept.py", "pkg/mod.py"])
+
+            (repo / "src/pkg/new.py").write_text("x\n")
+            os.utime(repo / "src/pkg", ns=(0, 1))
+            self.assertIsNone(load(manifest))
+            self.assertIn("pkg/new.py", [e.path for e in inventory(repo / "src", manifest).files()])
+
+
+if __name__ == "__main__":
+    unittest.main()
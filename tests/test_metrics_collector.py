@@ -0,0 +1,43 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from core.metrics.collector import FactCache, collect  # noqa: E402
+from core.metrics.registry import METRICS, Metric  # noqa: E402
+
+
+class TestMetricsCollector(unittest.TestCase):
+    def test_single_walk_cache_and_plugins(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / "tests").mkdir()
+            (root / "tests/test_a.py").write_text("def test_one():\n    pass\n\n    def test_nested():\n        pass\n")
+            (root / "broken.py").write_text("def f(:\n    def test_not_in_tests(): pass\n")
+            (root / "latin.py").write_bytes(b"# -*- coding: latin-1 -*-\nname = '\xe9'\n")
+
+            calls: list[str] = []
+
+            def measure(text: str, code: object) -> int:
+                calls.append(text)
+                return 1 if code is not None else 0
+
+            metrics = [METRICS["test_count"], METRICS["python_syntax_errors"], Metric("compiles", measure)]
+            cache = FactCache(root / ".sdac/facts.json")
+            snap = collect(root, cache, metrics)
+            self.assertEqual(snap["metrics"], {"test_count": 2, "python_syntax_errors": 1, "compiles": 2})
+            self.assertEqual(snap["files"], 3)
+            self.assertEqual(len(calls), 3)
+            self.assertFalse(list(root.rglob("*.pyc")))
+
+            again = collect(root, FactCache(root / ".sdac/facts.json"), metrics)
+            self.assertEqual(again["metrics"], snap["metrics"])
+            self.assertEqual(again["cache"], {"hits": 3, "misses": 0})
+            self.assertEqual(len(calls), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import json
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from core.metrics import history  # noqa: E402
+
+
+class TestMetricsHistory(unittest.TestCase):
+    def test_series_slope_and_first_regression(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            db = Path(tmp) / "history.sqlite"
+            p95 = [50.0, 48.0, 49.0, 55.0, 70.0, 52.0]
+            for i, v in enumerate(p95):
+                history.record(db, {"test_count": 10 + 2 * i, "validate_p95_ms": v}, "metrics", commit=f"c{i}", ts=i)
+            # Re-measuring a commit replaces its point instead of adding one.
+            history.record(db, {"test_count": 20}, "metrics", commit="c5", ts=9)
+
+            counts = history.series(db, "test_count")
+            self.assertEqual([p["commit"] for p in counts], [f"c{i}" for i in range(6)])
+            self.assertEqual(counts[-1]["value"], 20.0)
+            self.assertEqual([p["commit"] for p in history.series(db, "test_count", last=2)], ["c4", "c5"])
+            self.assertAlmostEqual(history.slope(history.series(db, "test_count", last=5)), 2.0)
+
+            latency = history.series(db, "validate_p95_ms")
+            hit = history.first_regression(latency, "down", tolerance=2.0, relative_tolerance=0.1)
+            self.assertEqual((hit["commit"], hit["best"]), ("c3", 48.0))
+            self.assertIsNone(history.first_regression(latency, "down", tolerance=30.0))
+            self.assertEqual(history.metric_names(db), ["test_count", "validate_p95_ms"])
+
+    def test_commit_order_and_inferred_direction(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            db = Path(tmp) / "history.sqlite"
+            # c1 was measured last (e.g. while bisecting) but comes before c2 in history.
+            for ts, (commit, v) in enumerate([("c0", 50.0), ("c2", 40.0), ("c3", 90.0), ("c1", 45.0), ("gone", 1.0)]):
+                history.record(db, {"stage_p95_ms": v}, "bench", commit=commit, ts=ts)
+            order = ["c0", "c1", "c2", "c3"]
+            self.assertEqual([p["commit"] for p in history.series(db, "stage_p95_ms")], ["c0", "c2", "c3", "c1", "gone"])
+            self.assertEqual([p["commit"] for p in history.series(db, "stage_p95_ms", order=order)], order)
+            self.assertEqual([p["commit"] for p in history.series(db, "stage_p95_ms", last=2, order=order)], ["c2", "c3"])
+
+            repo = Path(tmp) / "repo"
+            repo.mkdir()
+            git = ["git", "-c", "user.name=t", "-c", "user.email=t@t", "-C", str(repo)]
+            subprocess.run(git + ["init", "-q"], check=True)
+            shas = []
+            for _ in range(3):
+                subprocess.run(git + ["commit", "-q", "--allow-empty", "-m", "c"], check=True)
+                shas.append(subprocess.run(git + ["rev-parse", "HEAD"], capture_output=True, text=True).stdout.strip())
+            self.assertEqual(history.commit_order(cwd=repo), shas)
+
+
+            db2 = Path(tmp) / "trend.sqlite"
+            for ts, i in enumerate([0, 2, 1]):
+                history.record(db2, {"stage_p95_ms": [50.0, 90.0, 45.0][i]}, "bench", commit=shas[i], ts=ts)
+            proc = subprocess.run(
+                [
+                    sys.executable,
+                    str(ROOT / "factory/tools/metrics_trend.py"),
+                    "stage_p95_ms",
+                    "--history",
+                    str(db2),
+                    "--config",
+                    str(Path(tmp) / "missing.json"),
+                    "--tolerance",
+                    "10",
+                    "--json",
+                ],
+                cwd=repo,
+                capture_output=True,
+                text=True,
+            )
+            self.assertEqual(proc.returncode, 0, proc.stderr)
+            summary = json.loads(proc.stdout)
+            self.assertEqual(summary["direction"], "down")
+            self.assertEqual(summary["last_commit"], shas[2])
+            self.assertEqual(summary["first_regression"]["commit"], shas[1])
+
+            # A dirty tree is not recorded under HEAD; an explicit commit always is.
+            (repo / "f.txt").write_text("a\n", encoding="utf-8")
+            subprocess.run(git + ["add", "f.txt"], check=True)
+            subprocess.run(git + ["commit", "-q", "-m", "f"], check=True)
+            db3 = Path(tmp) / "dirty.sqlite"
+            self.assertIsNotNone(history.record(db3, {"x": 1}, "metrics", cwd=repo))
+            (repo / "f.txt").write_text("b\n", encoding="utf-8")
+            self.assertIsNone(history.record(db3, {"x": 2}, "metrics", cwd=repo))
+            self.assertEqual([p["value"] for p in history.series(db3, "x")], [1.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+import json
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from core.missions.scheduler import Snapshot, components, conflicts, expand  # noqa: E402
+
+
+def _mission(writes: list[str], terrain: list[str] | None = None) -> dict:
+    return {"scope": {"write_allowlist": writes}, "slice": {"terrain_roots": terrain or []}}
+
+
+class TestMissionScheduler(unittest.TestCase):
+    def test_overlapping_writes_and_reads_conflict(self) -> None:
+        refactor = _mission(["product/src/**"])
+        doc_sync = _mission(["product/docs/architecture.md"], terrain=["product/src"])
+        schema = _mission(["services/**", "schemas/**"])
+
+        self.assertTrue(conflicts(refactor, doc_sync))  # doc_sync reads what refactor writes
+        self.assertFalse(conflicts(refactor, schema))
+        self.assertTrue(conflicts(_mission(["a/x.md"]), _mission(["a/*.md"])))
+        self.assertEqual(components([refactor, schema, doc_sync]), [[0, 2], [1]])
+
+    def test_expand_uses_the_gitignore_aware_inventory(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            for rel in ("src/a.py", "src/pkg/b.py", "src/__pycache__/a.pyc", "src/notes.md", "top.md"):
+                (root / rel).parent.mkdir(parents=True, exist_ok=True)
+                (root / rel).write_text("x\n", encoding="utf-8")
+            (root / ".gitignore").write_text("__pycache__/\n", encoding="utf-8")
+
+            rels = lambda patterns: [p.relative_to(root).as_posix() for p in expand(patterns, root)]  # noqa: E731
+            self.assertEqual(rels(["src"]), ["src/a.py", "src/notes.md", "src/pkg/b.py"])
+            self.assertEqual(rels(["./src/**/*.py", "top.md", "missing.md"]), ["src/a.py", "src/pkg/b.py", "top.md"])
+
+    def test_snapshot_counts_changes_and_rolls_back(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / "a").mkdir()
+            (root / "a/f.txt").write_text("one\ntwo\n", encoding="utf-8")
+            snap = Snapshot(["a/**"], root)
+
+            (root / "a/f.txt").write_text("one\n2\n", encoding="utf-8")
+            (root / "a/new.txt").write_text("n\n", encoding="utf-8")
+            changed, lines = snap.changes()
+            self.assertEqual(len(changed), 2)
+            self.assertEqual(lines, 3)
+
+            snap.restore()
+            self.assertEqual((root / "a/f.txt").read_text(encoding="utf-8"), "one\ntwo\n")
+            self.assertFalse((root / "a/new.txt").exists())
+
+    def test_guard_tree_keeps_only_protected_contents(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            for rel in ("a/f.txt", "lock/p.txt", "docs/d.txt"):
+                (root / rel).parent.mkdir(parents=True, exist_ok=True)
+                (root / rel).write_text("original\n", encoding="utf-8")
+            snap = Snapshot(["a/**"], root, guard_tree=True, protected=["lock/**"])
+            self.assertEqual(list(snap.kept), ["lock/p.txt"])
+
+            for rel in ("lock/p.txt", "docs/d.txt", "docs/new.txt"):
+                (root / rel).write_text("edited!\n", encoding="utf-8")
+            self.assertEqual(snap.outside_changes(), ["docs/d.txt", "docs/new.txt", "lock/p.txt"])
+            # Outside a git repository only kept contents can be restored.
+            self.assertEqual(snap.restore(), ["docs/d.txt", "docs/new.txt"])
+            self.assertEqual((root / "lock/p.txt").read_text(encoding="utf-8"), "original\n")
+            self.assertTrue((root / "docs/new.txt").exists())
+
+    def test_protected_and_out_of_scope_writes_fail_and_roll_back(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            for rel in ("product/src/calc.py", "factory/tool.py", "docs/notes.md"):
+                (root / rel).parent.mkdir(parents=True, exist_ok=True)
+                (root / rel).write_text("original\n", encoding="utf-8")
+            (root / ".gitignore").write_text("build/\n", encoding="utf-8")
+            subprocess.run(["git", "init", "-q"], cwd=root, check=True)
+            subprocess.run(["git", "add", "-A"], cwd=root, check=True)
+
+            def run(touch: list[str]) -> dict:
+                script = "; ".join(f"open({rel!r}, 'w').write('edited\\n')" for rel in touch)
+                mission = {
+                    "mission_id": "m",
+                    "scope": {"write_allowlist": ["product/src/**"], "protected_paths": ["factory/**"]},
+                    "effector": {"cmd": f'{sys.executable} -c "import os; os.makedirs(\'build\', exist_ok=True); {script}"'},
+                    "validators": [],
+                }
+                (root / "m.json").write_text(json.dumps(mission), encoding="utf-8")
+                proc = subprocess.run(
+                    [sys.executable, str(ROOT / "factory/tools/run_missions.py"), "m.json", "--json"],
+                    cwd=root,
+                    capture_output=True,
+                    text=True,
+                    timeout=60,
+                )
+                return json.loads(proc.stdout)["results"][0]
+
+            result = run(["product/src/calc.py", "factory/tool.py"])
+            self.assertEqual(result["status"], "protected_path_violation")
+            self.assertEqual(result["detail"], "factory/tool.py")
+            result = run(["product/src/calc.py", "docs/notes.md", "docs/new.md", "build/out.txt"])
+            self.assertEqual(result["status"], "out_of_scope_write")
+            self.assertEqual(result["detail"], "docs/new.md, docs/notes.md")
+            for rel in ("product/src/calc.py", "factory/tool.py", "docs/notes.md"):
+                self.assertEqual((root / rel).read_text(encoding="utf-8"), "original\n", rel)
+            # New files outside the write set may belong to other work: reported, never deleted.
+            self.assertEqual(result["not_restored"], ["docs/new.md"])
+            self.assertTrue((root / "docs/new.md").exists())
+
+            self.assertEqual(run(["product/src/calc.py"])["status"], "passed")
+            self.assertEqual((root / "product/src/calc.py").read_text(encoding="utf-8"), "edited\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from core.missions.schema import MissionCache, compile_schema, load_schema, validate, validate_files  # noqa: E402
+
+SCHEMA = ROOT / "missions/schema/mission.schema.json"
+
+
+class TestMissionSchema(unittest.TestCase):
+    def test_compiled_checks(self) -> None:
+        schema, _ = load_schema(SCHEMA)
+        check = compile_schema(schema)
+        ok = {"mission_id": "m", "goal": "g", "scope": {}, "budgets": {"max_cost_usd": 1}}
+        self.assertEqual(validate(check, ok), [])
+
+        bad = {
+            "mission_id": "m",
+            "scope": {"write_allowlist": ["a", 3]},
+            "budgets": {"max_files_changed": True},
+            "diff_policy": {"format": "zip"},
+        }
+        errors = validate(check, bad)
+        self.assertIn("$: missing required 'goal'", errors)
+        self.assertIn("$.scope.write_allowlist[1]: expected string, got int", errors)
+        self.assertIn("$.budgets.max_files_changed: expected integer, got bool", errors)
+        self.assertEqual(len(errors), 4)
+
+        validators = [
+            {"name": "ok", "cmd": ["python", "-V"], "timeout_s": 1.5, "required": False},
+            {"name": "bad", "cmd": "x", "timeout_s": "10", "required": "no"},
+        ]
+        self.assertEqual(
+            validate(check, dict(ok, validators=validators)),
+            [
+                "$.validators[1].timeout_s: expected number, got str",
+                "$.validators[1].required: expected boolean, got str",
+            ],
+        )
+
+        with self.assertRaises(ValueError):
+            compile_schema({"type": "string", "pattern": "^x"})
+        self.assertEqual(validate(compile_schema({"additionalProperties": False}), {"x": 1}), ["$: unexpected property 'x'"])
+
+    def test_cache_by_content_hash(self) -> None:
+        schema, digest = load_schema(SCHEMA)
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            a = root / "a.json"
+            a.write_text(json.dumps({"mission_id": "a", "goal": "g", "scope": {}}), encoding="utf-8")
+            b = root / "b.yaml"
+            b.write_text("mission_id: b\nscope: []\n", encoding="utf-8")
+
+            cache = MissionCache(root / "cache.json", digest)
+            first = validate_files([a, b], schema, cache, workers=1)
+            cache.save()
+            self.assertEqual(first[0]["errors"], [])
+            self.assertEqual(len(first[1]["errors"]), 2)  # missing goal, scope not an object
+
+            again = MissionCache(root / "cache.json", digest)
+            self.assertEqual(validate_files([a, b], schema, again, workers=1), first)
+            self.assertEqual((again.hits, again.misses), (2, 0))
+            self.assertEqual(MissionCache(root / "cache.json", "other-schema").entries, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+import difflib
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from core.effectors.unified_diff import apply_unified_diff  # noqa: E402
+from core.model import client  # noqa: E402
+from core.model.gateway import BudgetExceeded, GatewayError, MissionBudget, ModelGateway  # noqa: E402
+from core.model.stub_server import StubModelServer, stub_response  # noqa: E402
+from core.prep.tokens import count_tokens  # noqa: E402
+
+
+class _StubCase(unittest.TestCase):
+    server_kwargs: dict = {}
+
+    def setUp(self) -> None:
+        self.server = StubModelServer(("127.0.0.1", 0), **self.server_kwargs)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def tearDown(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class TestModelGateway(_StubCase):
+    def test_batches_keep_order_and_reuse_connections(self) -> None:
+        requests = [f"r{i}" for i in range(10)]
+        with ModelGateway(self.server.url, model="m", max_concurrency=2, batch_size=4) as gw:
+            responses = gw.complete_many(requests, mission_id="x")
+            self.assertEqual(responses, [stub_response("m", r)[1] for r in requests])
+            self.assertEqual(gw.stats["http_calls"], 3)
+            self.assertLessEqual(gw.stats["connections_opened"], 2)
+            self.assertEqual(gw.budget("x").calls, 10)
+
+    def test_budget_refuses_calls_past_the_limit(self) -> None:
+        with ModelGateway(self.server.url) as gw:
+            gw.set_budget("m", MissionBudget(max_calls=1))
+            gw.complete("a", mission_id="m")
+            with self.assertRaises(BudgetExceeded):
+                gw.complete("b", mission_id="m")
+        self.assertEqual(self.server.calls, 1)
+
+    def test_failed_calls_refund_their_reservation(self) -> None:
+        with ModelGateway(self.server.url) as gw:
+            gw.set_budget("m", MissionBudget(max_calls=2))
+            with mock.patch.object(gw, "_post", side_effect=GatewayError("down")):
+                with self.assertRaises(GatewayError):
+                    gw.complete("a", mission_id="m")
+            with mock.patch.object(gw, "_post", return_value={"responses": ["only one"]}):
+                with self.assertRaises(GatewayError):
+                    gw.complete_batch(["a", "b"], mission_id="m")
+            self.assertEqual(gw.budget("m").summary()["calls"], 0)
+            self.assertEqual(gw.budget("m").summary()["tokens"], 0)
+            gw.complete_batch(["a", "b"], mission_id="m")
+            self.assertEqual(gw.budget("m").calls, 2)
+
+
+    def test_client_and_budgets_share_transport_and_estimator(self) -> None:
+        with mock.patch.object(ModelGateway, "_connect", autospec=True, side_effect=ModelGateway._connect) as connect:
+            self.assertEqual(client.complete(self.server.url, "m", "hello"), stub_response("m", "hello")[1])
+        self.assertEqual(connect.call_count, 1)
+
+        request = "Update the Public Interfaces section of docs/arch.md.\n"
+        with ModelGateway(self.server.url, model="m") as gw:
+            response = gw.complete(request, mission_id="m")
+        expected = count_tokens(request, "markdown") + count_tokens(response, "markdown")
+        self.assertEqual(gw.budget("m").tokens, expected)
+
+class TestModelGatewayRetries(_StubCase):
+    server_kwargs = {"fail_rate": 0.5, "seed": 7}
+
+    def test_transient_failures_are_retried(self) -> None:
+        with ModelGateway(self.server.url, retries=8, backoff_s=0.001) as gw:
+            responses = [gw.complete(f"r{i}") for i in range(10)]
+            self.assertEqual(len(responses), 10)
+            self.assertEqual(gw.stats["retries"], self.server.failures)
+            self.assertGreater(gw.stats["retries"], 0)
+
+
+class TestModelGatewayEffector(_StubCase):
+    def test_effector_applies_model_diff(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            src = Path(tmp) / "src"
+            src.mkdir()
+            (src / "calc.py").write_text("def add(a, b):\n    return a + b\n", encoding="utf-8")
+            doc = Path(tmp) / "arch.md"
+            before = "# A\n\n## Public Interfaces\n\n- (generated)\n\n## Notes\n"
+            doc.write_text(before, encoding="utf-8")
+            after = before.replace("- (generated)", "- `add(a, b)`")
+            diff = "\n".join(
+                difflib.unified_diff(before.splitlines(), after.splitlines(), str(doc), str(doc), lineterm="")
+            )
+            self.assertEqual(apply_unified_diff(before, diff), after)
+            self.server.canned = [{"match": "add(a, b)", "response": diff + "\n"}]
+
+            proc = subprocess.run(
+                [
+                    sys.executable,
+                    str(ROOT / "tools/model_gateway_effector.py"),
+                    "--src",
+                    str(src),
+                    "--doc",
+                    str(doc),
+                    "--apply",
+                    "--endpoint",
+                    self.server.url,
+                ],
+                capture_output=True,
+                text=True,
+            )
+            self.assertEqual(proc.returncode, 0, proc.stderr)
+            self.assertEqual(doc.read_text(encoding="utf-8"), after)
+
+
+if __name__ == "__main__":
+    unittest.main()
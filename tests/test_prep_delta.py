@@ -0,0 +1,102 @@
+import json
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from core.prep.delta import map_signature_lines, signature_delta  # noqa: E402
+
+HEADING = "## Public Interfaces"
+
+DOC = """# Architecture
+
+## Public Interfaces
+
+Functions:
+
+- `apply_discount(price, rate)`
+- `calculate_tax(amount)`
+- `old_helper(x)`
+
+## Notes
+
+- `not_in_block(y)`
+"""
+
+
+class TestSignatureDelta(unittest.TestCase):
+    def test_map_lines_are_limited_to_the_heading_block(self) -> None:
+        heading_line, found = map_signature_lines(DOC, HEADING)
+        self.assertEqual(heading_line, 3)
+        self.assertEqual([(n, sig) for n, _, sig in found], [(7, "apply_discount(price, rate)"), (8, "calculate_tax(amount)"), (9, "old_helper(x)")])
+        with self.assertRaises(ValueError):
+            map_signature_lines(DOC, "## Missing")
+
+    def test_changed_added_removed_and_anchors(self) -> None:
+        terrain = ["apply_discount(price, rate)", "calculate_tax(amount, region)", "format_total(total)"]
+        delta = signature_delta(terrain, DOC, HEADING)
+        self.assertEqual(delta["changed"], [{"old": "calculate_tax(amount)", "new": "calculate_tax(amount, region)"}])
+        self.assertEqual(delta["added"], ["format_total(total)"])
+        self.assertEqual(delta["removed"], ["old_helper(x)"])
+        self.assertEqual(delta["map_signature_count"], 3)
+        # Heading, the changed and removed lines, and the Map neighbours of the
+        # addition in sorted order (calculate_tax < format_total < old_helper).
+        self.assertEqual(
+            delta["anchors"],
+            [
+                {"line": 3, "text": HEADING},
+                {"line": 8, "text": "- `calculate_tax(amount)`"},
+                {"line": 9, "text": "- `old_helper(x)`"},
+            ],
+        )
+
+        unchanged = signature_delta(["apply_discount(price, rate)", "calculate_tax(amount)", "old_helper(x)"], DOC, HEADING)
+        self.assertEqual((unchanged["added"], unchanged["removed"], unchanged["changed"]), ([], [], []))
+        self.assertEqual(unchanged["anchors"], [{"line": 3, "text": HEADING}])
+
+    def test_duplicate_names_pair_at_most_once(self) -> None:
+        doc = f"{HEADING}\n\n- `foo(a)`\n- `foo(a, b)`\n"
+        delta = signature_delta(["foo(x)"], doc, HEADING)
+        self.assertEqual(delta["changed"], [{"old": "foo(a)", "new": "foo(x)"}])
+        self.assertEqual((delta["added"], delta["removed"]), ([], ["foo(a, b)"]))
+
+        delta = signature_delta(["foo(x)", "foo(y)", "foo(z)"], doc, HEADING)
+        self.assertEqual(
+            delta["changed"],
+            [{"old": "foo(a)", "new": "foo(x)"}, {"old": "foo(a, b)", "new": "foo(y)"}],
+        )
+        self.assertEqual((delta["added"], delta["removed"]), (["foo(z)"], []))
+
+    def test_cold_start_falls_back_to_full_mode(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            src, doc = Path(tmp) / "src", Path(tmp) / "architecture.md"
+            src.mkdir()
+            (src / "calc.py").write_text("def calculate_tax(amount):\n    return amount\n", encoding="utf-8")
+            out = Path(tmp) / "context.json"
+            cmd = [sys.executable, str(ROOT / "factory/tools/build_doc_sync_context.py"), "--src", str(src), "--doc", str(doc)]
+            cmd += ["--out", str(out), "--mode", "delta"]
+
+            doc.write_text(f"# Architecture\n\n{HEADING}\n\nNothing documented yet.\n", encoding="utf-8")
+            proc = subprocess.run(cmd, capture_output=True, text=True)
+            self.assertEqual(proc.returncode, 0, proc.stderr)
+            self.assertIn("falling back to full mode", proc.stdout)
+            context = json.loads(out.read_text(encoding="utf-8"))
+            self.assertEqual(context["mode"], "full")
+            self.assertEqual(context["extracted_signatures"], ["calculate_tax(amount)"])
+            self.assertNotIn("delta", context)
+
+            doc.write_text(DOC, encoding="utf-8")
+            proc = subprocess.run(cmd, capture_output=True, text=True)
+            self.assertEqual(proc.returncode, 0, proc.stderr)
+            context = json.loads(out.read_text(encoding="utf-8"))
+            self.assertEqual(context["mode"], "delta")
+            self.assertEqual(context["delta"]["removed"], ["apply_discount(price, rate)", "old_helper(x)"])
+            self.assertNotIn("current_block", context)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from core.prep.tokens import TOKEN_MODEL_VERSION, TokenCache, count_tokens, kind_for  # noqa: E402
+
+CODE = "def calculate_tax(amount, rate):\n    return amount * rate\n"
+PROSE = "The quick brown fox jumps over the lazy dog.\n"
+
+
+class TestTokenEstimate(unittest.TestCase):
+    def test_estimates_are_stable(self) -> None:
+        # Pinned: changing these means changing the model, which needs a TOKEN_MODEL_VERSION bump.
+        self.assertEqual(count_tokens(CODE, "code"), 17)
+        self.assertEqual(count_tokens(PROSE, "markdown"), 11)
+        self.assertEqual(count_tokens("", "code"), 0)
+        self.assertEqual(count_tokens(CODE * 10, "code"), 10 * count_tokens(CODE, "code"))
+        self.assertEqual((kind_for(Path("a/b.py")), kind_for(Path("README.md"))), ("code", "markdown"))
+
+    def test_cache_hits_and_bound(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            calc, notes = Path(tmp) / "calc.py", Path(tmp) / "notes.md"
+            calc.write_text(CODE, encoding="utf-8")
+            notes.write_text(PROSE, encoding="utf-8")
+            path = Path(tmp) / "token-cache.json"
+
+            cache = TokenCache(path)
+            first = [cache.count_file(p) for p in (calc, notes)]
+            self.assertEqual(first, [(17, len(CODE)), (11, len(PROSE))])
+            self.assertEqual((cache.hits, cache.misses), (0, 2))
+            cache.save()
+
+            again = TokenCache(path)
+            self.assertEqual([again.count_file(p) for p in (calc, notes)], first)
+            self.assertEqual((again.hits, again.misses), (2, 0))
+
+            # Edited content gets a new entry. Other runs' entries survive a save; the
+            # least recently used one is evicted once the bound is reached.
+            class Bounded(TokenCache):
+                MAX_ENTRIES = 2
+
+            calc.write_text(CODE + CODE, encoding="utf-8")
+            third = Bounded(path)
+            self.assertEqual(third.count_file(calc), (34, 2 * len(CODE)))
+            third.save()
+            counts = json.loads(path.read_text(encoding="utf-8"))["counts"]
+            self.assertEqual(sorted(counts.values()), [11, 34])
+            fourth = Bounded(path)
+            fourth.count_file(notes)
+            calc.write_text(CODE, encoding="utf-8")
+            fourth.count_file(calc)
+            fourth.save()
+            counts = json.loads(path.read_text(encoding="utf-8"))["counts"]
+            self.assertEqual(list(counts.values()), [11, 17])
+
+            path.write_text(json.dumps({"version": TOKEN_MODEL_VERSION + 1, "counts": counts}), encoding="utf-8")
+            self.assertEqual(TokenCache(path).counts, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import json
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+TOOL = ROOT / "factory/tools/ratchet_check.py"
+
+
+def _write(path: Path, value: float, samples: list[float] | None = None) -> str:
+    data: dict = {"value": value}
+    if samples is not None:
+        data["samples"] = samples
+    path.write_text(json.dumps(data), encoding="utf-8")
+    return str(path)
+
+
+class TestRatchetCheck(unittest.TestCase):
+    def _check(self, tmp: Path, ratchets: dict) -> tuple[int, list]:
+        config = tmp / "ratchets.json"
+        config.write_text(json.dumps({"ratchets": ratchets}), encoding="utf-8")
+        p = subprocess.run([sys.executable, str(TOOL), "--config", str(config), "--json"], capture_output=True, text=True)
+        return p.returncode, json.loads(p.stdout)
+
+    def test_noise_aware_timing_ratchet(self) -> None:
+        with tempfile.TemporaryDirectory() as d:
+            tmp = Path(d)
+            base = _write(tmp / "base.json", 100.0, [90.0, 100.0, 130.0])
+            spec = {"direction": "down", "baseline_file": base, "tolerance": 5, "relative_tolerance": 0.2}
+
+            # Best against best: one slow run on either side does not decide the check.
+            noisy = _write(tmp / "noisy.json", 104.0, [98.0, 104.0, 190.0])
+            self.assertEqual(self._check(tmp, {"t": dict(spec, current_file=noisy, compare="best_sample")}), (0, []))
+
+            # Median 150 with one lucky 110 ms run is still a regression: the best
+            # sample is compared with the baseline's best sample (90), not its median.
+            lucky = _write(tmp / "lucky.json", 150.0, [110.0, 150.0, 190.0])
+            rc, findings = self._check(tmp, {"t": dict(spec, current_file=lucky, compare="best_sample")})
+            self.assertEqual((rc, findings[0]["baseline"], findings[0]["current"], findings[0]["tolerance"]), (1, 90.0, 110.0, 18.0))
+            rc, findings = self._check(tmp, {"t": dict(spec, current_file=lucky)})
+            self.assertEqual((rc, findings[0]["baseline"], findings[0]["current"]), (1, 100.0, 150.0))
+
+            # A baseline without samples is compared median to median.
+            plain = _write(tmp / "plain.json", 100.0)
+            rc, findings = self._check(tmp, {"t": dict(spec, baseline_file=plain, current_file=lucky, compare="best_sample")})
+            self.assertEqual((rc, findings[0]["current"]), (1, 150.0))
+
+    def test_optional_ratchet_skips_missing_metric(self) -> None:
+        with tempfile.TemporaryDirectory() as d:
+            tmp = Path(d)
+            spec = {"direction": "down", "baseline_file": str(tmp / "nope.json"), "current_file": str(tmp / "nope.json")}
+            self.assertEqual(self._check(tmp, {"t": dict(spec, optional=True)}), (0, []))
+            rc, findings = self._check(tmp, {"t": spec})
+            self.assertEqual((rc, findings[0]["error_code"]), (1, "missing_metric"))
+
+
+if __name__ == "__main__":
+    unittest.main()
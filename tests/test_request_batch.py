@@ -0,0 +1,62 @@
+import json
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+FULL = {
+    "task_id": "full-1",
+    "target_file": "docs/a.md",
+    "allowed_heading": "## Public Interfaces",
+    "extracted_signatures": ["add(a, b)"],
+    "current_block": "- `add(a)`",
+}
+DELTA = {
+    "task_id": "delta-1",
+    "mode": "delta",
+    "target_file": "docs/a.md",
+    "allowed_heading": "## Public Interfaces",
+    "delta": {"added": ["sub(a, b)"], "removed": [], "changed": [{"old": "add(a)", "new": "add(a, b)"}]},
+    "anchors": [{"line": 3, "text": "## Public Interfaces"}, {"line": 5, "text": "- `add(a)`"}],
+}
+
+
+class TestRequestBatch(unittest.TestCase):
+    def _run(self, lines: list[str]) -> tuple[int, list[dict]]:
+        proc = subprocess.run(
+            [sys.executable, str(ROOT / "factory/tools/render_doc_sync_batch.py"), "--workers", "0", "--chunk-size", "2"],
+            input="\n".join(lines) + "\n",
+            capture_output=True,
+            text=True,
+            cwd=ROOT,
+            timeout=60,
+        )
+        return proc.returncode, [json.loads(line) for line in proc.stdout.splitlines()]
+
+    def test_one_request_per_line_with_delta_dispatch(self) -> None:
+        rc, records = self._run([json.dumps(FULL), json.dumps(DELTA)])
+        self.assertEqual(rc, 0)
+        self.assertEqual([r["index"] for r in records], [0, 1])
+        self.assertEqual([r["task_id"] for r in records], ["full-1", "delta-1"])
+        self.assertIn("- `add(a, b)`", records[0]["request"])
+        self.assertTrue(records[1]["template"].endswith("doc_sync_delta_request.txt"))
+        self.assertIn("+ `sub(a, b)`", records[1]["request"])
+        self.assertIn("~ `add(a)` -> `add(a, b)`", records[1]["request"])
+        self.assertIn("5: - `add(a)`", records[1]["request"])
+
+    def test_per_item_errors_and_template_path_confinement(self) -> None:
+        outside = dict(FULL, template_path=str(ROOT / "README.md"))
+        inside = dict(FULL, template_path="factory/templates/doc_sync_delta_request.txt")
+        rc, records = self._run([json.dumps(FULL), "{not json", json.dumps(outside), json.dumps(inside)])
+        self.assertEqual(rc, 1)
+        self.assertEqual(len(records), 4)
+        self.assertIn("request", records[0])
+        self.assertIn("JSONDecodeError", records[1]["error"])
+        self.assertIn("template_path must be under", records[2]["error"])
+        self.assertIn("Signature changes", records[3]["request"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from core.model.client import cached_complete  # noqa: E402
+from core.model.response_cache import ResponseCache, request_key  # noqa: E402
+from core.model.stub_server import StubModelServer  # noqa: E402
+from core.prep.render import stable_first  # noqa: E402
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_ttl_expiry_counts_as_miss(self) -> None:
+        cache = ResponseCache(self.root, ttl_s=60)
+        cache.put("ab" * 32, "resp")
+        self.assertEqual(cache.get("ab" * 32), "resp")
+
+        cache.ttl_s = -1
+        self.assertIsNone(cache.get("ab" * 32))
+        self.assertEqual(cache.summary()["expired"], 1)
+        self.assertEqual(cache.summary()["entries"], 0)
+
+    def test_entry_without_response_is_a_miss(self) -> None:
+        cache = ResponseCache(self.root)
+        key = request_key("req")
+        cache.put(key, "resp")
+        cache._path(key).write_text('{"created": %f, "key": "%s"}' % (time.time(), key), encoding="utf-8")
+        self.assertIsNone(cache.get(key))
+        self.assertEqual((cache.stats["hits"], cache.stats["misses"]), (0, 1))
+        cache.put(key, "resp")
+        self.assertEqual(cache.get(key), "resp")
+
+    def test_lru_evicts_least_recently_used(self) -> None:
+        keys = [request_key(f"req-{i}") for i in range(3)]
+        cache = ResponseCache(self.root)
+        for i, k in enumerate(keys):
+            cache.put(k, "x" * 100)
+            os.utime(cache._path(k), (time.time() - 100 + i, time.time() - 100 + i))
+        cache.get(keys[0])  # refresh the oldest entry
+
+        cache.max_bytes = cache.summary()["bytes"] - 1
+        cache.put(request_key("req-3"), "x" * 100)
+
+        self.assertIsNone(cache.get(keys[1]))
+        self.assertEqual(cache.get(keys[0]), "x" * 100)
+        self.assertGreaterEqual(cache.stats["evictions"], 1)
+
+    def test_stub_server_called_once_for_repeated_request(self) -> None:
+        server = StubModelServer(("127.0.0.1", 0))
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            cache = ResponseCache(self.root)
+            first, hit1 = cached_complete(cache, server.url, "stub", "hello")
+            second, hit2 = cached_complete(cache, server.url, "stub", "hello")
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        self.assertEqual((hit1, hit2), (False, True))
+        self.assertEqual(first, second)
+        self.assertEqual(server.calls, 1)
+        self.assertEqual(cache.summary()["hit_rate"], 0.5)
+
+
+class TestStableFirstLayout(unittest.TestCase):
+    def test_volatile_paragraphs_move_after_static_text(self) -> None:
+        text = "Task: {task_id}\n\nRules: {allowed_heading}\n\nData:\n{current_block}\n\nNow answer.\n"
+        self.assertEqual(
+            stable_first(text),
+            "Rules: {allowed_heading}\n\nTask: {task_id}\n\nData:\n{current_block}\n\nNow answer.\n",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
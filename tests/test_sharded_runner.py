@@ -0,0 +1,140 @@
+import json
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from core.runners.sharded_tests import TimingStore, lpt  # noqa: E402
+
+MODULES = {
+    "test_alpha.py": """
+import time
+import unittest
+
+
+class TestAlpha(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.ready = True
+
+    def test_slow(self):
+        time.sleep(0.3)
+        self.assertTrue(self.ready)
+
+    @unittest.skip("demo")
+    def test_skipped(self):
+        pass
+""",
+    "test_beta.py": """
+import unittest
+
+
+class TestBeta(unittest.TestCase):
+    def test_fails(self):
+        print("noise from beta")
+        self.assertEqual(1, 2)
+
+    def test_ok(self):
+        pass
+""",
+    "test_gamma.py": """
+import unittest
+
+
+class TestGamma(unittest.TestCase):
+    def test_ok(self):
+        pass
+""",
+}
+
+
+class TestShardedRunner(unittest.TestCase):
+    def test_lpt_balances_longest_first(self) -> None:
+        bins = lpt({"a": 5.0, "b": 4.0, "c": 3.0, "d": 3.0, "e": 3.0}, 2)
+        self.assertEqual([sorted(units) for _, units in bins], [["b", "c", "e"], ["a", "d"]])
+        self.assertEqual([load for load, _ in bins], [10.0, 8.0])
+        self.assertEqual(len(lpt({"a": 1.0}, 4)), 1)
+
+    def test_parallel_run_merges_results_and_records_timings(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            tests = Path(tmp) / "suite"
+            tests.mkdir()
+            for name, body in MODULES.items():
+                (tests / name).write_text(body)
+            timings = Path(tmp) / "timings.json"
+            cmd = [
+                sys.executable,
+                str(ROOT / "factory/tools/run_tests.py"),
+                "--start-dir",
+                str(tests),
+                "--jobs",
+                "2",
+                "--timings",
+                str(timings),
+                "-q",
+            ]
+
+            proc = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+            self.assertEqual(proc.returncode, 1, proc.stderr)
+            self.assertIn("FAIL: test_fails (test_beta.TestBeta.test_fails)", proc.stderr)
+            self.assertIn("noise from beta", proc.stderr)
+            self.assertIn("Ran 5 tests", proc.stderr)
+            self.assertIn("FAILED (failures=1, skipped=1)", proc.stderr)
+            self.assertIn("shards=2", proc.stderr)
+
+            store = TimingStore(timings)
+            self.assertGreaterEqual(store.tests["test_alpha.TestAlpha.test_slow"], 0.3)
+            self.assertEqual(len(store.tests), 5)
+            self.assertGreater(store.estimate(["test_alpha.TestAlpha.test_slow"]), store.estimate(["test_gamma.TestGamma.test_ok"]))
+
+            (tests / "test_beta.py").unlink()
+            proc = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+            self.assertEqual(proc.returncode, 0, proc.stderr)
+            self.assertNotIn("test_beta.TestBeta.test_ok", json.loads(timings.read_text())["tests"])
+
+            empty = Path(tmp) / "empty"
+            empty.mkdir()
+            proc = subprocess.run(cmd[:3] + [str(empty), "--no-timings"], capture_output=True, text=True, timeout=60)
+            # Same exit code as python -m unittest on this interpreter (5 from 3.12 on).
+            expected = subprocess.run(
+                [sys.executable, "-m", "unittest", "discover", "-s", str(empty)], capture_output=True, timeout=60
+            ).returncode
+            self.assertEqual(proc.returncode, expected, proc.stderr)
+
+    def test_load_tests_function_cases_and_doctests(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            tests = Path(tmp) / "suite"
+            tests.mkdir()
+            (tests / "helpers_doc.py").write_text(
+                'def double(x):\n    """\n    >>> double(2)\n    4\n    """\n    return 2 * x\n'
+            )
+            (tests / "test_protocols.py").write_text(
+                "import doctest\n"
+                "import unittest\n"
+                "\n"
+                "import helpers_doc\n"
+                "\n"
+                "\n"
+                "def load_tests(loader, tests, pattern):\n"
+                "    tests.addTest(unittest.FunctionTestCase(lambda: None))\n"
+                "    tests.addTests(doctest.DocTestSuite(helpers_doc))\n"
+                "    return tests\n"
+            )
+            (tests / "test_plain.py").write_text(MODULES["test_gamma.py"])
+            proc = subprocess.run(
+                [sys.executable, str(ROOT / "factory/tools/run_tests.py"), "--start-dir", str(tests), "--jobs", "2", "--no-timings"],
+                capture_output=True,
+                text=True,
+                timeout=60,
+            )
+            self.assertEqual(proc.returncode, 0, proc.stderr)
+            self.assertIn("Ran 3 tests", proc.stderr)
+            self.assertIn("shards=2", proc.stderr)
+
+
+if __name__ == "__main__":
+    unittest.main()
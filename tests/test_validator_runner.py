@@ -0,0 +1,58 @@
+import sys
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from core.runners import validators  # noqa: E402
+from core.runners.validators import run_validators, summarize  # noqa: E402
+
+PY = sys.executable
+
+
+def _sleep(name: str, seconds: float, rc: int = 0, **extra) -> dict:
+    cmd = f'{PY} -c "import sys, time; time.sleep({seconds}); sys.exit({rc})"'
+    return {"name": name, "cmd": cmd, **extra}
+
+
+class TestValidatorRunner(unittest.TestCase):
+    def test_runs_concurrently_in_input_order(self) -> None:
+        t0 = time.perf_counter()
+        results = run_validators([_sleep("a", 0.4), _sleep("b", 0.4), _sleep("c", 0.4)])
+        wall = time.perf_counter() - t0
+        self.assertEqual([r["name"] for r in results], ["a", "b", "c"])
+        self.assertTrue(all(r["status"] == "passed" for r in results))
+        self.assertLess(wall, 1.0)
+        self.assertTrue(summarize(results, wall)["ok"])
+
+    def test_timeout_and_fail_fast_cancel(self) -> None:
+        results = run_validators(
+            [_sleep("slow", 30), _sleep("bad", 0.1, rc=3), _sleep("hang", 30, timeout_s=0.2)],
+            fail_fast=True,
+        )
+        by_name = {r["name"]: r for r in results}
+        self.assertEqual(by_name["bad"]["status"], "failed")
+        self.assertEqual(by_name["bad"]["returncode"], 3)
+        self.assertIn(by_name["slow"]["status"], ("cancelled", "skipped"))
+        self.assertLess(by_name["slow"]["duration_s"], 5)
+        self.assertIn(by_name["hang"]["status"], ("timeout", "cancelled"))
+
+    def test_validator_that_exits_before_the_kill_keeps_its_result(self) -> None:
+        # The kill arrives after "done" has exited but before it is reaped: it is
+        # marked as killed, yet its process was never terminated by the signal.
+        with mock.patch.object(validators, "_kill_group", lambda proc: None):
+            results = run_validators([_sleep("done", 0.5), _sleep("bad", 0, rc=3)], fail_fast=True)
+        self.assertEqual([r["status"] for r in results], ["passed", "failed"])
+        self.assertEqual(results[0]["returncode"], 0)
+
+    def test_advisory_failure_does_not_fail_run(self) -> None:
+        results = run_validators([_sleep("lint", 0, rc=1, required=False), _sleep("tests", 0)], fail_fast=True)
+        self.assertEqual([r["status"] for r in results], ["failed", "passed"])
+        self.assertTrue(summarize(results, 0.0)["ok"])
+
+
+if __name__ == "__main__":
+    unittest.main()
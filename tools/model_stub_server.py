@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core.model.stub_server import main
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())